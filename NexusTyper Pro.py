@@ -51,7 +51,7 @@ from nexustyper.constants import (
     CONTACT_EMAIL, CONTACT_WEBSITE,
     UPDATE_FEED_URL, UPDATE_DOWNLOAD_PAGE,
     DEFAULT_MIN_WPM, DEFAULT_MAX_WPM, MIN_WPM_LIMIT, MAX_WPM_LIMIT,
-    DEFAULT_LAPS, DEFAULT_DELAY, MISTAKE_CHANCE,
+    DEFAULT_LAPS, DEFAULT_DELAY,
     MACOS_ACCESSIBILITY_SETTINGS_URL,
     MACOS_INPUT_MONITORING_SETTINGS_URL,
     DEFAULT_START_HOTKEY, DEFAULT_STOP_HOTKEY, DEFAULT_RESUME_HOTKEY,
@@ -69,8 +69,12 @@ from nexustyper.ui.dialogs.settings import SettingsDialog
 from nexustyper.ui.dialogs.diagnostics import DiagnosticsDialog
 from nexustyper.typing import (
     sanitize_ai_text, apply_smart_newlines, KEY_ADJACENCY,
-    TypingWorker,
+    MacroSpan, TimingModel, TypingWorker, compile_macros, macro_environment, segment_blocks,
+    strip_macros,
 )
+from nexustyper.typing.autocomplete import guard_profile, newline_dismissals
+from nexustyper.typing.indent import plan_indents
+from nexustyper.typing.plan import IME_RUN_RE, PASTE_CHUNK_BYTES, PASTE_CHUNK_LINES, paste_chunks
 from nexustyper.typing.content_detection import (
     categorize_title, detect_content_kind, contains_non_ascii,
     looks_like_code, looks_like_math,
@@ -78,6 +82,7 @@ from nexustyper.typing.content_detection import (
 from nexustyper.services.update_checker import UpdateChecker
 from nexustyper.services.installer_downloader import InstallerDownloader
 from nexustyper.services.hotkey_listener import HotkeyListener
+from nexustyper.services.clipboard import ClipboardService
 from nexustyper.services.file_ingestion import (
     load_text_from_path as _fi_load,
     save_text_to_path as _fi_save,
@@ -88,6 +93,7 @@ from nexustyper.services.file_ingestion import (
 from nexustyper.services.logging_setup import (
     LOG_DIR, LOG_FILE, _log_caught, install_global_handlers, logger,
 )
+from nexustyper.services.run_journal import last_run as _journal_last_run, text_hash
 from nexustyper.ui.widgets.text_edit import PasteCleaningTextEdit, CodeEditor
 from nexustyper.ui.dialogs.dry_run import DryRunDialog
 from nexustyper.ui.icons import make_lucide_icon
@@ -132,10 +138,19 @@ class AutoTyperApp(QWidget):
         self.settings = QSettings(APP_AUTHOR, APP_NAME)
         self.worker, self.thread = None, None
         self.is_paused = False
+        # RunCheckpoint handed to the next start_typing() by resume_last_run().
+        self._pending_resume = None
+        # text -> MacroProgram for the editor text (and its REPEAT blocks).
+        self._macro_program_cache = {}
+        # Directory of the file the editor text was opened from; relative
+        # {{INCLUDE}} paths resolve against it.
+        self._document_dir = None
         self._suppress_input_mode_changed = False
         self._suppress_persona_changed = False
         self._last_input_tab_index = 0
         self.hotkey_listener: HotkeyListener | None = None
+        # In-process clipboard owner the typing worker pastes through.
+        self.clipboard_service = ClipboardService(self)
         self.init_ui()
         self.load_settings()
         self.start_listener()
@@ -801,6 +816,10 @@ class AutoTyperApp(QWidget):
         save_action.triggered.connect(self.save_file)
         file_menu.addAction(save_action)
         file_menu.addSeparator()
+        resume_run_action = QAction('&Resume Last Run', self)
+        resume_run_action.triggered.connect(self.resume_last_run)
+        file_menu.addAction(resume_run_action)
+        file_menu.addSeparator()
         settings_action = QAction('&Settings...', self)
         settings_action.triggered.connect(self.show_settings_dialog)
         try:
@@ -1038,6 +1057,26 @@ class AutoTyperApp(QWidget):
         pacing_row.addWidget(delay_lbl)
         pacing_row.addWidget(self.delay_spin, 1)
         pacing_lay.addLayout(pacing_row)
+        # Deadline run: the worker re-solves speed and pauses to finish on time.
+        deadline_row = QHBoxLayout()
+        deadline_row.setSpacing(10)
+        self.deadline_checkbox = QCheckBox("Finish in")
+        self.deadline_checkbox.setToolTip(
+            "Finish the whole run (all laps) in this many minutes.\n"
+            "Speed is re-planned as it goes — after pauses too — keeping the\n"
+            "shape of the WPM range; pauses and mistakes are trimmed when\n"
+            "time is short and thinking pauses added when it's generous."
+        )
+        self.deadline_spin = QSpinBox()
+        self.deadline_spin.setRange(1, 1440)
+        self.deadline_spin.setValue(10)
+        self.deadline_spin.setSuffix(" min")
+        self.deadline_spin.setMaximumWidth(96)
+        self.deadline_spin.setEnabled(False)
+        self.deadline_checkbox.toggled.connect(self.deadline_spin.setEnabled)
+        deadline_row.addWidget(self.deadline_checkbox)
+        deadline_row.addWidget(self.deadline_spin, 1)
+        pacing_lay.addLayout(deadline_row)
 
         # Persona is already the highlighted control in the masthead — alias the
         # legacy `persona_combo` name there so existing code keeps working
@@ -1081,6 +1120,21 @@ class AutoTyperApp(QWidget):
         speed_lay.addWidget(self.add_mistakes_checkbox)
         speed_lay.addWidget(self.pause_on_punct_checkbox)
 
+        self.burst_combo = QComboBox()
+        for label, mode in (("Off", "off"), ("Words", "word"), ("Lines", "line")):
+            self.burst_combo.addItem(label, mode)
+        self.burst_combo.setToolTip(
+            "Inject plain ASCII a word or a line at a time, paced per batch.\n"
+            "For bulk data entry; mistakes and punctuation pauses are skipped.")
+        burst_row = QHBoxLayout()
+        burst_row.setSpacing(8)
+        burst_lbl = QLabel("Burst")
+        burst_lbl.setObjectName("fieldLabel")
+        burst_lbl.setMinimumWidth(36)
+        burst_row.addWidget(burst_lbl)
+        burst_row.addWidget(self.burst_combo, 1)
+        speed_lay.addLayout(burst_row)
+
         # ---- Newlines ----
         self.newline_group_box, newline_lay = _section("Newlines")
         self.paste_mode_radio = QRadioButton("Line Paste (fastest)")
@@ -1091,9 +1145,13 @@ class AutoTyperApp(QWidget):
         self.smart_radio.setToolTip("Turns single line breaks into spaces; double breaks remain paragraphs.")
         self.list_mode_radio = QRadioButton("List mode (code)")
         self.list_mode_radio.setToolTip("Strips leading indentation; your editor controls indentation.")
+        self.block_mode_radio = QRadioButton("Per block (mixed)")
+        self.block_mode_radio.setToolTip(
+            "Types prose, pastes fenced code and tables. With auto-optimize in a code editor, "
+            "code blocks use List mode instead.")
         self.standard_radio.setChecked(True)
         for radio in (self.paste_mode_radio, self.standard_radio,
-                      self.smart_radio, self.list_mode_radio):
+                      self.smart_radio, self.list_mode_radio, self.block_mode_radio):
             newline_lay.addWidget(radio)
 
         # ---- Behavior ----
@@ -1103,7 +1161,9 @@ class AutoTyperApp(QWidget):
         self.type_tabs_checkbox = QCheckBox("Preserve tab characters")
         self.type_tabs_checkbox.setChecked(True)
         self.press_esc_checkbox = QCheckBox("Press Esc before Enter")
-        self.press_esc_checkbox.setToolTip("Sends Esc before Enter to dismiss IDE autocomplete popups.")
+        self.press_esc_checkbox.setToolTip(
+            "Sends Esc to dismiss IDE autocomplete popups before Enter, Tab and\n"
+            "punctuation, only where a popup is likely for the target app.")
         self.press_esc_checkbox.setChecked(False)
         self.mouse_jitter_checkbox = QCheckBox("Background mouse jitter")
         self.mouse_jitter_checkbox.setChecked(True)
@@ -1449,6 +1509,13 @@ class AutoTyperApp(QWidget):
         self._resume_countdown_active = False
         self._resume_countdown_remaining = 0
 
+        # Samples the running worker's progress counter; the worker no longer
+        # signals per keystroke, so repaints happen at this rate at most.
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(100)
+        self._progress_timer.timeout.connect(self._poll_worker_progress)
+        self._progress_seq = -1
+
         # Wiring
         self.start_button.clicked.connect(self.start_typing)
         self.pause_button.clicked.connect(self.pause_or_resume)
@@ -1461,14 +1528,18 @@ class AutoTyperApp(QWidget):
         self.code_text_edit.textChanged.connect(self.schedule_text_update)
         self.laps_spin.valueChanged.connect(self.schedule_text_update)
         self.delay_spin.valueChanged.connect(self.schedule_text_update)
+        self.deadline_checkbox.toggled.connect(self.schedule_text_update)
+        self.deadline_spin.valueChanged.connect(self.schedule_text_update)
         self.standard_radio.toggled.connect(self.schedule_text_update)
         self.smart_radio.toggled.connect(self.schedule_text_update)
         self.list_mode_radio.toggled.connect(self.schedule_text_update)
         self.paste_mode_radio.toggled.connect(self.schedule_text_update)
+        self.block_mode_radio.toggled.connect(self.schedule_text_update)
         self.use_shift_enter_checkbox.toggled.connect(self.schedule_text_update)
         self.type_tabs_checkbox.toggled.connect(self.schedule_text_update)
         self.add_mistakes_checkbox.toggled.connect(self.schedule_text_update)
         self.pause_on_punct_checkbox.toggled.connect(self.schedule_text_update)
+        self.burst_combo.currentIndexChanged.connect(self.schedule_text_update)
         self.press_esc_checkbox.toggled.connect(self.schedule_text_update)
         self.mouse_jitter_checkbox.toggled.connect(self.schedule_text_update)
         self.auto_detect_checkbox.toggled.connect(self.schedule_text_update)
@@ -1514,6 +1585,8 @@ class AutoTyperApp(QWidget):
             pass
 
     def clear_text(self):
+        self._document_dir = None
+        self._macro_program_cache.clear()
         try:
             self._active_editor().clear()
         except Exception:
@@ -1558,6 +1631,8 @@ class AutoTyperApp(QWidget):
             self.smart_radio.setChecked(True)
         elif mode == "List Mode":
             self.list_mode_radio.setChecked(True)
+        elif mode == "Block Mode":
+            self.block_mode_radio.setChecked(True)
         else:
             self.standard_radio.setChecked(True)
 
@@ -1838,6 +1913,7 @@ class AutoTyperApp(QWidget):
             self.worker.add_mistakes = bool(self.add_mistakes_checkbox.isChecked())
             self.worker.pause_on_punct = bool(self.pause_on_punct_checkbox.isChecked())
             self.worker.newline_mode = self._get_selected_newline_mode()
+            self.worker.burst_mode = self._get_selected_burst_mode()
             self.worker.use_shift_enter = bool(self.use_shift_enter_checkbox.isChecked())
             self.worker.type_tabs = bool(self.type_tabs_checkbox.isChecked())
             self.worker.press_esc = bool(self.press_esc_checkbox.isChecked())
@@ -1970,6 +2046,19 @@ class AutoTyperApp(QWidget):
         if "error" in tl or "failed" in tl:
             self._set_status_state("error")
 
+    def _paste_chunk_budget(self):
+        """Paste Mode (lines, bytes) per paste, from the Settings dialog."""
+        try:
+            lines = self.settings.value("pasteChunkLines", PASTE_CHUNK_LINES, type=int)
+            kb = self.settings.value("pasteChunkKB", PASTE_CHUNK_BYTES // 1024, type=int)
+            return max(1, lines), max(1, kb) * 1024
+        except Exception:
+            _log_caught('_paste_chunk_budget')
+            return PASTE_CHUNK_LINES, PASTE_CHUNK_BYTES
+
+    def _get_selected_burst_mode(self) -> str:
+        return str(self.burst_combo.currentData() or "off")
+
     def _get_selected_newline_mode(self) -> str:
         if self.paste_mode_radio.isChecked():
             return "Paste Mode"
@@ -1977,6 +2066,8 @@ class AutoTyperApp(QWidget):
             return "List Mode"
         if self.smart_radio.isChecked():
             return "Smart Newlines"
+        if self.block_mode_radio.isChecked():
+            return "Block Mode"
         return "Standard"
 
     def _macros_enabled(self) -> bool:
@@ -1989,48 +2080,57 @@ class AutoTyperApp(QWidget):
     def _strip_macros_ui(self, text: str) -> str:
         if not self._macros_enabled():
             return text
-        try:
-            return re.sub(r"(?i)\{\{(?:PAUSE|PRESS|CLICK|COMMENT):.*?\}\}", "", text)
-        except Exception:
-            _log_caught('_strip_macros_ui@L1394')
-            return text
+        return strip_macros(text)
+
+    def _macro_program(self, text: str):
+        """Macros in ``text`` compiled once and shared by the stats panel,
+        the duration estimate and the CLICK confirmation."""
+        cache = self._macro_program_cache
+        program = cache.get(text)
+        if program is None:
+            if len(cache) >= 64:
+                cache.clear()
+            program = cache[text] = compile_macros(text, macro_environment(), base_dir=self._document_dir)
+        return program
 
     def _extract_pause_seconds(self, text: str) -> float:
         if not self._macros_enabled():
             return 0.0
-        total = 0.0
         try:
-            for m in re.finditer(r"(?i)\{\{PAUSE:(.*?)\}\}", text):
-                try:
-                    t = float((m.group(1) or "").strip())
-                except Exception:
-                    _log_caught('_extract_pause_seconds@L1405')
-                    continue
-                if t <= 0:
-                    continue
-                total += min(t, 60.0)
+            return self._macro_program(text).pause_seconds()
         except Exception:
-            _log_caught('_extract_pause_seconds@L1410')
-            pass
-        return total
+            _log_caught('_extract_pause_seconds@program')
+            return 0.0
 
     def _count_macros(self, text: str) -> dict:
-        counts = {"total": 0, "pause": 0, "press": 0, "click": 0, "comment": 0}
         try:
-            for m in re.finditer(r"\{\{([A-Za-z]+):(.*?)\}\}", text):
-                cmd = (m.group(1) or "").strip().upper()
-                counts["total"] += 1
-                key = cmd.lower()
-                if key in counts:
-                    counts[key] += 1
+            return dict(self._macro_program(text).counts())
         except Exception:
-            _log_caught('_count_macros@L1423')
-            pass
-        return counts
+            _log_caught('_count_macros@program')
+            return {"total": 0, "pause": 0, "press": 0, "click": 0, "comment": 0}
+
+    def _structured_pieces(self, text: str):
+        """``MacroSpan`` runs when REPEAT/INCLUDE directives or PASTE/SPEED
+        markers shape ``text``, else None."""
+        if not self._macros_enabled():
+            return None
+        try:
+            program = self._macro_program(text)
+            if program.has_directives() or program.has_spans():
+                return program.pieces()
+        except Exception:
+            _log_caught('_structured_pieces')
+        return None
 
     def _compute_output_chars_per_lap_ui(self, text: str) -> int:
         if not text:
             return 0
+        pieces = self._structured_pieces(text)
+        if pieces is not None:
+            return sum(self._output_chars_for_text(span.text) * span.times for span in pieces)
+        return self._output_chars_for_text(text)
+
+    def _output_chars_for_text(self, text: str) -> int:
         mode = self._get_selected_newline_mode()
         macros_enabled = self._macros_enabled()
         type_tabs = bool(self.type_tabs_checkbox.isChecked()) if hasattr(self, "type_tabs_checkbox") else True
@@ -2082,6 +2182,14 @@ class AutoTyperApp(QWidget):
         self.stats_chars_value.setText(str(chars))
         self.stats_lines_value.setText(str(lines))
         self.stats_macros_value.setText(str(macro_counts.get("total", 0)))
+        try:
+            diagnostics = self._macro_program(text).diagnostics() if self._macros_enabled() else []
+            tip = "\n".join(diagnostics[:10])
+            if len(diagnostics) > 10:
+                tip += f"\n… and {len(diagnostics) - 10} more"
+            self.stats_macros_value.setToolTip(tip)
+        except Exception:
+            _log_caught('update_text_stats@macro_diagnostics')
         self.stats_clicks_value.setText(str(macro_counts.get("click", 0)))
         self.stats_unicode_value.setText(str(non_ascii))
         self.stats_pause_value.setText(f"{pause_total:.1f}s" if self._macros_enabled() else "—")
@@ -2137,18 +2245,20 @@ class AutoTyperApp(QWidget):
         notes = []
         notes.append(f"Input: {self.input_mode_name()}")
         if mode == "List Mode":
-            notes.append("List Mode strips leading indentation; your editor controls indentation.")
+            notes.append("List Mode strips leading indentation and lets your editor auto-indent; only the difference is sent as Tab/Shift+Tab.")
         elif mode == "Paste Mode":
             notes.append("Paste Mode uses the clipboard; some apps may block paste or alter formatting.")
         elif mode == "Smart Newlines":
             notes.append("Smart Newlines joins single line breaks into spaces; double breaks remain paragraph breaks.")
+        elif mode == "Block Mode":
+            notes.append("Per-block mode types prose and pastes fenced code and tables (List Mode for code in code editors).")
         if macros_enabled:
-            notes.append("Macros are enabled: {{PAUSE}}, {{PRESS}}, {{CLICK}}, {{COMMENT}} will execute.")
+            notes.append("Macros are enabled: {{PAUSE}}, {{PRESS}}, {{CLICK}}, {{COMMENT}}, {{REPEAT}}…{{END}}, {{INCLUDE}}, {{PASTE}}…{{/PASTE}} and {{SPEED}} will execute.")
         else:
             notes.append("Macros are disabled: macro patterns will be typed as literal text.")
         try:
             if self.ime_friendly_checkbox.isChecked() and not self.unicode_hex_checkbox.isChecked():
-                notes.append("IME-friendly is on: uses paste instead of per-key typing.")
+                notes.append("IME-friendly is on: non-ASCII runs are pasted, the rest is typed per key.")
         except Exception:
             _log_caught('update_mode_note@L1542')
             pass
@@ -2376,6 +2486,7 @@ class AutoTyperApp(QWidget):
             _apply_plain_defaults(is_fast_messenger=False)
             
     def start_typing(self):
+        resume, self._pending_resume = self._pending_resume, None
         if self.is_paused:
             self.resume_typing()
             return
@@ -2396,15 +2507,9 @@ class AutoTyperApp(QWidget):
             coords = []
             invalid = 0
             try:
-                for m in re.finditer(r"(?i)\{\{CLICK:(.*?)\}\}", text):
-                    p = (m.group(1) or "").strip()
-                    try:
-                        xs, ys = p.split(",", 1)
-                        x, y = int(xs.strip()), int(ys.strip())
-                        coords.append((x, y))
-                    except Exception:
-                        _log_caught('start_typing@L1779')
-                        invalid += 1
+                program = self._macro_program(text)
+                coords = program.clicks()
+                invalid = sum(1 for t in program.errors if t.command == "CLICK")
             except Exception:
                 _log_caught('start_typing@L1781')
                 coords = []
@@ -2471,6 +2576,8 @@ class AutoTyperApp(QWidget):
 
         rdp_default = "auto" if platform.system() == "Windows" else "off"
         kbd_rdp_mode = str(self.settings.value("rdpKeyboardMode", rdp_default))
+        kbd_native = self.settings.value("nativeKeyboard", True, type=bool)
+        chunk_lines, chunk_bytes = self._paste_chunk_budget()
 
         worker_opts = {
             'min_wpm': self.min_wpm_slider.value(),
@@ -2492,6 +2599,14 @@ class AutoTyperApp(QWidget):
             'started_from_gui': started_from_gui,
             'source_app': source_app,
             'kbd_rdp_mode': kbd_rdp_mode,
+            'kbd_native': kbd_native,
+            'burst_mode': self._get_selected_burst_mode(),
+            'paste_chunk_lines': chunk_lines,
+            'paste_chunk_bytes': chunk_bytes,
+            'clipboard': self.clipboard_service,
+            'deadline_seconds': self._deadline_seconds(),
+            'resume_from': resume,
+            'macro_base_dir': self._document_dir,
         }
 
         # Log start
@@ -2508,12 +2623,32 @@ class AutoTyperApp(QWidget):
         self.worker.paused_signal.connect(self.on_typing_paused)
         self.worker.resumed_signal.connect(self.on_typing_resumed)
         self.worker.update_status.connect(self.on_worker_status)
-        self.worker.update_speed.connect(lambda w: self.wpm_display.setText(f"Current: {w:.0f} WPM"))
-        self.worker.update_progress.connect(self.progress_bar.setValue)
-        self.worker.set_progress_max.connect(self.progress_bar.setMaximum)
-        self.worker.lap_progress.connect(lambda cl, tl: self.lap_label.setText(f"Lap: {cl}/{tl}"))
-        self.worker.update_etr.connect(self.etr_label.setText)
+        self._progress_seq = -1
+        self._progress_timer.start()
         self.thread.start()
+
+    def _poll_worker_progress(self):
+        """Copy the worker's progress counter into the status widgets."""
+        worker = self.worker
+        if worker is None:
+            return
+        snap = worker.progress.snapshot()
+        if snap.seq == self._progress_seq or not snap.total:
+            return
+        self._progress_seq = snap.seq
+        if self.progress_bar.maximum() != snap.total:
+            self.progress_bar.setMaximum(snap.total)
+        self.progress_bar.setValue(min(snap.chars_done, snap.total))
+        if snap.lap:
+            self.lap_label.setText(f"Lap: {snap.lap}/{snap.laps}")
+        if snap.chars_done and snap.elapsed > 0:
+            if snap.target_wpm:
+                # Speed controller readout: delivered vs planned key rate.
+                self.wpm_display.setText(
+                    f"Current: {snap.achieved_wpm:.0f} / {snap.target_wpm:.0f} WPM")
+            else:
+                self.wpm_display.setText(f"Current: {snap.wpm():.0f} WPM")
+            self.etr_label.setText(f"ETR: {time.strftime('%M:%S', time.gmtime(snap.etr_seconds()))}")
         
     def toggle_always_on_top(self, checked):
         # Use Qt flags on all platforms for stability
@@ -2536,14 +2671,66 @@ class AutoTyperApp(QWidget):
         # Keep estimate/stats/preview in sync with labels
         self.schedule_text_update()
 
-    def estimate_duration_seconds(self):
+    def _deadline_seconds(self) -> int:
+        """The "Finish in" target in seconds, or 0 when it's off."""
+        if not self.deadline_checkbox.isChecked():
+            return 0
+        return self.deadline_spin.value() * 60
+
+    def _deadline_wpm_hint(self, target):
+        """Starting (min, max) WPM that meets ``target`` seconds, or None
+        when even the fastest allowed range is too slow.
+
+        The estimate is ``C + D / f`` for a range scaled by ``f`` (typing
+        time is inversely proportional to speed), so two estimates solve it.
+        """
+        a = max(1, self.min_wpm_slider.value())
+        b = max(a, self.max_wpm_slider.value())
+        delay = max(0, self.delay_spin.value())
+        e1 = sum(self.estimate_duration_seconds()) / 2 - delay
+        e2 = sum(self.estimate_duration_seconds((a * 2, b * 2))) / 2 - delay
+        d = 2 * (e1 - e2)
+        c = e1 - d
+        f_hi = MAX_WPM_LIMIT / b
+        if d <= 0:
+            return (a, b)
+        f = d / (target - c) if target > c else float("inf")
+        if f > f_hi:
+            return None
+        f = max(f, MIN_WPM_LIMIT / a)
+        return (int(round(a * f)), int(round(min(MAX_WPM_LIMIT, b * f))))
+
+    def estimate_duration_seconds(self, wpm=None):
+        """(lo, hi) seconds for the whole run; ``wpm`` overrides the
+        slider range (SPEED spans keep their own)."""
         text = self.get_input_text()
         if not text:
             return 0.0, 0.0
-        min_wpm = max(1, self.min_wpm_slider.value())
-        max_wpm = max(min_wpm, self.max_wpm_slider.value())
         laps = max(1, self.laps_spin.value())
         delay = max(0, self.delay_spin.value())
+        # REPEAT/INCLUDE scripts are estimated block by block × count,
+        # never by expanding them; PASTE regions at paste cost and SPEED
+        # spans at their own WPM. Block Mode costs code and tables as pastes.
+        lo = hi = 0.0
+        spans = self._structured_pieces(text) or [MacroSpan(text, 1, False, None)]
+        blocks = self._get_selected_newline_mode() == "Block Mode"
+        for span in spans:
+            parts = [(span.text, span.paste)]
+            if blocks:
+                parts = [(b.text, span.paste or b.kind != "prose") for b in segment_blocks(span.text)]
+            for part, paste in parts:
+                piece_lo, piece_hi = self._estimate_lap_seconds(part, span.speed or wpm, paste)
+                lo += piece_lo * span.times
+                hi += piece_hi * span.times
+        return (lo * laps + delay, hi * laps + delay)
+
+    def _estimate_lap_seconds(self, text, wpm=None, paste=False):
+        """(lo, hi) seconds to type ``text`` once, macros included; ``wpm``
+        overrides the slider range, ``paste`` estimates a PASTE region."""
+        min_wpm = max(1, self.min_wpm_slider.value())
+        max_wpm = max(min_wpm, self.max_wpm_slider.value())
+        if wpm is not None:
+            min_wpm, max_wpm = wpm
         mode = self._get_selected_newline_mode()
         macros_enabled = self._macros_enabled()
         type_tabs = bool(self.type_tabs_checkbox.isChecked()) if hasattr(self, "type_tabs_checkbox") else True
@@ -2552,6 +2739,7 @@ class AutoTyperApp(QWidget):
         press_esc = bool(self.press_esc_checkbox.isChecked()) if hasattr(self, "press_esc_checkbox") else False
         ime = bool(self.ime_friendly_checkbox.isChecked()) if hasattr(self, "ime_friendly_checkbox") else False
         unicode_hex = bool(self.unicode_hex_checkbox.isChecked()) if hasattr(self, "unicode_hex_checkbox") else False
+        burst = self._get_selected_burst_mode() if hasattr(self, "burst_combo") else "off"
 
         pause_per_lap = self._extract_pause_seconds(text) if macros_enabled else 0.0
         macro_counts = self._count_macros(text) if macros_enabled else {"press": 0, "click": 0}
@@ -2574,7 +2762,7 @@ class AutoTyperApp(QWidget):
 
         if mode == "Smart Newlines":
             effective = apply_smart_newlines(effective)
-        if mode in ("Standard", "Smart Newlines") and not type_tabs:
+        if mode in ("Standard", "Smart Newlines", "Block Mode") and not type_tabs:
             effective = effective.replace("\t", "")
 
         if mode == "List Mode":
@@ -2596,31 +2784,53 @@ class AutoTyperApp(QWidget):
                 base_list_overhead = 0.10 * list_lines_count
                 base_list_overhead_hi = 0.10 * list_lines_count
                 if press_esc:
-                    base_list_overhead += 0.05 * list_lines_count
-                    base_list_overhead_hi += 0.05 * list_lines_count
+                    # Esc only where the popup model expects a popup.
+                    try:
+                        esc_lines = newline_dismissals("\n".join(stripped_lines) + "\n", guard_profile("unknown"))
+                    except Exception:
+                        _log_caught('estimate_duration_seconds@esc')
+                        esc_lines = list_lines_count
+                    base_list_overhead += 0.05 * esc_lines
+                    base_list_overhead_hi += 0.05 * esc_lines
+                # One settle per batched Tab/Shift+Tab correction.
+                try:
+                    indent_ops = sum(1 for steps in plan_indents("\n".join(raw_lines)) if steps)
+                except Exception:
+                    _log_caught('estimate_duration_seconds@indent')
+                    indent_ops = 0
+                base_list_overhead += 0.03 * indent_ops
+                base_list_overhead_hi += 0.03 * indent_ops
                 list_enter_overhead = base_list_overhead
                 list_enter_overhead_hi = base_list_overhead_hi
 
+        # IME-friendly pastes only the non-ASCII runs; the rest is typed.
+        ime_pastes = 0
+        if ime and not unicode_hex and mode != "Paste Mode" and not paste:
+            runs = IME_RUN_RE.findall(typed_text_for_counts)
+            ime_pastes = len(runs)
+            typed_text_for_counts = IME_RUN_RE.sub("", typed_text_for_counts)
+            if mode != "List Mode":
+                out_per_lap = max(0, out_per_lap - sum(len(r) for r in runs))
+
         # Base estimates
         if mode == "Paste Mode":
-            # Pastes line-by-line; dominated by per-line sleeps + clipboard/hotkey overhead.
-            line_ops = 1
+            # Pastes in line chunks; dominated by per-chunk settles + hotkey
+            # overhead. Each macro also closes a chunk.
+            chunk_ops = 1
             try:
-                line_ops = max(1, len(effective.splitlines(True)))
+                chunk_ops = max(1, len(paste_chunks(effective, *self._paste_chunk_budget()))
+                                + macro_counts.get("total", 0))
             except Exception:
                 _log_caught('estimate_duration_seconds@L1974')
-                line_ops = 1
-            lo = line_ops * 0.06
-            hi = line_ops * 0.18
-        elif ime and not unicode_hex:
-            # IME-friendly uses paste instead of per-key typing (fast).
-            if mode == "List Mode":
-                lines = max(1, list_lines_count or len(effective.splitlines()))
-                lo = (out_per_lap / 2500.0) + (0.10 * lines) + (0.05 * lines if press_esc else 0.0) + 0.2
-                hi = (out_per_lap / 1500.0) + (0.10 * lines) + (0.05 * lines if press_esc else 0.0) + 0.5
-            else:
-                lo = out_per_lap / 2000.0 + 0.2
-                hi = out_per_lap / 1200.0 + 0.5
+                chunk_ops = 1
+            lo = chunk_ops * 0.06
+            hi = chunk_ops * 0.18
+        elif paste:
+            # PASTE region: one paste per text segment (per line in List
+            # Mode), each followed by a short settle.
+            ops = list_lines_count if mode == "List Mode" else macro_counts.get("total", 0) + 1
+            lo = max(1, ops) * 0.03 + list_enter_overhead
+            hi = max(1, ops) * 0.09 + list_enter_overhead_hi
         else:
             # Per-key typing (humanized).
             cps_fast = (max_wpm * 5) / 60.0
@@ -2638,14 +2848,17 @@ class AutoTyperApp(QWidget):
 
                 if press_esc:
                     try:
-                        newline_count = effective.count("\n")
+                        newline_count = newline_dismissals(effective, guard_profile("unknown"))
                     except Exception:
                         _log_caught('estimate_duration_seconds@L2005')
                         newline_count = 0
                     lo += 0.03 * newline_count
                     hi += 0.03 * newline_count
 
-            # Extra humanization overheads (only apply to per-key typing).
+            # Extra humanization overheads (only apply to per-key typing;
+            # burst batches skip them).
+            if burst != "off":
+                typed_text_for_counts = ""
             try:
                 punct_a = sum(1 for ch in typed_text_for_counts if ch in ".,?!")
                 punct_b = sum(1 for ch in typed_text_for_counts if ch in "()[]{}")
@@ -2655,22 +2868,22 @@ class AutoTyperApp(QWidget):
                 _log_caught('estimate_duration_seconds@L2016')
                 punct_a = punct_b = boundaries = eligible = 0
 
-            if pause_on_punct:
-                lo += (punct_a * 0.08) + (punct_b * 0.10)
-                hi += (punct_a * 0.15) + (punct_b * 0.30)
-
-            # Expected "thinking" pauses at word boundaries (~4% chance).
-            lo += boundaries * 0.04 * 0.12
-            hi += boundaries * 0.04 * 0.35
-
-            if add_mistakes:
-                expected_mistakes = eligible * MISTAKE_CHANCE
-                lo += expected_mistakes * 0.15
-                hi += expected_mistakes * 0.40
-        # Multiply by laps and add start delay + macro timing
-        pause_total = pause_per_lap * laps
-        macro_overhead_total = macro_overhead_per_lap * laps
-        return (lo * laps + delay + pause_total + macro_overhead_total, hi * laps + delay + pause_total + macro_overhead_total)
+            # Punctuation pauses, thinking pauses at word boundaries and
+            # fat-finger corrections, from the same model the worker uses.
+            extra_lo, extra_hi = TimingModel().overhead_bounds(
+                punct=punct_a,
+                brackets=punct_b,
+                boundaries=boundaries,
+                eligible=eligible,
+                pause_on_punct=pause_on_punct,
+                mistakes=TimingModel.mistakes_active(add_mistakes, max_wpm),
+            )
+            lo += extra_lo
+            hi += extra_hi
+            lo += ime_pastes * 0.03
+            hi += ime_pastes * 0.09
+        # Add macro timing
+        return (lo + pause_per_lap + macro_overhead_per_lap, hi + pause_per_lap + macro_overhead_per_lap)
 
     def update_preview(self):
         lo, hi = self.estimate_duration_seconds()
@@ -2682,6 +2895,16 @@ class AutoTyperApp(QWidget):
             h, rem = divmod(s, 3600)
             m, s2 = divmod(rem, 60)
             return f"{h}:{m:02d}:{s2:02d}" if h else f"{m}:{s2:02d}"
+        target = self._deadline_seconds()
+        if target:
+            hint = self._deadline_wpm_hint(target)
+            if hint is None:
+                self.preview_label.setText(
+                    f"Estimated: {_fmt(lo)}–{_fmt(hi)} · can't finish in {_fmt(target)}")
+            else:
+                self.preview_label.setText(
+                    f"Finish in {_fmt(target)} · ~{hint[0]}–{hint[1]} WPM")
+            return
         self.preview_label.setText(f"Estimated: {_fmt(lo)}–{_fmt(hi)}")
 
     def stop_typing(self):
@@ -2699,6 +2922,39 @@ class AutoTyperApp(QWidget):
             _log_caught('stop_typing@L2058')
             pass
 
+    def resume_last_run(self):
+        """Restart the last interrupted run at its journaled keystroke."""
+        if self.worker:
+            return
+        checkpoint = None
+        try:
+            checkpoint = _journal_last_run()
+        except Exception:
+            _log_caught('resume_last_run@journal')
+        if checkpoint is None or not checkpoint.resumable:
+            QMessageBox.information(self, "Resume Last Run", "There is no interrupted run to resume.")
+            return
+        if text_hash(self.get_input_text()) != checkpoint.text_hash:
+            QMessageBox.warning(
+                self, "Resume Last Run",
+                "The editor text differs from the interrupted run.\n\n"
+                "Load the same text (unchanged) and try again.",
+            )
+            return
+        pct = 100 * checkpoint.chars_done / checkpoint.total if checkpoint.total else 0
+        msg = (
+            f"Resume at lap {checkpoint.lap}/{checkpoint.laps}, {pct:.0f}% done "
+            f"({checkpoint.chars_done:,} of {checkpoint.total:,} characters)?\n\n"
+            "Put the cursor exactly where typing stopped; the typing settings "
+            "must match the interrupted run."
+        )
+        choice = QMessageBox.question(self, "Resume Last Run", msg, QMessageBox.Ok | QMessageBox.Cancel, QMessageBox.Ok)
+        if choice != QMessageBox.Ok:
+            return
+        self.laps_spin.setValue(checkpoint.laps)
+        self._pending_resume = checkpoint
+        self.start_typing()
+
     def resume_typing(self):
         if not (self.worker and self.is_paused):
             return
@@ -2747,6 +3003,11 @@ class AutoTyperApp(QWidget):
 
     def on_typing_finished(self):
         self.is_paused = False
+        self._progress_timer.stop()
+        try:
+            self._poll_worker_progress()
+        except Exception:
+            _log_caught('on_typing_finished@progress')
         try:
             self._cancel_resume_countdown(silent=True)
         except Exception:
@@ -3469,11 +3730,15 @@ class AutoTyperApp(QWidget):
             "code_text": self.code_text_edit,
             "laps": self.laps_spin,
             "delay": self.delay_spin,
+            "deadline_enabled": self.deadline_checkbox,
+            "deadline_minutes": self.deadline_spin,
             "persona": self.persona_combo, "min_wpm": self.min_wpm_slider,
             "max_wpm": self.max_wpm_slider, "add_mistakes": self.add_mistakes_checkbox,
             "pause_on_punct": self.pause_on_punct_checkbox,
+            "burst_mode": self.burst_combo,
             "newline_standard": self.standard_radio, "newline_smart": self.smart_radio,
             "newline_list": self.list_mode_radio, "newline_paste": self.paste_mode_radio,
+            "newline_blocks": self.block_mode_radio,
             "use_shift_enter": self.use_shift_enter_checkbox,
             "type_tabs": self.type_tabs_checkbox,
             "press_esc": self.press_esc_checkbox,
@@ -3627,6 +3892,8 @@ class AutoTyperApp(QWidget):
         except Exception:
             _log_caught('load_text_from_path@L2803')
             pass
+        self._document_dir = os.path.dirname(os.path.abspath(path))
+        self._macro_program_cache.clear()
         self.set_input_text(text)
 
     def open_file(self):
@@ -3697,10 +3964,14 @@ class AutoTyperApp(QWidget):
                 self.persona_combo.setCurrentText(persona)
             self.laps_spin.setValue(self.settings.value("laps", DEFAULT_LAPS, type=int))
             self.delay_spin.setValue(self.settings.value("delay", DEFAULT_DELAY, type=int))
+            self.deadline_checkbox.setChecked(self.settings.value("deadline_enabled", False, type=bool))
+            self.deadline_spin.setValue(self.settings.value("deadline_minutes", 10, type=int))
             self.min_wpm_slider.setValue(self.settings.value("min_wpm", DEFAULT_MIN_WPM, type=int))
             self.max_wpm_slider.setValue(self.settings.value("max_wpm", DEFAULT_MAX_WPM, type=int))
             self.add_mistakes_checkbox.setChecked(self.settings.value("add_mistakes", False, type=bool))
             self.pause_on_punct_checkbox.setChecked(self.settings.value("pause_on_punct", True, type=bool))
+            burst_idx = self.burst_combo.findData(self.settings.value("burst_mode", "off", type=str))
+            self.burst_combo.setCurrentIndex(max(0, burst_idx))
             mode = self.settings.value("newline_mode", "List Mode", type=str)
             if mode == "Paste Mode":
                 self.paste_mode_radio.setChecked(True)
@@ -3708,6 +3979,8 @@ class AutoTyperApp(QWidget):
                 self.smart_radio.setChecked(True)
             elif mode == "Standard":
                 self.standard_radio.setChecked(True)
+            elif mode == "Block Mode":
+                self.block_mode_radio.setChecked(True)
             else:
                 self.list_mode_radio.setChecked(True)
             self.use_shift_enter_checkbox.setChecked(self.settings.value("use_shift_enter", False, type=bool))
@@ -3834,10 +4107,13 @@ class AutoTyperApp(QWidget):
             self.settings.setValue("persona", self.persona_combo.currentText())
             self.settings.setValue("laps", self.laps_spin.value())
             self.settings.setValue("delay", self.delay_spin.value())
+            self.settings.setValue("deadline_enabled", self.deadline_checkbox.isChecked())
+            self.settings.setValue("deadline_minutes", self.deadline_spin.value())
             self.settings.setValue("min_wpm", self.min_wpm_slider.value())
             self.settings.setValue("max_wpm", self.max_wpm_slider.value())
             self.settings.setValue("add_mistakes", self.add_mistakes_checkbox.isChecked())
             self.settings.setValue("pause_on_punct", self.pause_on_punct_checkbox.isChecked())
+            self.settings.setValue("burst_mode", self._get_selected_burst_mode())
             self.settings.setValue("newline_mode", self._get_selected_newline_mode())
             self.settings.setValue("use_shift_enter", self.use_shift_enter_checkbox.isChecked())
             self.settings.setValue("type_tabs", self.type_tabs_checkbox.isChecked())
@@ -5,6 +5,8 @@ window identity, paste shortcuts, Unicode-Hex typing) behind a single
 ``Platform`` interface so the rest of the app can stay platform-agnostic.
 
 Use :func:`current` to obtain the right implementation for the running OS.
+:mod:`nexustyper.platform.focus_watcher` builds on it to publish the
+foreground window as a cheap, versioned snapshot.
 Each implementation module compiles standalone on any OS — all OS-specific
 imports (AppKit, Quartz, ctypes/wintypes, etc.) are deferred until call time.
 """
@@ -85,6 +87,17 @@ class Platform:
         except Exception:
             return ""
 
+    def watch_focus(self, on_change, stop_event) -> bool:
+        """Deliver foreground-window change notifications until stopped.
+
+        Blocks the calling thread, invoking ``on_change()`` (no arguments,
+        from that thread) whenever the foreground window or its title may
+        have changed, until ``stop_event`` is set. Returns False immediately
+        when the OS offers no notifications; the focus watcher then falls
+        back to adaptive polling. See ``nexustyper.platform.focus_watcher``.
+        """
+        return False
+
     def release_modifiers_best_effort(self) -> None:
         """Best-effort release of stuck shift/ctrl/alt/cmd modifiers."""
         return None
@@ -1,18 +1,69 @@
 """Linux implementation of the Platform contract.
 
-Falls back to ``pyautogui`` for window-title introspection and key injection.
-No OS-specific imports.
+Foreground-window identity and title come from the X server via the ctypes
+bindings in :mod:`._x11` (``_NET_ACTIVE_WINDOW`` + ``WM_CLASS`` + pid), served
+from a cache that the focus-watch thread invalidates on ``PropertyNotify``.
+Falls back to ``pyautogui`` when X11 isn't reachable (pure Wayland,
+headless). ``libX11`` is loaded lazily, so the module imports anywhere.
 """
 
 from __future__ import annotations
 from nexustyper.services.logging_setup import _log_caught
 
+import threading
+
 from . import Platform
 
 
 class LinuxPlatform(Platform):
     name = "linux"
 
+    def __init__(self) -> None:
+        # Query connection, opened on first use (None = not tried yet,
+        # False = X11 unavailable). Guarded by _x11_lock: Xlib connections
+        # aren't thread-safe and the worker and watcher both read it.
+        self._x11_conn = None
+        self._x11_lock = threading.Lock()
+        # (window_id, identity, title) of the last read; trusted only while
+        # a watch_focus thread is alive to invalidate it.
+        self._fg_cache = None
+        self._fg_watching = False
+        # Bumped on every change notification so a read that raced one
+        # doesn't put a stale value back in the cache.
+        self._fg_gen = 0
+
+    def _x11(self):
+        if self._x11_conn is None:
+            try:
+                from . import _x11
+                self._x11_conn = _x11.open_connection() or False
+            except Exception:
+                _log_caught('_x11')
+                self._x11_conn = False
+        return self._x11_conn or None
+
+    def _foreground(self):
+        """``(window_id, identity, title)`` from cache or X11; None without X11."""
+        cached = self._fg_cache
+        if cached is not None and self._fg_watching:
+            return cached
+        gen = self._fg_gen
+        with self._x11_lock:
+            conn = self._x11()
+            if conn is None:
+                return None
+            try:
+                fg = conn.foreground()
+            except Exception:
+                _log_caught('_foreground')
+                return None
+        if not fg[0]:
+            # No EWMH active window (bare X, some WMs): let pyautogui try.
+            return None
+        if gen == self._fg_gen:
+            self._fg_cache = fg
+        return fg
+
     def accessibility_trusted(self, prompt: bool = False) -> bool:
         # Linux has no system-wide accessibility-prompt analog.
         return True
@@ -21,6 +72,9 @@ class LinuxPlatform(Platform):
         return None
 
     def active_app_identity(self) -> str:
+        fg = self._foreground()
+        if fg is not None:
+            return fg[1]
         try:
             import pyautogui  # type: ignore
             return pyautogui.getActiveWindowTitle() or "Unknown"
@@ -28,6 +82,44 @@ class LinuxPlatform(Platform):
             _log_caught('active_app_identity@L26')
             return "Unknown"
 
+    def active_window_title(self) -> str:
+        fg = self._foreground()
+        if fg is not None:
+            return fg[2]
+        return super().active_window_title()
+
+    def watch_focus(self, on_change, stop_event) -> bool:
+        """Block on X11 PropertyNotify for the active window and its title.
+
+        Uses its own display connection (Xlib isn't thread-safe) and
+        invalidates the foreground cache before each ``on_change()``.
+        """
+        try:
+            from . import _x11
+            conn = _x11.open_connection()
+        except Exception:
+            _log_caught('watch_focus')
+            return False
+        if conn is None:
+            return False
+
+        def _changed():
+            self._fg_gen += 1
+            self._fg_cache = None
+            on_change()
+
+        self._fg_cache = None
+        self._fg_watching = True
+        try:
+            conn.watch(_changed, stop_event)
+        except Exception:
+            _log_caught('watch_focus@loop')
+        finally:
+            self._fg_watching = False
+            self._fg_cache = None
+            conn.close()
+        return True
+
     def release_modifiers_best_effort(self) -> None:
         try:
             import pyautogui  # type: ignore
@@ -150,4 +150,87 @@ class WindowsPlatform(Platform):
         # No Unicode-Hex input parity on Windows; caller falls back to ASCII.
         return False
 
-
+    def watch_focus(self, on_change, stop_event) -> bool:
+        """SetWinEventHook on foreground and title changes.
+
+        Out-of-context hooks are delivered through this thread's message
+        queue, so pump it with MsgWaitForMultipleObjects until stopped.
+        Title changes (EVENT_OBJECT_NAMECHANGE) are filtered to the
+        foreground window so tab switches are caught without waking on every
+        renamed control in the system.
+        """
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            user32 = ctypes.windll.user32  # type: ignore[attr-defined]
+
+            event_system_foreground = 0x0003
+            event_object_namechange = 0x800C
+            winevent_outofcontext = 0x0000
+            winevent_skipownprocess = 0x0002
+            objid_window = 0
+            qs_allinput = 0x04FF
+            pm_remove = 0x0001
+
+            user32.GetForegroundWindow.restype = wintypes.HWND
+
+            WINEVENTPROC = ctypes.WINFUNCTYPE(
+                None,
+                wintypes.HANDLE,
+                wintypes.DWORD,
+                wintypes.HWND,
+                wintypes.LONG,
+                wintypes.LONG,
+                wintypes.DWORD,
+                wintypes.DWORD,
+            )
+
+            def _callback(_hook, event, hwnd, id_object, _id_child, _thread, _time):
+                try:
+                    if event == event_system_foreground:
+                        on_change()
+                    elif id_object == objid_window and hwnd and hwnd == user32.GetForegroundWindow():
+                        on_change()
+                except Exception:
+                    _log_caught('watch_focus@callback')
+
+            proc = WINEVENTPROC(_callback)
+            user32.SetWinEventHook.restype = wintypes.HANDLE
+            user32.SetWinEventHook.argtypes = [
+                wintypes.DWORD,
+                wintypes.DWORD,
+                wintypes.HMODULE,
+                WINEVENTPROC,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                wintypes.DWORD,
+            ]
+            flags = winevent_outofcontext | winevent_skipownprocess
+            hooks = [
+                user32.SetWinEventHook(
+                    event_system_foreground, event_system_foreground,
+                    None, proc, 0, 0, flags,
+                ),
+                user32.SetWinEventHook(
+                    event_object_namechange, event_object_namechange,
+                    None, proc, 0, 0, flags,
+                ),
+            ]
+            if not any(hooks):
+                return False
+            try:
+                msg = wintypes.MSG()
+                while not stop_event.is_set():
+                    user32.MsgWaitForMultipleObjects(0, None, False, 100, qs_allinput)
+                    while user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, pm_remove):
+                        user32.TranslateMessage(ctypes.byref(msg))
+                        user32.DispatchMessageW(ctypes.byref(msg))
+            finally:
+                for hook in hooks:
+                    if hook:
+                        user32.UnhookWinEvent(hook)
+            return True
+        except Exception:
+            _log_caught('watch_focus@L230')
+            return False
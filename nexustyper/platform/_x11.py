@@ -0,0 +1,462 @@
+"""Minimal ctypes Xlib bindings for foreground-window tracking on Linux.
+
+``pyautogui.getActiveWindowTitle()`` is slow and unreliable on Linux and
+gives no stable identity, so :class:`LinuxPlatform` talks to the X server
+directly through ``libX11`` instead. Only what focus tracking needs is bound:
+
+- read ``_NET_ACTIVE_WINDOW`` from the root window (EWMH),
+- read the window's ``_NET_WM_NAME`` (UTF-8) / ``WM_NAME`` title,
+  ``WM_CLASS`` and ``_NET_WM_PID``,
+- block on ``PropertyNotify`` for those properties so focus and title
+  changes are pushed rather than polled,
+- resolve keysyms to keycodes and inject key events through the XTest
+  extension (``libXtst``) for the native keyboard backend,
+- read the active XKB layout (rules names, current group) and its keysyms
+  per keycode and shift level for the keymap service,
+- read and change the core keyboard mapping so spare keycodes can be bound
+  to Unicode keysyms for direct Unicode typing.
+
+Xlib connections are not thread-safe, so each :class:`X11Connection` is
+used from one thread at a time: the platform keeps one for queries (behind
+a lock) and the focus-watch thread opens its own.
+
+Everything is loaded lazily; :func:`open_connection` returns None when
+libX11 or a display isn't available (Wayland without XWayland, headless),
+and callers fall back to pyautogui. Runs under Xvfb for testing.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import select
+import threading
+from typing import List, Optional, Tuple
+
+from nexustyper.services.logging_setup import _log_caught
+
+
+# X11 protocol constants.
+_SUCCESS = 0
+_ANY_PROPERTY_TYPE = 0
+_PROPERTY_CHANGE_MASK = 1 << 22
+_PROPERTY_NOTIFY = 28
+_XA_STRING = 31
+_XKB_USE_CORE_KBD = 0x0100
+
+
+class _XPropertyEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("serial", ctypes.c_ulong),
+        ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("window", ctypes.c_ulong),
+        ("atom", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("state", ctypes.c_int),
+    ]
+
+
+class _XEvent(ctypes.Union):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("xproperty", _XPropertyEvent),
+        ("pad", ctypes.c_long * 24),
+    ]
+
+
+class _XkbStateRec(ctypes.Structure):
+    _fields_ = [
+        ("group", ctypes.c_ubyte),
+        ("locked_group", ctypes.c_ubyte),
+        ("base_group", ctypes.c_ushort),
+        ("latched_group", ctypes.c_ushort),
+        ("mods", ctypes.c_ubyte),
+        ("base_mods", ctypes.c_ubyte),
+        ("latched_mods", ctypes.c_ubyte),
+        ("locked_mods", ctypes.c_ubyte),
+        ("compat_state", ctypes.c_ubyte),
+        ("grab_mods", ctypes.c_ubyte),
+        ("compat_grab_mods", ctypes.c_ubyte),
+        ("lookup_mods", ctypes.c_ubyte),
+        ("compat_lookup_mods", ctypes.c_ubyte),
+        ("ptr_buttons", ctypes.c_ushort),
+    ]
+
+
+class _XClassHint(ctypes.Structure):
+    _fields_ = [
+        ("res_name", ctypes.c_void_p),
+        ("res_class", ctypes.c_void_p),
+    ]
+
+
+_XERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+_lib = None
+_xtst = None
+_lib_lock = threading.Lock()
+_error_handler_ref = None
+
+
+def _ignore_x_error(_display, _event) -> int:
+    # Windows can vanish between reading _NET_ACTIVE_WINDOW and querying
+    # them (BadWindow). Xlib's default handler exits the process; swallow
+    # the error and let the caller see an empty result instead.
+    return 0
+
+
+def _libx11():
+    """Load and prototype libX11 once; None when it isn't installed."""
+    global _lib, _error_handler_ref
+    with _lib_lock:
+        if _lib is not None:
+            return _lib or None
+        try:
+            path = ctypes.util.find_library("X11")
+            if not path:
+                _lib = False
+                return None
+            lib = ctypes.CDLL(path)
+            lib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+            lib.XOpenDisplay.restype = ctypes.c_void_p
+            lib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+            lib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+            lib.XDefaultRootWindow.restype = ctypes.c_ulong
+            lib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+            lib.XInternAtom.restype = ctypes.c_ulong
+            lib.XGetWindowProperty.argtypes = [
+                ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong,
+                ctypes.c_long, ctypes.c_long, ctypes.c_int, ctypes.c_ulong,
+                ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+                ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+                ctypes.POINTER(ctypes.c_void_p),
+            ]
+            lib.XGetWindowProperty.restype = ctypes.c_int
+            lib.XGetClassHint.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XClassHint)]
+            lib.XGetClassHint.restype = ctypes.c_int
+            lib.XFree.argtypes = [ctypes.c_void_p]
+            lib.XSelectInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_long]
+            lib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+            lib.XConnectionNumber.restype = ctypes.c_int
+            lib.XPending.argtypes = [ctypes.c_void_p]
+            lib.XPending.restype = ctypes.c_int
+            lib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+            lib.XFlush.argtypes = [ctypes.c_void_p]
+            lib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+            lib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+            lib.XKeysymToKeycode.restype = ctypes.c_ubyte
+            lib.XkbKeycodeToKeysym.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_int]
+            lib.XkbKeycodeToKeysym.restype = ctypes.c_ulong
+            lib.XkbGetState.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(_XkbStateRec)]
+            lib.XkbGetState.restype = ctypes.c_int
+            lib.XDisplayKeycodes.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+            lib.XGetKeyboardMapping.argtypes = [ctypes.c_void_p, ctypes.c_ubyte, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+            lib.XGetKeyboardMapping.restype = ctypes.POINTER(ctypes.c_ulong)
+            lib.XChangeKeyboardMapping.argtypes = [
+                ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_ulong), ctypes.c_int,
+            ]
+            lib.XSetErrorHandler.argtypes = [_XERROR_HANDLER]
+            lib.XSetErrorHandler.restype = ctypes.c_void_p
+            _error_handler_ref = _XERROR_HANDLER(_ignore_x_error)
+            lib.XSetErrorHandler(_error_handler_ref)
+            _lib = lib
+        except Exception:
+            _log_caught('_libx11')
+            _lib = False
+        return _lib or None
+
+
+def _libxtst():
+    """Load and prototype libXtst once; None when it isn't installed."""
+    global _xtst
+    with _lib_lock:
+        if _xtst is not None:
+            return _xtst or None
+        try:
+            path = ctypes.util.find_library("Xtst")
+            if not path:
+                _xtst = False
+                return None
+            xtst = ctypes.CDLL(path)
+            xtst.XTestQueryExtension.argtypes = [ctypes.c_void_p] + [ctypes.POINTER(ctypes.c_int)] * 4
+            xtst.XTestQueryExtension.restype = ctypes.c_int
+            xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+            xtst.XTestFakeKeyEvent.restype = ctypes.c_int
+            _xtst = xtst
+        except Exception:
+            _log_caught('_libxtst')
+            _xtst = False
+        return _xtst or None
+
+
+class X11Connection:
+    """One Xlib display connection plus the atoms focus tracking needs."""
+
+    def __init__(self, lib, display) -> None:
+        self._lib = lib
+        self._display = display
+        self.root = lib.XDefaultRootWindow(display)
+        intern = lambda name: lib.XInternAtom(display, name, False)  # noqa: E731
+        self.NET_ACTIVE_WINDOW = intern(b"_NET_ACTIVE_WINDOW")
+        self.NET_WM_NAME = intern(b"_NET_WM_NAME")
+        self.NET_WM_PID = intern(b"_NET_WM_PID")
+        self.WM_NAME = intern(b"WM_NAME")
+        self.UTF8_STRING = intern(b"UTF8_STRING")
+        self.XKB_RULES_NAMES = intern(b"_XKB_RULES_NAMES")
+
+    def close(self) -> None:
+        if self._display:
+            try:
+                self._lib.XCloseDisplay(self._display)
+            except Exception:
+                _log_caught('X11Connection.close')
+            self._display = None
+
+    # --- property reads -------------------------------------------------------
+
+    def _property(self, window: int, atom: int, req_type: int = _ANY_PROPERTY_TYPE, length: int = 1024):
+        """Return ``(format, nitems, raw_bytes_or_longs)`` or None."""
+        lib = self._lib
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        nitems = ctypes.c_ulong()
+        bytes_after = ctypes.c_ulong()
+        data = ctypes.c_void_p()
+        status = lib.XGetWindowProperty(
+            self._display, window, atom, 0, length, False, req_type,
+            ctypes.byref(actual_type), ctypes.byref(actual_format),
+            ctypes.byref(nitems), ctypes.byref(bytes_after), ctypes.byref(data),
+        )
+        if status != _SUCCESS or not data.value:
+            return None
+        try:
+            fmt, n = actual_format.value, nitems.value
+            if fmt == 8:
+                return fmt, n, ctypes.string_at(data.value, n)
+            if fmt == 32:
+                # Format-32 properties come back as C longs, not 32-bit ints.
+                arr = ctypes.cast(data.value, ctypes.POINTER(ctypes.c_ulong))
+                return fmt, n, [arr[i] for i in range(n)]
+            return None
+        finally:
+            lib.XFree(data.value)
+
+    def active_window(self) -> int:
+        prop = self._property(self.root, self.NET_ACTIVE_WINDOW)
+        if not prop or prop[0] != 32 or not prop[2]:
+            return 0
+        return int(prop[2][0])
+
+    def window_title(self, window: int) -> str:
+        if not window:
+            return ""
+        prop = self._property(window, self.NET_WM_NAME, self.UTF8_STRING)
+        if prop and prop[0] == 8:
+            return prop[2].decode("utf-8", "replace")
+        prop = self._property(window, self.WM_NAME)
+        if prop and prop[0] == 8:
+            return prop[2].decode("latin-1", "replace")
+        return ""
+
+    def window_class(self, window: int) -> str:
+        if not window:
+            return ""
+        hint = _XClassHint()
+        if not self._lib.XGetClassHint(self._display, window, ctypes.byref(hint)):
+            return ""
+        try:
+            raw = hint.res_class or hint.res_name
+            return ctypes.string_at(raw).decode("utf-8", "replace") if raw else ""
+        finally:
+            for raw in (hint.res_name, hint.res_class):
+                if raw:
+                    self._lib.XFree(raw)
+
+    def window_pid(self, window: int) -> int:
+        if not window:
+            return 0
+        prop = self._property(window, self.NET_WM_PID)
+        if not prop or prop[0] != 32 or not prop[2]:
+            return 0
+        return int(prop[2][0])
+
+    def foreground(self) -> Tuple[int, str, str]:
+        """Return ``(window_id, identity, title)`` for the active window.
+
+        Identity combines WM_CLASS, pid and window id — stable while the
+        title mutates, distinct between two windows of the same app.
+        """
+        window = self.active_window()
+        if not window:
+            return 0, "", ""
+        title = self.window_title(window)
+        wm_class = (self.window_class(window) or "unknown").lower()
+        pid = self.window_pid(window)
+        return window, f"{wm_class}:{pid}:{window:x}", title
+
+    # --- XTest key injection --------------------------------------------------
+
+    def xtest_available(self) -> bool:
+        xtst = _libxtst()
+        if xtst is None:
+            return False
+        a, b, c, d = (ctypes.c_int() for _ in range(4))
+        try:
+            return bool(xtst.XTestQueryExtension(
+                self._display, ctypes.byref(a), ctypes.byref(b), ctypes.byref(c), ctypes.byref(d),
+            ))
+        except Exception:
+            _log_caught('xtest_available')
+            return False
+
+    def keycode_for(self, keysym: int) -> Optional[Tuple[int, bool]]:
+        """``(keycode, needs_shift)`` for a keysym on the current layout.
+
+        Only the first group's unshifted/shifted levels are considered;
+        keysyms that need AltGr or aren't mapped return None.
+        """
+        lib = self._lib
+        keycode = lib.XKeysymToKeycode(self._display, keysym)
+        if not keycode:
+            return None
+        if lib.XkbKeycodeToKeysym(self._display, keycode, 0, 0) == keysym:
+            return keycode, False
+        if lib.XkbKeycodeToKeysym(self._display, keycode, 0, 1) == keysym:
+            return keycode, True
+        return None
+
+    # --- XKB layout ------------------------------------------------------------
+
+    def keyboard_group(self) -> int:
+        """The core keyboard's current XKB group (active layout index)."""
+        state = _XkbStateRec()
+        if self._lib.XkbGetState(self._display, _XKB_USE_CORE_KBD, ctypes.byref(state)) != _SUCCESS:
+            return 0
+        return int(state.group)
+
+    def layout_names(self) -> str:
+        """The root window's ``_XKB_RULES_NAMES`` (rules, model, layout,
+        variant, options) joined with ``|``; empty when unset."""
+        prop = self._property(self.root, self.XKB_RULES_NAMES, _XA_STRING)
+        if not prop or prop[0] != 8:
+            return ""
+        return "|".join(prop[2].decode("latin-1", "replace").split("\0"))
+
+    def keycode_range(self) -> Tuple[int, int]:
+        lo, hi = ctypes.c_int(), ctypes.c_int()
+        self._lib.XDisplayKeycodes(self._display, ctypes.byref(lo), ctypes.byref(hi))
+        return lo.value, hi.value
+
+    def keysym_at(self, keycode: int, group: int, level: int) -> int:
+        """Keysym of ``keycode`` in ``group`` at shift ``level`` (0 = none,
+        1 = Shift, 2 = AltGr, 3 = AltGr+Shift on four-level keys); 0 when
+        the key has no such level."""
+        return int(self._lib.XkbKeycodeToKeysym(self._display, keycode, group, level))
+
+    def keycode_of(self, keysym: int) -> int:
+        """First keycode that produces ``keysym`` in any group/level; 0 when
+        none does."""
+        return int(self._lib.XKeysymToKeycode(self._display, keysym))
+
+    # --- Core keyboard mapping -------------------------------------------------
+
+    def keyboard_mapping(self, first: int, count: int) -> List[Tuple[int, ...]]:
+        """Keysyms (all groups/levels, ``NoSymbol`` = 0) of ``count``
+        keycodes from ``first``."""
+        lib = self._lib
+        per = ctypes.c_int()
+        data = lib.XGetKeyboardMapping(self._display, first, count, ctypes.byref(per))
+        if not data:
+            return []
+        try:
+            n = per.value
+            return [tuple(data[i * n:(i + 1) * n]) for i in range(count)]
+        finally:
+            lib.XFree(data)
+
+    def change_keyboard_mapping(self, keycode: int, keysyms) -> None:
+        """Replace ``keycode``'s keysyms (server-wide; every client gets a
+        ``MappingNotify``). Queued like the XTest events, so key events sent
+        after it on this connection see the new mapping."""
+        syms = (ctypes.c_ulong * len(keysyms))(*keysyms)
+        self._lib.XChangeKeyboardMapping(self._display, keycode, len(keysyms), syms, 1)
+
+    def sync(self) -> None:
+        self._lib.XSync(self._display, False)
+
+    def fake_key(self, keycode: int, press: bool) -> None:
+        """Queue one XTest key event; call :meth:`flush` to send the batch."""
+        _xtst.XTestFakeKeyEvent(self._display, keycode, bool(press), 0)
+
+    def flush(self) -> None:
+        self._lib.XFlush(self._display)
+
+    # --- change notifications -------------------------------------------------
+
+    def watch(self, on_change, stop_event: threading.Event, poll: float = 0.1) -> None:
+        """Block until ``stop_event``, calling ``on_change()`` on focus/title
+        changes of the active window."""
+        lib = self._lib
+        display = self._display
+        lib.XSelectInput(display, self.root, _PROPERTY_CHANGE_MASK)
+        watched = self.active_window()
+        if watched:
+            lib.XSelectInput(display, watched, _PROPERTY_CHANGE_MASK)
+        lib.XFlush(display)
+        fd = lib.XConnectionNumber(display)
+        event = _XEvent()
+        title_atoms = (self.NET_WM_NAME, self.WM_NAME)
+        while not stop_event.is_set():
+            if not lib.XPending(display):
+                # Sleep on the socket so stop is noticed within ``poll``.
+                select.select([fd], [], [], poll)
+                if not lib.XPending(display):
+                    continue
+            changed = False
+            while lib.XPending(display):
+                lib.XNextEvent(display, ctypes.byref(event))
+                if event.type != _PROPERTY_NOTIFY:
+                    continue
+                xp = event.xproperty
+                if xp.window == self.root and xp.atom == self.NET_ACTIVE_WINDOW:
+                    # Follow title changes of the new active window only.
+                    new = self.active_window()
+                    if new != watched:
+                        if watched:
+                            lib.XSelectInput(display, watched, 0)
+                        if new:
+                            lib.XSelectInput(display, new, _PROPERTY_CHANGE_MASK)
+                        watched = new
+                    changed = True
+                elif xp.window == watched and xp.atom in title_atoms:
+                    changed = True
+            if changed:
+                on_change()
+        if watched:
+            lib.XSelectInput(display, watched, 0)
+        lib.XFlush(display)
+
+
+def open_connection() -> Optional[X11Connection]:
+    """Open a new display connection, or None if X11 isn't reachable."""
+    lib = _libx11()
+    if lib is None:
+        return None
+    try:
+        display = lib.XOpenDisplay(None)
+    except Exception:
+        _log_caught('open_connection')
+        return None
+    if not display:
+        return None
+    try:
+        return X11Connection(lib, display)
+    except Exception:
+        _log_caught('open_connection@atoms')
+        lib.XCloseDisplay(display)
+        return None
+
+
+__all__ = ["X11Connection", "open_connection"]
@@ -0,0 +1,194 @@
+"""Shared foreground-window watcher.
+
+The typing worker used to ask the platform for the foreground title *and*
+identity before every keystroke, spawn a fresh polling thread on every
+auto-pause, and poll again while waiting for the user to focus the target.
+``FocusWatcher`` replaces all of that with one long-lived thread per process
+that publishes the current ``(identity, title)`` as an immutable
+:class:`FocusSnapshot` with a version counter. Reading the snapshot is a
+plain attribute read, so the per-key focus check becomes a memory read.
+
+The watcher refreshes on focus-change notifications when the platform
+offers them (:meth:`Platform.watch_focus`) and otherwise polls adaptively:
+fast right after a change, backing off while the foreground stays put.
+Subscribers register a ``threading.Event`` that is set on every change, so
+a paused worker can sleep until focus actually moves.
+
+Use :func:`acquire` / :func:`release` to share the process-wide instance;
+the thread stops when the last user releases it.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import List, NamedTuple, Optional
+
+from nexustyper.services.logging_setup import _log_caught
+
+
+class FocusSnapshot(NamedTuple):
+    identity: str
+    title: str
+    version: int
+
+
+class FocusWatcher:
+    """Publishes the foreground window as a versioned snapshot."""
+
+    # Adaptive polling bounds (seconds). With native notifications the
+    # poll is only a safety net for title changes the OS doesn't report.
+    MIN_INTERVAL = 0.025
+    MAX_INTERVAL = 0.1
+    NATIVE_MAX_INTERVAL = 0.5
+
+    def __init__(self, platform) -> None:
+        self._platform = platform
+        self._snapshot = FocusSnapshot("Unknown", "Unknown", 0)
+        self._cond = threading.Condition()
+        self._subscribers: List[threading.Event] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._native_thread: Optional[threading.Thread] = None
+        self._native = False
+
+    # --- lifecycle ------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        # Fresh stop event per start so threads from a previous start/stop
+        # cycle that are still winding down can't be revived.
+        stop = self._stop = threading.Event()
+        self.refresh()
+        self._thread = threading.Thread(target=self._poll_loop, args=(stop,), name="FocusWatcher", daemon=True)
+        self._thread.start()
+        self._native_thread = threading.Thread(target=self._native_loop, args=(stop,), name="FocusWatcherNative", daemon=True)
+        self._native_thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread = None
+        self._native_thread = None
+        self._native = False
+
+    # --- reading --------------------------------------------------------------
+
+    def snapshot(self) -> FocusSnapshot:
+        """The latest published snapshot. Never blocks."""
+        return self._snapshot
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> FocusSnapshot:
+        """Block until the snapshot version moves past ``version`` or timeout."""
+        with self._cond:
+            if self._snapshot.version == version:
+                self._cond.wait(timeout)
+            return self._snapshot
+
+    def subscribe(self, event: threading.Event) -> None:
+        """Set ``event`` on every focus change until :meth:`unsubscribe`."""
+        with self._cond:
+            if event not in self._subscribers:
+                self._subscribers.append(event)
+
+    def unsubscribe(self, event: threading.Event) -> None:
+        with self._cond:
+            try:
+                self._subscribers.remove(event)
+            except ValueError:
+                pass
+
+    def poke(self) -> None:
+        """Ask for an immediate refresh (e.g. right after a native event)."""
+        self._wake.set()
+
+    # --- refreshing -----------------------------------------------------------
+
+    def _read(self):
+        try:
+            title = self._platform.active_window_title() or "Unknown"
+        except Exception:
+            _log_caught('FocusWatcher._read@title')
+            title = "Unknown"
+        try:
+            identity = self._platform.active_app_identity() or title
+        except Exception:
+            _log_caught('FocusWatcher._read@identity')
+            identity = title
+        return identity, title
+
+    def refresh(self) -> bool:
+        """Re-read the foreground window; returns True if it changed."""
+        identity, title = self._read()
+        with self._cond:
+            cur = self._snapshot
+            if identity == cur.identity and title == cur.title and cur.version:
+                return False
+            self._snapshot = FocusSnapshot(identity, title, cur.version + 1)
+            self._cond.notify_all()
+            subscribers = list(self._subscribers)
+        for ev in subscribers:
+            ev.set()
+        return True
+
+    def _poll_loop(self, stop: threading.Event) -> None:
+        interval = self.MIN_INTERVAL
+        while not stop.is_set():
+            self._wake.wait(interval)
+            self._wake.clear()
+            if stop.is_set():
+                break
+            ceiling = self.NATIVE_MAX_INTERVAL if self._native else self.MAX_INTERVAL
+            if self.refresh():
+                interval = self.MIN_INTERVAL
+            else:
+                interval = min(ceiling, interval * 1.5)
+
+    def _native_loop(self, stop: threading.Event) -> None:
+        """Run the platform's focus-change hook, if it has one.
+
+        ``watch_focus`` blocks until ``stop`` is set and returns False
+        straight away when the platform has no notifications; polling then
+        stays at its normal ceiling.
+        """
+        self._native = True
+        try:
+            self._platform.watch_focus(self.poke, stop)
+        except Exception:
+            _log_caught('FocusWatcher._native_loop')
+        self._native = False
+
+
+_shared: Optional[FocusWatcher] = None
+_shared_refs = 0
+_shared_lock = threading.Lock()
+
+
+def acquire(platform) -> FocusWatcher:
+    """Return the shared watcher, starting it on first use."""
+    global _shared, _shared_refs
+    with _shared_lock:
+        if _shared is None:
+            _shared = FocusWatcher(platform)
+        _shared_refs += 1
+        _shared.start()
+        return _shared
+
+
+def release(watcher: Optional[FocusWatcher]) -> None:
+    """Drop a reference from :func:`acquire`; stops the thread at zero."""
+    global _shared, _shared_refs
+    if watcher is None:
+        return
+    with _shared_lock:
+        if watcher is not _shared:
+            watcher.stop()
+            return
+        _shared_refs = max(0, _shared_refs - 1)
+        if _shared_refs == 0:
+            _shared.stop()
+            _shared = None
+
+
+__all__ = ["FocusSnapshot", "FocusWatcher", "acquire", "release"]
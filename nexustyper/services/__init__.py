@@ -5,6 +5,8 @@ Modules:
   installer_downloader  InstallerDownloader (QObject) — streams installer to disk
   hotkeys               translate_hotkey_for_pynput helper
   logging_setup         configured logger, _log_caught helper, install_global_handlers
+  run_journal           RunJournal — append-only checkpoints for resuming typing runs
+  clipboard             ClipboardService (QObject) — in-process clipboard owner for pastes
 """
 
 from nexustyper.services.update_checker import UpdateChecker
@@ -17,6 +19,8 @@ from nexustyper.services.logging_setup import (
     install_global_handlers,
     logger,
 )
+from nexustyper.services.run_journal import RunCheckpoint, RunJournal, last_run
+from nexustyper.services.clipboard import ClipboardService
 
 __all__ = [
     "UpdateChecker",
@@ -27,4 +31,8 @@ __all__ = [
     "LOG_FILE",
     "_log_caught",
     "install_global_handlers",
+    "RunCheckpoint",
+    "RunJournal",
+    "last_run",
+    "ClipboardService",
 ]
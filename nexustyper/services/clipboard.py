@@ -0,0 +1,147 @@
+"""nexustyper.services.clipboard — in-process clipboard owner for pastes.
+
+``pyperclip`` shells out to ``xclip``/``xsel`` on Linux for every read and
+write, and a paste-heavy run (Paste Mode, PASTE regions, IME-friendly
+typing) pays that process launch on every paste. :class:`ClipboardService`
+keeps the clipboard in-process through Qt's ``QClipboard`` instead. It is
+created on the GUI thread, which owns the clipboard; calls from the typing
+worker's thread go through a request queue and block until the GUI thread
+has answered.
+
+The text is offered as a ``QMimeData`` whose data is read on demand, so
+the service also sees when the paste target fetched it. Call
+:meth:`ClipboardService.expect_fetch` right before sending the paste
+shortcut and :meth:`ClipboardService.wait_fetched` after it: the worker
+moves on as soon as the target has the data instead of sleeping a fixed
+settle time. Where the platform copies the data eagerly the fetch is never
+seen and the wait simply runs to its timeout, i.e. the old fixed settle.
+
+Calls return ``None``/``False`` instead of raising when the GUI thread
+doesn't answer within ``CALL_TIMEOUT`` (busy, shutting down), so the caller
+can fall back to ``pyperclip``. Never raises into Qt.
+"""
+
+from __future__ import annotations
+from nexustyper.services.logging_setup import _log_caught
+
+import queue
+import threading
+from typing import Callable, Optional
+
+from PyQt5.QtCore import QMimeData, QObject, Qt, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QGuiApplication
+
+
+# Longest a worker thread waits for the GUI thread to serve a request.
+CALL_TIMEOUT = 1.0
+
+_PENDING = 0
+_RUNNING = 1
+_CANCELLED = 2
+
+
+class _FetchTrackingMimeData(QMimeData):
+    """Plain-text mime data that reports every on-demand read."""
+
+    def __init__(self, text: str, on_fetch: Callable[[], None]) -> None:
+        super().__init__()
+        self._on_fetch = on_fetch
+        self.setText(text)
+
+    def retrieveData(self, mime_type, preferred_type):
+        try:
+            self._on_fetch()
+        except Exception:
+            _log_caught('_FetchTrackingMimeData.retrieveData')
+        return super().retrieveData(mime_type, preferred_type)
+
+
+class _Request:
+    __slots__ = ('fn', 'done', 'result', 'state', 'lock')
+
+    def __init__(self, fn: Callable[[], object]) -> None:
+        self.fn = fn
+        self.done = threading.Event()
+        self.result = None
+        self.state = _PENDING
+        self.lock = threading.Lock()
+
+
+class ClipboardService(QObject):
+    """Thread-safe, in-process access to the system clipboard.
+
+    Construct on the GUI thread (after the ``QApplication``). :meth:`text`,
+    :meth:`set_text`, :meth:`expect_fetch` and :meth:`wait_fetched` may be
+    called from any thread.
+    """
+
+    _wake = pyqtSignal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._owner = threading.get_ident()
+        self._requests: "queue.SimpleQueue[_Request]" = queue.SimpleQueue()
+        self._fetched = threading.Event()
+        self._wake.connect(self._drain, Qt.QueuedConnection)
+
+    # ----------------------------------------------------------------- public
+    def text(self) -> Optional[str]:
+        """The clipboard's text, or None when it couldn't be read."""
+        return self._call(lambda: QGuiApplication.clipboard().text())
+
+    def set_text(self, text: str) -> bool:
+        """Own the clipboard with ``text``; False when that failed."""
+        def put() -> bool:
+            QGuiApplication.clipboard().setMimeData(_FetchTrackingMimeData(text, self._fetched.set))
+            return True
+        return bool(self._call(put))
+
+    def expect_fetch(self) -> None:
+        """Forget earlier reads (clipboard managers copy on every change);
+        the next one is the paste target's."""
+        self._fetched.clear()
+
+    def wait_fetched(self, timeout: float) -> bool:
+        """Block until the clipboard is read after :meth:`expect_fetch`, up
+        to ``timeout`` seconds. True when it was."""
+        return self._fetched.wait(max(0.0, timeout))
+
+    # --------------------------------------------------------------- internal
+    def _call(self, fn: Callable[[], object]):
+        if threading.get_ident() == self._owner:
+            try:
+                return fn()
+            except Exception:
+                _log_caught('ClipboardService._call')
+                return None
+        req = _Request(fn)
+        self._requests.put(req)
+        self._wake.emit()
+        if not req.done.wait(CALL_TIMEOUT):
+            with req.lock:
+                if req.state == _PENDING:
+                    # Never run it late, after the caller fell back.
+                    req.state = _CANCELLED
+                    return None
+            req.done.wait(CALL_TIMEOUT)
+        return req.result
+
+    @pyqtSlot()
+    def _drain(self) -> None:
+        while True:
+            try:
+                req = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            with req.lock:
+                if req.state == _CANCELLED:
+                    continue
+                req.state = _RUNNING
+            try:
+                req.result = req.fn()
+            except Exception:
+                _log_caught('ClipboardService._drain')
+            req.done.set()
+
+
+__all__ = ["CALL_TIMEOUT", "ClipboardService"]
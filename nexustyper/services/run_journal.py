@@ -0,0 +1,246 @@
+"""Crash-safe checkpoint journal for typing runs.
+
+``TypingWorker`` appends compact JSON checkpoints (run id, text and settings
+hashes, lap, plan offset, progress) to ``~/.nexustyper_pro/run_journal.jsonl``
+every ``FLUSH_INTERVAL`` seconds or ``FLUSH_CHARS`` typed characters,
+whichever comes first, and "Resume last run" restarts from the latest one
+(:func:`last_run`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, NamedTuple, Optional
+
+from nexustyper.services.logging_setup import _log_caught
+
+
+JOURNAL_FILE = os.path.join(os.path.expanduser("~"), ".nexustyper_pro", "run_journal.jsonl")
+FLUSH_INTERVAL = 1.0
+# Fast bursts and pastes can type far more than usual in FLUSH_INTERVAL;
+# this bounds how much of them a crash can lose.
+FLUSH_CHARS = 500
+JOURNAL_MAX_BYTES = 256 * 1024
+KEEP_RUNS = 20
+
+EV_START = "start"
+EV_CHECKPOINT = "ckpt"
+EV_PAUSED = "paused"
+EV_STOPPED = "stopped"
+EV_ERROR = "error"
+EV_DONE = "done"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+
+
+def settings_hash(plan_key) -> str:
+    """Hash of a ``plan_settings_key`` tuple; plan offsets are only valid
+    for a plan compiled with the same settings."""
+    return hashlib.blake2b(repr(plan_key).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class RunCheckpoint(NamedTuple):
+    run_id: str
+    text_hash: str
+    settings_hash: str
+    lap: int
+    laps: int
+    offset: int
+    chars_done: int
+    total: int
+    elapsed: float
+    event: str
+
+    @property
+    def resumable(self) -> bool:
+        return self.event != EV_DONE and self.lap > 0
+
+
+def _read_runs(path: str) -> Dict[str, dict]:
+    """Merge each run's records into one dict, in order of first appearance."""
+    runs: Dict[str, dict] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    rid = rec["run"]
+                except Exception:
+                    _log_caught("_read_runs@line")
+                    continue
+                runs.setdefault(rid, {}).update(rec)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        _log_caught("_read_runs")
+    return runs
+
+
+def last_run(path: str = JOURNAL_FILE) -> Optional[RunCheckpoint]:
+    """The most recently started run's latest checkpoint, or None."""
+    runs = _read_runs(path)
+    if not runs:
+        return None
+    rec = runs[next(reversed(runs))]
+    try:
+        return RunCheckpoint(
+            rec["run"], rec["text"], rec.get("settings", ""),
+            int(rec.get("lap", 0)), int(rec.get("laps", 1)), int(rec.get("off", 0)),
+            int(rec.get("chars", 0)), int(rec.get("total", 0)),
+            float(rec.get("el", 0.0)), rec.get("ev", EV_START),
+        )
+    except Exception:
+        _log_caught("last_run")
+        return None
+
+
+def _compact(path: str) -> None:
+    runs = _read_runs(path)
+    keep = list(runs.values())[-KEEP_RUNS:]
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for rec in keep:
+            f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+    os.replace(tmp, path)
+
+
+class RunJournal:
+    """Append-only checkpoint writer for one typing run.
+
+    Written from the worker thread; :meth:`flush` may also be called from
+    the GUI thread on pause, so writes go through a lock. Any I/O failure
+    disables the journal for the rest of the run instead of touching the
+    typing loop.
+    """
+
+    def __init__(self, path: str = JOURNAL_FILE) -> None:
+        self.path = path
+        self.run_id = ""
+        self._file = None
+        self._lock = threading.Lock()
+        self._elapsed: Callable[[], float] = lambda: 0.0
+        self._base = {}
+        self._lap = 0
+        self._offset = 0
+        self._chars = 0
+        self._settings = ""
+        self._due = 0.0
+        self._due_chars = 0
+
+    @property
+    def active(self) -> bool:
+        return self._file is not None
+
+    def begin(self, text_digest: str, laps: int, total: int,
+              elapsed: Callable[[], float], resume: Optional[RunCheckpoint] = None) -> bool:
+        """Open the journal and record a run start. A resumed run keeps
+        ``resume``'s run id and is recorded at its position, so the
+        checkpoint survives a stop or crash before the next flush. Returns
+        False when the journal can't be used."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            torn = False
+            try:
+                if os.path.getsize(self.path) > JOURNAL_MAX_BYTES:
+                    _compact(self.path)
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            except OSError:
+                pass
+            self._file = open(self.path, "a", encoding="utf-8")
+            if torn:
+                # A crash mid-write left a partial line; start on a fresh one.
+                self._file.write("\n")
+        except Exception:
+            _log_caught("RunJournal.begin")
+            self._file = None
+            return False
+        self._elapsed = elapsed
+        if resume is not None:
+            self.run_id = resume.run_id
+            self._lap, self._offset, self._chars = resume.lap, resume.offset, resume.chars_done
+        else:
+            self.run_id = uuid.uuid4().hex[:12]
+        self._base = {"run": self.run_id, "text": text_digest, "laps": int(laps), "total": int(total)}
+        self._write(EV_START if resume is None else EV_CHECKPOINT)
+        return self.active
+
+    def set_settings(self, digest: str) -> None:
+        self._settings = digest
+
+    def set_total(self, total: int) -> None:
+        self._base["total"] = int(total)
+
+    def note(self, lap: int, offset: int, chars_done: int) -> None:
+        """Record the position before plan event ``offset`` of ``lap``;
+        written out once ``FLUSH_INTERVAL`` seconds or ``FLUSH_CHARS``
+        characters have passed since the last record."""
+        self._lap = lap
+        self._offset = offset
+        self._chars = chars_done
+        if self._file is not None and (chars_done >= self._due_chars or time.monotonic() >= self._due):
+            self._write(EV_CHECKPOINT)
+
+    def flush(self, event: str = EV_CHECKPOINT) -> None:
+        if self._file is not None:
+            self._write(event)
+
+    def end(self, event: str) -> None:
+        """Write the final record, fsync and close."""
+        if self._file is None:
+            return
+        self._write(event)
+        with self._lock:
+            f, self._file = self._file, None
+            try:
+                f.flush()
+                os.fsync(f.fileno())
+            except Exception:
+                _log_caught("RunJournal.end@fsync")
+            try:
+                f.close()
+            except Exception:
+                _log_caught("RunJournal.end@close")
+
+    def _write(self, event: str) -> None:
+        with self._lock:
+            f = self._file
+            if f is None:
+                return
+            self._due = time.monotonic() + FLUSH_INTERVAL
+            self._due_chars = self._chars + FLUSH_CHARS
+            try:
+                rec = dict(self._base)
+                rec.update(
+                    ev=event, settings=self._settings, lap=self._lap, off=self._offset,
+                    chars=self._chars, el=round(self._elapsed(), 3), t=round(time.time(), 1),
+                )
+                f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+                f.flush()
+            except Exception:
+                _log_caught("RunJournal._write")
+                self._file = None
+                try:
+                    f.close()
+                except Exception:
+                    _log_caught("RunJournal._write@close")
+
+
+__all__ = [
+    "FLUSH_CHARS",
+    "FLUSH_INTERVAL",
+    "JOURNAL_FILE",
+    "RunCheckpoint",
+    "RunJournal",
+    "last_run",
+    "settings_hash",
+    "text_hash",
+]
@@ -2,13 +2,25 @@
 
 Modules:
   sanitize.py          text-cleaning helpers (sanitize_ai_text, apply_smart_newlines)
-  macros.py            inline {{PAUSE/PRESS/CLICK/COMMENT}} parsing & execution
+  macros.py            inline {{PAUSE/PRESS/CLICK/COMMENT}} compiling, validation & execution
   mistakes.py          QWERTY adjacency map for fat-finger error injection
   personas.py          typing persona presets
   browser.py           window-title heuristics for auto-optimize
+  plan.py              compile text + run settings into a keystroke plan
+  progress.py          lock-free progress counter polled by the UI
+  stream.py            chunked text sources and the streaming text pipeline
+  scheduler.py         deadline-based keystroke pacing on a monotonic clock
+  timing.py            batched, seedable delay/mistake/thinking-pause model
+  pace.py              closed-loop speed controller (overhead the scheduler can't absorb)
+  deadline.py          deadline-targeted pacing (solve the WPM range for "finish in N min")
   worker.py            TypingWorker (Qt thread that drives the typing loop)
   dry_run.py           DryRunWorker (preview-only worker)
   content_detection.py pure content-classification helpers
+  blocks.py            per-block output strategy for mixed content (Block Mode)
+  indent.py            List Mode indentation model (minimal batched Tab/Shift+Tab)
+  autocomplete.py      popup-likelihood model for the autocomplete Esc guard
+  keymap.py            layout-aware character -> key tables (XKB / VkKeyScanExW)
+  transliterate.py     precompiled ASCII transliteration for the Unicode fallback
 
 Public re-exports below mirror the most-used symbols so callers can write
 ``from nexustyper.typing import TypingWorker`` without reaching into the
@@ -17,16 +29,24 @@ submodules.
 
 from __future__ import annotations
 
+from nexustyper.typing.autocomplete import GuardProfile, PopupModel, guard_profile
+from nexustyper.typing.blocks import BlockSegmenter, TextBlock, block_strategy, segment_blocks
 from nexustyper.typing.browser import (
     auto_optimize_for_window,
     is_browser_title,
     looks_like_code_quick,
 )
 from nexustyper.typing.dry_run import DryRunWorker
+from nexustyper.typing.indent import IndentPlanner, plan_indents
+from nexustyper.typing.keymap import Keymap, KeymapService
 from nexustyper.typing.macros import (
     MACRO_FULLMATCH_RE,
     MACRO_SPLIT_RE,
+    MacroProgram,
+    MacroSpan,
+    compile_macros,
     execute_macro,
+    macro_environment,
     strip_macros,
     validate_macro,
 )
@@ -48,7 +68,14 @@ from nexustyper.typing.content_detection import (
     looks_like_code,
     looks_like_math,
 )
+from nexustyper.typing.plan import KeystrokePlan, PlanCompiler, compile_plan
+from nexustyper.typing.progress import ProgressCounter, ProgressSnapshot
 from nexustyper.typing.sanitize import apply_smart_newlines, sanitize_ai_text
+from nexustyper.typing.scheduler import KeystrokeScheduler
+from nexustyper.typing.transliterate import TransliterationReport, transliterate
+from nexustyper.typing.stream import TextSource, prepare_chunks
+from nexustyper.typing.pace import SpeedController
+from nexustyper.typing.timing import TimingModel
 from nexustyper.typing.worker import MISTAKE_CHANCE, TypingWorker
 
 
@@ -65,6 +92,10 @@ __all__ = [
     "validate_macro",
     "execute_macro",
     "strip_macros",
+    "MacroProgram",
+    "MacroSpan",
+    "compile_macros",
+    "macro_environment",
     # mistakes
     "KEY_ADJACENCY",
     "adjacent_key",
@@ -78,6 +109,25 @@ __all__ = [
     "PERSONA_CUSTOM",
     "CODE_DEFAULTS",
     "apply_persona",
+    # plan
+    "KeystrokePlan",
+    "PlanCompiler",
+    "compile_plan",
+    # indent
+    "IndentPlanner",
+    "plan_indents",
+    # progress
+    "ProgressCounter",
+    "ProgressSnapshot",
+    # stream
+    "TextSource",
+    "prepare_chunks",
+    # scheduler
+    "KeystrokeScheduler",
+    # timing
+    "TimingModel",
+    # pace
+    "SpeedController",
     # browser
     "is_browser_title",
     "looks_like_code_quick",
@@ -88,4 +138,19 @@ __all__ = [
     "contains_non_ascii",
     "looks_like_code",
     "looks_like_math",
+    # autocomplete
+    "GuardProfile",
+    "PopupModel",
+    "guard_profile",
+    # keymap
+    "Keymap",
+    "KeymapService",
+    # transliterate
+    "TransliterationReport",
+    "transliterate",
+    # blocks
+    "BlockSegmenter",
+    "TextBlock",
+    "block_strategy",
+    "segment_blocks",
 ]
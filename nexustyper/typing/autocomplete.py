@@ -0,0 +1,177 @@
+"""Popup-likelihood model for the autocomplete Esc guard.
+
+:class:`PopupModel` rates, at plan time, how plausible an open editor
+suggestion popup is before each guard character, Tab and Enter
+(``POPUP_NONE`` .. ``POPUP_HIGH``). The worker raises the rating after a
+real pause (:func:`settle_gap`) and presses Esc only when it reaches the
+target category's :class:`GuardProfile`.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, NamedTuple
+
+
+POPUP_NONE = 0
+POPUP_LOW = 1
+POPUP_MID = 2
+POPUP_HIGH = 3
+
+# A key this long (seconds) after the previous one gives a debounced popup
+# (language servers, JetBrains' autopopup delay) time to appear.
+POPUP_SETTLE = 0.15
+# At human speeds most ordinary gaps exceed POPUP_SETTLE, so a gap must
+# also span this many typical key intervals (a thinking pause, a typo
+# correction, a PAUSE macro) to count.
+POPUP_SETTLE_KEYS = 3
+
+# Identifiers this short match many longer suggestions.
+SHORT_WORD = 2
+# Longest word prefix kept for the keyword check.
+_WORD_CAP = 32
+
+# Characters after which the next word is completed from a member/mention
+# list rather than from words.
+_TRIGGERS = frozenset('.@#:')
+
+# Exact keywords: the popup's top item is the word itself, so accepting it
+# is harmless except through Tab/Enter (snippets).
+KEYWORDS = frozenset((
+    'and', 'as', 'assert', 'async', 'await', 'break', 'case', 'catch', 'class',
+    'const', 'continue', 'def', 'default', 'del', 'do', 'elif', 'else',
+    'except', 'export', 'extends', 'false', 'False', 'finally', 'fn', 'for',
+    'from', 'func', 'function', 'global', 'if', 'import', 'in', 'int', 'is',
+    'lambda', 'let', 'match', 'new', 'nonlocal', 'None', 'not', 'null', 'or',
+    'pass', 'private', 'protected', 'public', 'raise', 'return', 'self',
+    'static', 'str', 'struct', 'switch', 'this', 'throw', 'true', 'True',
+    'try', 'type', 'var', 'void', 'while', 'with', 'yield',
+))
+
+
+class GuardProfile(NamedTuple):
+    """Minimum popup level that makes the worker press Esc."""
+    guard: int      # before a guard character or Tab mid-line
+    newline: int    # before Enter
+    strong: int     # before Enter: double Esc (else a single one)
+
+
+GUARD_PROFILES: Dict[str, GuardProfile] = {
+    'code': GuardProfile(POPUP_MID, POPUP_MID, POPUP_MID),
+    'chat': GuardProfile(POPUP_HIGH, POPUP_HIGH, POPUP_HIGH),
+    'text': GuardProfile(POPUP_HIGH, POPUP_HIGH, POPUP_HIGH),
+    'browser': GuardProfile(POPUP_MID, POPUP_MID, POPUP_HIGH),
+    'unknown': GuardProfile(POPUP_MID, POPUP_MID, POPUP_HIGH),
+}
+
+
+def guard_profile(category: str) -> GuardProfile:
+    """The :class:`GuardProfile` for a ``categorize_title`` category."""
+    return GUARD_PROFILES.get(category, GUARD_PROFILES['unknown'])
+
+
+def settle_gap(min_delay: float, max_delay: float) -> float:
+    """Gap (seconds) after which a key counts as following a pause, for
+    per-key delays drawn between ``min_delay`` and ``max_delay``."""
+    return max(POPUP_SETTLE, POPUP_SETTLE_KEYS * (min_delay + max_delay) / 2)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class PopupModel:
+    """Incremental popup-likelihood scanner; one instance per plan.
+
+    :meth:`level` rates typing ``ch`` next without advancing; :meth:`feed`
+    advances past a typed character; :meth:`reset` forgets the context
+    (after a paste, a key macro, or List Mode's Enter).
+    """
+
+    __slots__ = ('_word', '_trigger', '_last', '_last2', '_quote', '_comment')
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._word = ''
+        # The word follows a member/mention trigger.
+        self._trigger = False
+        self._last = ''
+        self._last2 = ''
+        self._quote = ''
+        self._comment = False
+
+    def level(self, ch: str) -> int:
+        word = self._word
+        if self._quote or self._comment:
+            return POPUP_LOW if word else POPUP_NONE
+        if not word:
+            last = self._last
+            if last == '.' or (last == '>' and self._last2 == '-') or (last == ':' and self._last2 == ':'):
+                # The trigger itself opened a member list.
+                return POPUP_HIGH if ch in '\n\t' else POPUP_MID
+            return POPUP_NONE
+        if word[0].isdigit():
+            return POPUP_LOW
+        if ch == '\t' or self._trigger:
+            return POPUP_HIGH
+        if word in KEYWORDS:
+            return POPUP_MID if ch == '\n' else POPUP_LOW
+        return POPUP_HIGH if len(word) <= SHORT_WORD else POPUP_MID
+
+    def feed(self, ch: str) -> None:
+        last = self._last
+        if ch == '\n':
+            self.reset()
+            return
+        if _is_word_char(ch):
+            if not self._word:
+                self._trigger = last in _TRIGGERS or (last == '>' and self._last2 == '-')
+            if len(self._word) < _WORD_CAP:
+                self._word += ch
+        else:
+            self._word = ''
+            self._trigger = False
+            if self._quote:
+                if ch == self._quote and last != '\\':
+                    self._quote = ''
+            elif self._comment:
+                pass
+            elif ch in '"`' or (ch == "'" and not _is_word_char(last)):
+                self._quote = ch
+            elif (ch == ' ' and last == '#') or (ch == '/' and last == '/'):
+                self._comment = True
+        self._last2 = last
+        self._last = ch
+
+    def feed_text(self, text: str) -> None:
+        for ch in text:
+            self.feed(ch)
+
+
+def newline_dismissals(text: str, profile: GuardProfile) -> int:
+    """Newlines in ``text`` the Esc guard would dismiss before under
+    ``profile`` (the duration estimate's share of guard overhead)."""
+    model = PopupModel()
+    count = 0
+    for ch in text:
+        if ch == '\n' and model.level(ch) >= profile.newline:
+            count += 1
+        model.feed(ch)
+    return count
+
+
+__all__ = [
+    "POPUP_NONE",
+    "POPUP_LOW",
+    "POPUP_MID",
+    "POPUP_HIGH",
+    "POPUP_SETTLE",
+    "POPUP_SETTLE_KEYS",
+    "GUARD_PROFILES",
+    "GuardProfile",
+    "PopupModel",
+    "guard_profile",
+    "newline_dismissals",
+    "settle_gap",
+]
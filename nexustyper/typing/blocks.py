@@ -0,0 +1,175 @@
+"""Block segmenter for mixed content ("Block Mode").
+
+:class:`BlockSegmenter` splits text into fenced code, tables, indented code
+and prose paragraphs, incrementally and losslessly; :func:`block_strategy`
+types prose, pastes tables and code, and sends code through List Mode when
+the target is a code editor.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, NamedTuple, Optional
+
+from nexustyper.typing.content_detection import looks_like_code
+
+
+BLOCK_PROSE = 'prose'
+BLOCK_CODE = 'code'
+BLOCK_TABLE = 'table'
+
+STRATEGY_TYPE = 'type'
+STRATEGY_PASTE = 'paste'
+STRATEGY_LIST = 'list'
+
+# A paragraph or fenced block longer than this is emitted in pieces.
+BLOCK_MAX = 64 * 1024
+
+_FENCE_RE = re.compile(r'[ \t]{0,3}(`{3,}|~{3,})')
+_TABLE_ROW_RE = re.compile(r'[ \t]*\|.*\|[ \t]*$')
+
+
+class TextBlock(NamedTuple):
+    kind: str
+    text: str
+
+
+def _indented(line: str) -> bool:
+    return line.startswith(('    ', '\t'))
+
+
+def classify_paragraph(text: str) -> str:
+    """``BLOCK_TABLE`` for pipe-table rows, ``BLOCK_CODE`` for an indented
+    paragraph that looks like code, else ``BLOCK_PROSE``."""
+    lines = [ln for ln in text.split('\n') if ln.strip()]
+    if not lines:
+        return BLOCK_PROSE
+    if len(lines) >= 2 and all(_TABLE_ROW_RE.match(ln) for ln in lines):
+        return BLOCK_TABLE
+    if all(_indented(ln) for ln in lines) and looks_like_code(text):
+        return BLOCK_CODE
+    return BLOCK_PROSE
+
+
+def block_strategy(kind: str, code_target: bool = False) -> str:
+    """How a block of ``kind`` is output; ``code_target`` when the focused
+    window is a code editor."""
+    if kind == BLOCK_PROSE:
+        return STRATEGY_TYPE
+    if kind == BLOCK_CODE and code_target:
+        return STRATEGY_LIST
+    return STRATEGY_PASTE
+
+
+class BlockSegmenter:
+    """Incremental splitter: :meth:`feed` takes text and returns the blocks
+    it completed; :meth:`finish` returns the rest.
+
+    Text may be cut anywhere: a trailing line without its newline is held
+    until the next call completes it (or it reaches ``BLOCK_MAX``).
+    """
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+        self._size = 0
+        # The unterminated last line of the previous feed().
+        self._partial = ''
+        # The opening fence while inside a fenced block.
+        self._fence: Optional[str] = None
+
+    def feed(self, text: str) -> List[TextBlock]:
+        out: List[TextBlock] = []
+        lines = (self._partial + text).split('\n')
+        for line in lines[:-1]:
+            self._line(line + '\n', out)
+        self._partial = lines[-1]
+        if len(self._partial) >= BLOCK_MAX:
+            self._line(self._partial, out)
+            self._partial = ''
+        return _merge(out)
+
+    def finish(self) -> List[TextBlock]:
+        out: List[TextBlock] = []
+        if self._partial:
+            self._line(self._partial, out)
+            self._partial = ''
+        if self._fence is not None:
+            self._emit(BLOCK_CODE, out)
+            self._fence = None
+        else:
+            self._flush(out)
+        return _merge(out)
+
+    def _line(self, line: str, out: List[TextBlock]) -> None:
+        if self._fence is not None:
+            self._append(line)
+            m = _FENCE_RE.match(line)
+            if (m and m.group(1)[0] == self._fence[0] and len(m.group(1)) >= len(self._fence)
+                    and not line[m.end():].strip()):
+                self._fence = None
+                self._emit(BLOCK_CODE, out)
+            elif self._size >= BLOCK_MAX:
+                self._emit(BLOCK_CODE, out)
+            return
+        m = _FENCE_RE.match(line)
+        if m:
+            self._flush(out)
+            self._fence = m.group(1)
+            self._append(line)
+            return
+        self._append(line)
+        # A blank line ends the paragraph and stays attached to it.
+        if not line.strip() or self._size >= BLOCK_MAX:
+            self._flush(out)
+
+    def _append(self, line: str) -> None:
+        self._lines.append(line)
+        self._size += len(line)
+
+    def _flush(self, out: List[TextBlock]) -> None:
+        if self._lines:
+            text = ''.join(self._lines)
+            self._reset()
+            out.append(TextBlock(classify_paragraph(text), text))
+
+    def _emit(self, kind: str, out: List[TextBlock]) -> None:
+        if self._lines:
+            out.append(TextBlock(kind, ''.join(self._lines)))
+            self._reset()
+
+    def _reset(self) -> None:
+        self._lines = []
+        self._size = 0
+
+
+def _merge(blocks: List[TextBlock]) -> List[TextBlock]:
+    """Join neighbouring blocks of the same kind (one paste, not several)."""
+    out: List[TextBlock] = []
+    for block in blocks:
+        if out and out[-1].kind == block.kind:
+            out[-1] = TextBlock(block.kind, out[-1].text + block.text)
+        else:
+            out.append(block)
+    return out
+
+
+def segment_blocks(text: str) -> List[TextBlock]:
+    """All blocks of ``text`` in one call."""
+    segmenter = BlockSegmenter()
+    return _merge(segmenter.feed(text) + segmenter.finish())
+
+
+__all__ = [
+    "BLOCK_PROSE",
+    "BLOCK_CODE",
+    "BLOCK_TABLE",
+    "STRATEGY_TYPE",
+    "STRATEGY_PASTE",
+    "STRATEGY_LIST",
+    "BLOCK_MAX",
+    "TextBlock",
+    "BlockSegmenter",
+    "block_strategy",
+    "classify_paragraph",
+    "segment_blocks",
+]
@@ -110,6 +110,8 @@ def auto_optimize_for_window(
     - ``add_mistakes`` (bool)
     - ``pause_on_punct`` (bool)
     - ``newline_mode`` (str, optional — only set when we want to override)
+    - ``code_target`` (bool, optional) — the window is a code editor; Block
+      Mode then types code blocks in List Mode
     - ``chosen`` (str | None) — human-readable label for status messages
 
     An empty dict (with ``chosen=None``) means "no rule matched, leave the
@@ -139,12 +141,14 @@ def auto_optimize_for_window(
             "type_tabs": True,
             "add_mistakes": False,
             "pause_on_punct": True,
+            "code_target": True,
             "chosen": "Code editor",
         })
         # For code-like content in a code editor, List Mode avoids
         # indentation drift from editor auto-indent. Never force Paste Mode;
-        # only adjust away from modes that break code formatting.
-        if looks_like_code_quick(text_to_type) and current_newline_mode != "Paste Mode":
+        # only adjust away from modes that break code formatting. Block Mode
+        # already handles code per block.
+        if looks_like_code_quick(text_to_type) and current_newline_mode not in ("Paste Mode", "Block Mode"):
             overrides["newline_mode"] = "List Mode"
         return overrides
 
@@ -0,0 +1,175 @@
+"""Deadline-targeted pacing: "finish this text in N minutes".
+
+:func:`profile_plan` measures a compiled plan's typing and fixed costs, and
+:func:`solve_deadline` turns the output and time left into a WPM range
+(the user's range, scaled) plus a scale for thinking pauses and mistakes.
+The worker re-solves as it goes, so pauses and overhead are made up.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Optional, Tuple
+
+from nexustyper.constants import MAX_WPM_LIMIT, MIN_WPM_LIMIT
+from nexustyper.typing.plan import (
+    F_BOUNDARY,
+    F_BRACKET,
+    F_MISTAKE,
+    F_PUNCT,
+    OP_BURST,
+    OP_DEDENT,
+    OP_INDENT,
+    OP_LINE_END,
+    OP_MACRO,
+    OP_PASTE,
+    TYPED_OPS,
+    KeystrokePlan,
+)
+from nexustyper.typing.timing import (
+    BRACKET_PAUSE,
+    MISTAKE_HOLD,
+    MISTAKE_RECOVER,
+    PUNCT_PAUSE,
+    SPREAD_ALPHA,
+    SPREAD_BETA,
+    THINKING_PAUSE,
+)
+
+
+# Seconds between re-solves while a deadline run is typing.
+RESOLVE_INTERVAL = 2.0
+# The thinking-pause budget grows to at most this multiple of the persona's.
+EXTRA_SCALE_MAX = 4.0
+# Fixed costs (seconds) of non-typed events, as in the duration estimator.
+PASTE_OVERHEAD = 0.01
+LINE_END_COST = 0.12
+INDENT_COST = 0.03
+MACRO_COSTS = {'PRESS': 0.02, 'CLICK': 0.10}
+
+
+def _mean(bounds: Tuple[float, float]) -> float:
+    return (bounds[0] + bounds[1]) / 2
+
+
+class PlanProfile(NamedTuple):
+    """Per-lap totals of a compiled plan that the solver works from."""
+    chars: int        # output characters (progress units)
+    keys: float       # typed keys; a burst counts one per character
+    fixed: float      # seconds that don't depend on WPM
+    punct: int
+    brackets: int
+    boundaries: int
+    eligible: int     # keys that can draw a fat-finger mistake
+
+
+class DeadlineSolution(NamedTuple):
+    min_wpm: int
+    max_wpm: int
+    # Multiplier for the thinking-pause chance; below 1 it also scales the
+    # mistake chance.
+    extras_scale: float
+    # False when the deadline can't be met even at the fastest range with
+    # no extras.
+    feasible: bool
+
+
+def profile_plan(plan: KeystrokePlan) -> PlanProfile:
+    keys = 0
+    fixed = 0.0
+    punct = brackets = boundaries = eligible = 0
+    for op, arg, _char, weight, flags in plan.events:
+        if op in TYPED_OPS:
+            keys += 1
+            if flags & F_PUNCT:
+                punct += 1
+            elif flags & F_BRACKET:
+                brackets += 1
+            if flags & F_BOUNDARY:
+                boundaries += 1
+            if flags & F_MISTAKE:
+                eligible += 1
+        elif op == OP_BURST:
+            keys += weight
+        elif op == OP_PASTE:
+            fixed += (arg[1] + arg[2]) / 2 + PASTE_OVERHEAD
+        elif op == OP_LINE_END:
+            fixed += LINE_END_COST
+        elif op == OP_DEDENT or op == OP_INDENT:
+            fixed += INDENT_COST
+        elif op == OP_MACRO:
+            command, params = arg
+            if command == 'PAUSE':
+                try:
+                    fixed += float(params)
+                except (TypeError, ValueError):
+                    pass
+            else:
+                fixed += MACRO_COSTS.get(command, 0.0)
+    return PlanProfile(plan.output_chars, keys, fixed, punct, brackets, boundaries, eligible)
+
+
+def solve_deadline(
+    profile: PlanProfile,
+    remaining_chars: int,
+    seconds_left: float,
+    wpm_range: Tuple[float, float],
+    *,
+    pause_on_punct: bool,
+    mistakes: bool,
+    thinking_chance: float,
+    mistake_chance: float,
+) -> Optional[DeadlineSolution]:
+    """The WPM range and extras scale that type ``remaining_chars`` more
+    output (laps of ``profile``) in ``seconds_left``, keeping the shape of
+    ``wpm_range``. None when speed doesn't matter (nothing left to type
+    per key, or no profile)."""
+    if profile.chars <= 0 or remaining_chars <= 0:
+        return None
+    r = remaining_chars / profile.chars
+    keys = profile.keys * r
+    if keys < 1:
+        return None
+    a = max(1.0, float(wpm_range[0]))
+    b = max(a, float(wpm_range[1]))
+    # Mean delay for the range (a*f, b*f) is c / f seconds per key.
+    p = SPREAD_ALPHA / (SPREAD_ALPHA + SPREAD_BETA)
+    c = 12.0 * (1 / b + p * (1 / a - 1 / b))
+    fixed = profile.fixed * r
+    if pause_on_punct:
+        fixed += (profile.punct * _mean(PUNCT_PAUSE) + profile.brackets * _mean(BRACKET_PAUSE)) * r
+    think = profile.boundaries * r * thinking_chance * _mean(THINKING_PAUSE)
+    slips = 0.0
+    if mistakes:
+        slips = profile.eligible * r * mistake_chance * (_mean(MISTAKE_HOLD) + _mean(MISTAKE_RECOVER))
+
+    f_lo = MIN_WPM_LIMIT / a
+    f_hi = MAX_WPM_LIMIT / b
+    scale = 1.0
+    feasible = True
+    per_key = (seconds_left - fixed - think - slips) / keys
+    f = c / per_key if per_key > 0 else float('inf')
+    if f > f_hi:
+        # Too slow even at the top: spend less on pauses and mistakes.
+        f = f_hi
+        budget = seconds_left - fixed - keys * c / f
+        extras = think + slips
+        scale = min(1.0, max(0.0, budget / extras)) if extras else 0.0
+        feasible = budget >= 0
+    elif f < f_lo:
+        # Too fast even at the bottom: fill the time with thinking pauses.
+        f = f_lo
+        budget = seconds_left - fixed - keys * c / f - slips
+        if think:
+            scale = min(EXTRA_SCALE_MAX, max(1.0, budget / think))
+    lo = int(round(min(MAX_WPM_LIMIT, max(MIN_WPM_LIMIT, a * f))))
+    hi = int(round(min(MAX_WPM_LIMIT, max(lo, b * f))))
+    return DeadlineSolution(lo, hi, scale, feasible)
+
+
+__all__ = [
+    "RESOLVE_INTERVAL",
+    "DeadlineSolution",
+    "PlanProfile",
+    "profile_plan",
+    "solve_deadline",
+]
@@ -1,30 +1,35 @@
 """DryRunWorker — emits a character-by-character preview without keystrokes.
 
 A near-verbatim extraction of ``DryRunWorker`` from ``NexusTyper Pro.py``.
-The pyqtSignal declarations and constructor signature stay byte-identical so
-``DryRunDialog`` keeps working.
+The constructor signature stays byte-identical so ``DryRunDialog`` keeps
+working. Preview characters go into a buffer that the dialog drains on its
+own timer (:meth:`DryRunWorker.take_preview`) rather than one queued
+signal per character.
 """
 
 from __future__ import annotations
 from nexustyper.services.logging_setup import _log_caught
 
-import random
-import re
 import time
+from collections import deque
 
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 
-from nexustyper.typing.macros import MACRO_FULLMATCH_RE, MACRO_SPLIT_RE
+from nexustyper.typing.blocks import BLOCK_PROSE, segment_blocks
+from nexustyper.typing.macros import MacroToken, compile_macros, parse_speed
+from nexustyper.typing.plan import char_flags
 from nexustyper.typing.sanitize import apply_smart_newlines
+from nexustyper.typing.timing import TimingModel, delay_bounds
 
 
 class DryRunWorker(QObject):
     finished = pyqtSignal()
-    update_preview = pyqtSignal(str)
 
-    def __init__(self, text, laps, min_wpm, max_wpm, mode, use_shift_enter, type_tabs=True, enable_macros=True):
+    def __init__(self, text, laps, min_wpm, max_wpm, mode, use_shift_enter, type_tabs=True, enable_macros=True,
+                 macro_base_dir=None):
         super().__init__()
         self.text = text
+        self.macro_base_dir = macro_base_dir
         self.laps = laps
         self.min_wpm = min_wpm
         self.max_wpm = max_wpm
@@ -33,71 +38,110 @@ class DryRunWorker(QObject):
         self.type_tabs = type_tabs
         self.enable_macros = enable_macros
         self._running = True
+        # Preview output not yet shown; appended here, drained by the UI.
+        self._pending = deque()
+        # Same timing model as TypingWorker so the preview paces like a run.
+        self._timing = TimingModel()
 
     def stop(self):
         self._running = False
 
-    def _delay(self, prev_char, char):
-        min_d = 60 / (self.max_wpm * 5)
-        max_d = 60 / (self.min_wpm * 5)
-        sf = random.betavariate(2.5, 2.5)
-        d = min_d + sf * (max_d - min_d)
-        if char in '.,?!':
-            d += random.uniform(0.08, 0.15)
-        elif char in '()[]{}':
-            d += random.uniform(0.1, 0.3)
-        if prev_char and prev_char in ' \t' and random.random() < 0.04:
-            d += random.uniform(0.12, 0.35)
-        return max(0.01, d)
+    def take_preview(self) -> str:
+        """Return (and clear) the characters emitted since the last call."""
+        pending = self._pending
+        out = []
+        while pending:
+            out.append(pending.popleft())
+        return ''.join(out)
+
+    def _delays(self, prev_char, text):
+        """Per-character delays for ``text``, drawn as one batch."""
+        min_d, max_d = delay_bounds(self.min_wpm, self.max_wpm)
+        draw = self._timing.draw(char_flags(text, prev_char))
+        return [draw.delay(i, min_d, max_d - min_d, True) for i in range(len(draw))]
+
+    def _play(self, prev_char, text):
+        """Emit ``text`` char by char at preview pace; returns the last char."""
+        for ch, d in zip(text, self._delays(prev_char, text)):
+            if not self._running:
+                break
+            self._pending.append(ch)
+            time.sleep(d)
+            prev_char = ch
+        return prev_char
+
+    def _span_marker(self, token, base):
+        """Apply a PASTE/SPEED marker; returns the new paste state or None
+        when ``token`` isn't one."""
+        if not token.ok:
+            return None
+        if token.command == 'SPEED':
+            speed = parse_speed(token.normalized[1])
+            self.min_wpm, self.max_wpm = speed if speed is not None else base
+        elif token.command in ('PASTE', '/PASTE'):
+            return token.command == 'PASTE'
+        return None
 
     @pyqtSlot()
     def run(self):
         try:
-            content = self.text
+            program = compile_macros(self.text, base_dir=self.macro_base_dir) if self.enable_macros else None
+            base = (self.min_wpm, self.max_wpm)
             for _lap in range(self.laps):
                 if not self._running:
                     break
-                if self.mode == 'Smart Newlines':
-                    content_iter = apply_smart_newlines(content)
-                else:
-                    content_iter = content
-                if self.mode == 'List Mode':
-                    lines = content_iter.splitlines()
-                    for line in lines:
-                        if not self._running:
-                            break
-                        out = ''
-                        prev = ''
-                        for ch in line.lstrip().replace('\t', ''):
+                self.min_wpm, self.max_wpm = base
+                pasting = False
+                # REPEAT/INCLUDE scripts are previewed piece by piece.
+                pieces = (self.text,)
+                if program is not None and program.has_directives():
+                    pieces = program.iter_text()
+                for content in pieces:
+                    if not self._running:
+                        break
+                    if self.mode == 'Smart Newlines':
+                        content_iter = apply_smart_newlines(content)
+                    else:
+                        content_iter = content
+                    if self.mode == 'List Mode':
+                        lines = content_iter.splitlines()
+                        for line in lines:
                             if not self._running:
                                 break
-                            out += ch
-                            self.update_preview.emit(ch)
-                            time.sleep(self._delay(prev, ch))
-                            prev = ch
-                        # simulate enter
-                        self.update_preview.emit('\n')
-                        time.sleep(0.06)
-                else:
-                    if not self.type_tabs:
-                        content_iter = content_iter.replace('\t', '')
-                    # Process macros by stripping them when enabled; otherwise show them as literal text.
-                    segments = [content_iter]
-                    if self.enable_macros:
-                        segments = re.split(MACRO_SPLIT_RE.pattern, content_iter)
-                    prev = ''
-                    for seg in segments:
-                        if not self._running:
-                            break
-                        if self.enable_macros and MACRO_FULLMATCH_RE.fullmatch(seg):
-                            # show nothing for macros; could display a hint if desired
-                            continue
-                        for ch in seg:
+                            self._play('', line.lstrip().replace('\t', ''))
+                            # simulate enter
+                            self._pending.append('\n')
+                            time.sleep(0.06)
+                    else:
+                        if not self.type_tabs:
+                            content_iter = content_iter.replace('\t', '')
+                        # Block Mode pastes code and tables; prose is typed.
+                        blocks = [(content_iter, False)]
+                        if self.mode == 'Block Mode':
+                            blocks = [(b.text, b.kind != BLOCK_PROSE) for b in segment_blocks(content_iter)]
+                        # Process macros by stripping them when enabled; otherwise show them as literal text.
+                        segments = []
+                        for block, block_paste in blocks:
+                            parts = compile_macros(block).segments if self.enable_macros else [block]
+                            segments.extend((seg, block_paste) for seg in parts)
+                        prev = ''
+                        for seg, block_paste in segments:
                             if not self._running:
                                 break
-                            self.update_preview.emit(ch)
-                            time.sleep(self._delay(prev, ch))
-                            prev = ch
+                            if type(seg) is MacroToken:
+                                # show nothing for macros; PASTE/SPEED change
+                                # how the following text is previewed
+                                paste = self._span_marker(seg, base)
+                                if paste is not None:
+                                    pasting = paste
+                                continue
+                            if pasting or block_paste:
+                                # {{PASTE}} regions and pasted blocks appear at once
+                                self._pending.append(seg)
+                                time.sleep(0.05)
+                                prev = seg[-1:]
+                                continue
+                            prev = self._play(prev, seg)
             self.finished.emit()
         except Exception:
             _log_caught('run@L101')
@@ -0,0 +1,209 @@
+"""List Mode indentation planner.
+
+List Mode strips each line's leading whitespace and lets the editor's
+auto-indent place it. :class:`IndentPlanner` models that auto-indent
+(block openers, closing-bracket dedent, strings and comments ignored) and
+returns the Tab (positive) or Shift+Tab (negative) presses each line needs.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Tuple
+
+
+# Indent unit (spaces per level) until the document shows its own.
+DEFAULT_INDENT_UNIT = 4
+
+_OPENERS = '([{'
+_CLOSERS = ')]}'
+_PAIRS = {')': '(', ']': '[', '}': '{'}
+
+_LANG_PYTHON = 'python'
+_LANG_BRACE = 'brace'
+
+_PY_BLOCK_RE = re.compile(
+    r'(?:async\s+)?(?:def|class|if|elif|else|for|while|try|except|finally|with)\b.*:$')
+_PY_IMPORT_RE = re.compile(r'(?:import\s+\w|from\s+[\w.]+\s+import\b)')
+
+
+def _leading(line: str) -> Tuple[int, int, int]:
+    """``(tabs, spaces, end)`` of ``line``'s leading whitespace."""
+    tabs = spaces = 0
+    end = 0
+    for end, ch in enumerate(line):
+        if ch == '\t':
+            tabs += 1
+        elif ch == ' ':
+            spaces += 1
+        else:
+            return tabs, spaces, end
+    return tabs, spaces, len(line)
+
+
+class IndentPlanner:
+    """Incremental List Mode indentation model; one instance per plan.
+
+    Feed every line of the document, in order, to :meth:`line`.
+    :meth:`reset` puts the cursor back at column 0 (Block Mode, after text
+    that was typed or pasted outside List Mode).
+    """
+
+    __slots__ = ('level', '_unit', '_stack', '_string', '_comment', '_lang',
+                 '_opened', '_prev_spaces')
+
+    def __init__(self) -> None:
+        # The editor's auto-indent level for the next line.
+        self.level = 0
+        self._unit: Optional[int] = None
+        # Level of the line that opened each unclosed bracket.
+        self._stack: List[Tuple[str, int]] = []
+        # Delimiter of a string left open at the end of the last line.
+        self._string: Optional[str] = None
+        # Inside a /* ... */ comment.
+        self._comment = False
+        self._lang: Optional[str] = None
+        # Whether the last non-blank line opened a block, and its spaces.
+        self._opened = False
+        self._prev_spaces = 0
+
+    def reset(self) -> None:
+        self.level = 0
+        self._stack.clear()
+        self._string = None
+        self._comment = False
+        self._opened = False
+        self._prev_spaces = 0
+
+    def line(self, line: str) -> int:
+        """Tab (positive) or Shift+Tab (negative) presses to send before
+        typing ``line`` without its leading whitespace."""
+        tabs, spaces, start = _leading(line)
+        if start >= len(line.rstrip()):
+            return 0
+        if self._string is None and not self._comment:
+            if self._opened and not tabs and self._unit is None:
+                delta = spaces - self._prev_spaces
+                if 2 <= delta <= 8:
+                    self._unit = delta
+        desired = tabs + spaces // (self._unit or DEFAULT_INDENT_UNIT)
+        at_code = self._string is None and not self._comment
+        level, closer_first, last = self._scan(line, start, desired)
+        # A leading closing bracket puts the line back at its opener's
+        # level as soon as it is typed: nothing to send.
+        steps = 0 if closer_first else desired - self.level
+
+        if self._string is not None:
+            # Inside a multi-line string the editor keeps the indentation.
+            self.level = level
+            self._opened = False
+        elif last is not None and (last in _OPENERS or (last == ':' and at_code and not self._stack)):
+            self.level = level + 1
+            self._opened = True
+        else:
+            self.level = level
+            self._opened = False
+        if not tabs:
+            self._prev_spaces = spaces
+        return steps
+
+    # ----------------------------------------------------------- internal
+    def _latch_language(self, code: str) -> None:
+        if _PY_BLOCK_RE.match(code) or _PY_IMPORT_RE.match(code):
+            self._lang = _LANG_PYTHON
+        elif code.endswith('{') or code.endswith(';'):
+            self._lang = _LANG_BRACE
+
+    def _scan(self, line: str, start: int, level: int):
+        """Track strings, comments and brackets over one line typed at
+        ``level``.
+
+        Returns ``(level, closer_first, last)``: the line's level after the
+        editor's closing-bracket auto-dedent, whether that applied, and the
+        last significant code character (None when the line ends inside a
+        string or has no code).
+        """
+        stack = self._stack
+        closer_first = False
+        seen_code = False
+        last = None
+        code_start = None
+        i = start
+        n = len(line)
+        quote = self._string
+        while i < n:
+            ch = line[i]
+            if self._comment:
+                end = line.find('*/', i)
+                if end < 0:
+                    break
+                self._comment = False
+                seen_code = True
+                i = end + 2
+                continue
+            if quote is not None:
+                if ch == '\\':
+                    i += 2
+                    continue
+                if line.startswith(quote, i):
+                    i += len(quote)
+                    quote = None
+                    seen_code = True
+                    last = '"'
+                    continue
+                i += 1
+                continue
+            if ch in ' \t':
+                i += 1
+                continue
+            if ch == '#' and (self._lang == _LANG_PYTHON or i + 1 >= n or line[i + 1] in ' \t!'):
+                break
+            if ch == '/' and i + 1 < n and self._lang != _LANG_PYTHON:
+                nxt = line[i + 1]
+                if nxt == '/':
+                    break
+                if nxt == '*':
+                    self._comment = True
+                    i += 2
+                    continue
+            if code_start is None:
+                code_start = i
+            if ch in '\'"`':
+                if ch != '`' and line.startswith(ch * 3, i):
+                    quote = ch * 3
+                else:
+                    quote = ch
+                i += len(quote)
+                continue
+            if ch in _OPENERS:
+                stack.append((ch, level))
+            elif ch in _CLOSERS:
+                if stack and stack[-1][0] == _PAIRS[ch]:
+                    opened_at = stack.pop()[1]
+                    if not seen_code:
+                        level, closer_first = opened_at, True
+                elif stack:
+                    # Unbalanced, or a bracket in text we misread: drop the
+                    # open brackets rather than let the model drift.
+                    stack.clear()
+            seen_code = True
+            last = ch
+            i += 1
+        if quote is not None and len(quote) == 1 and quote != '`':
+            # A one-line string can't span lines; the line was misread.
+            quote = None
+        self._string = quote
+        if quote is not None:
+            last = None
+        if code_start is not None and self._lang is None:
+            self._latch_language(line[code_start:].rstrip())
+        return level, closer_first, last
+
+
+def plan_indents(text: str) -> List[int]:
+    """Per-line Tab/Shift+Tab presses for typing ``text`` in List Mode."""
+    planner = IndentPlanner()
+    return [planner.line(line) for line in text.splitlines()]
+
+
+__all__ = ["DEFAULT_INDENT_UNIT", "IndentPlanner", "plan_indents"]
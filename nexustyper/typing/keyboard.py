@@ -19,8 +19,21 @@ between pyautogui and the scancode backend per-call based on the user's
   matches a known remote-desktop client.
 * ``MODE_ON``   – always use the scancode backend.
 
-On macOS and Linux the scancode backend is ``None`` and every call falls
-through to plain pyautogui — behavior on those platforms is unchanged.
+On macOS and Linux the scancode backend is ``None``.
+
+On Linux/X11 the shim can also use a native XTest backend
+(``set_native(True)``): keysym-to-keycode lookups are cached and events go
+straight to the X server with ``XTestFakeKeyEvent``, flushed once per call,
+so a shifted character is a single ordered batch (shift down, key down,
+key up, shift up) and the worker can drop pyautogui's global ``PAUSE``
+cushion. Characters the layout can't produce (CJK, math, emoji) are bound
+to spare keycodes for the run and typed per key like any other; the
+worker calls ``release_unicode_bindings`` at the end of the run to restore
+the keyboard mapping. Without an X display, or on other OSes, every call
+falls through to plain pyautogui.
+
+``type_batch`` is the burst-mode entry point: it injects a whole word or
+line per backend submission instead of one call per character.
 """
 
 from __future__ import annotations
@@ -28,10 +41,20 @@ from nexustyper.services.logging_setup import _log_caught
 
 import platform
 import time
+from collections import OrderedDict
 from typing import Optional
 
 import pyautogui
 
+from nexustyper.typing.keymap import (
+    MOD_ALTGR,
+    MOD_SHIFT,
+    KeymapService,
+    WinKeymapProvider,
+    XkbKeymapProvider,
+)
+from nexustyper.typing.plan import SHIFTED_US_SYMBOLS
+
 
 # Window-title substrings (lowercase) used by the "Auto" mode to detect that
 # the focused window belongs to a remote-desktop client. The list is
@@ -187,6 +210,22 @@ if platform.system() == "Windows":
         raising and crashing the worker mid-type).
         """
 
+        # Layout keymap from ``KeyboardShim.load_keymap``; None = VkKeyScanW.
+        _keymap = None
+
+        def set_keymap(self, keymap) -> None:
+            self._keymap = keymap
+
+        def _stroke(self, ch: str):
+            if self._keymap is not None:
+                return self._keymap.stroke(ch)
+            res = _user32.VkKeyScanW(ctypes.c_wchar(ch))
+            if res == -1:
+                return None
+            if (res >> 8) & 0x06:
+                return res & 0xFF, MOD_ALTGR
+            return res & 0xFF, MOD_SHIFT if (res >> 8) & 0x01 else 0
+
         def _vk(self, name) -> Optional[int]:
             if name is None:
                 return None
@@ -229,35 +268,43 @@ if platform.system() == "Windows":
                 return
             _send_inputs([_vk_input(vk, key_up=True)])
 
+        def _char_inputs(self, ch: str) -> list:
+            if ch in ("\n", "\r"):
+                vk, shift = 0x0D, False
+            elif ch == "\t":
+                vk, shift = 0x09, False
+            elif ch == "\b":
+                vk, shift = 0x08, False
+            else:
+                stroke = self._stroke(ch)
+                # None: not on this layout. AltGr (Ctrl+Alt) chars: avoid
+                # those modifiers (could fire app shortcuts). Inject both as
+                # Unicode.
+                if stroke is None or stroke[1] & MOD_ALTGR:
+                    return [_unicode_input(ch), _unicode_input(ch, key_up=True)]
+                vk, shift = stroke[0], bool(stroke[1] & MOD_SHIFT)
+            inputs = []
+            if shift:
+                inputs.append(_vk_input(0xA0))
+            inputs.append(_vk_input(vk))
+            inputs.append(_vk_input(vk, key_up=True))
+            if shift:
+                inputs.append(_vk_input(0xA0, key_up=True))
+            return inputs
+
         def typewrite(self, text, interval: float = 0.0) -> None:
             for ch in str(text):
-                if ch in ("\n", "\r"):
-                    self._press_vk(0x0D)
-                elif ch == "\t":
-                    self._press_vk(0x09)
-                elif ch == "\b":
-                    self._press_vk(0x08)
-                else:
-                    res = _user32.VkKeyScanW(ctypes.c_wchar(ch))
-                    if res == -1:
-                        _send_inputs(
-                            [_unicode_input(ch), _unicode_input(ch, key_up=True)]
-                        )
-                    else:
-                        vk = res & 0xFF
-                        state = (res >> 8) & 0xFF
-                        if state & 0x06:
-                            # Char on this layout requires Ctrl or Alt — avoid
-                            # those modifiers (could fire app shortcuts) and
-                            # inject as Unicode instead.
-                            _send_inputs(
-                                [_unicode_input(ch), _unicode_input(ch, key_up=True)]
-                            )
-                        else:
-                            self._press_vk(vk, shift=bool(state & 0x01))
+                _send_inputs(self._char_inputs(ch))
                 if interval > 0:
                     time.sleep(interval)
 
+        def type_batch(self, text) -> None:
+            """Type ``text`` with a single ``SendInput`` call."""
+            inputs = []
+            for ch in str(text):
+                inputs.extend(self._char_inputs(ch))
+            _send_inputs(inputs)
+
         def hotkey(self, *keys) -> None:
             vks = [self._vk(k) for k in keys]
             if any(v is None for v in vks):
@@ -266,15 +313,376 @@ if platform.system() == "Windows":
             inputs += [_vk_input(v, key_up=True) for v in reversed(vks)]
             _send_inputs(inputs)
 
+        def repeat_hotkey(self, keys, count: int) -> None:
+            """Press ``keys`` ``count`` times with a single ``SendInput`` call."""
+            vks = [self._vk(k) for k in keys]
+            if any(v is None for v in vks):
+                return
+            mods, key = vks[:-1], vks[-1]
+            inputs = [_vk_input(v) for v in mods]
+            inputs += [_vk_input(key), _vk_input(key, key_up=True)] * count
+            inputs += [_vk_input(v, key_up=True) for v in reversed(mods)]
+            _send_inputs(inputs)
+
 else:
     _WinScancodeBackend = None  # type: ignore[assignment]
 
 
+if platform.system() == "Linux":
+    # X keysyms for the key names the typing engine uses (see keysymdef.h).
+    _KEYSYM_NAME_MAP = {
+        "esc": 0xFF1B, "escape": 0xFF1B,
+        "tab": 0xFF09,
+        "enter": 0xFF0D, "return": 0xFF0D,
+        "backspace": 0xFF08, "back": 0xFF08,
+        "space": 0x0020,
+        "shift": 0xFFE1, "shiftleft": 0xFFE1, "shiftright": 0xFFE2,
+        "ctrl": 0xFFE3, "ctrlleft": 0xFFE3, "ctrlright": 0xFFE4, "control": 0xFFE3,
+        "alt": 0xFFE9, "altleft": 0xFFE9, "altright": 0xFFEA, "option": 0xFFE9,
+        "win": 0xFFEB, "winleft": 0xFFEB, "winright": 0xFFEC,
+        "command": 0xFFEB, "cmd": 0xFFEB, "super": 0xFFEB,
+        "capslock": 0xFFE5,
+        "up": 0xFF52, "down": 0xFF54, "left": 0xFF51, "right": 0xFF53,
+        "home": 0xFF50, "end": 0xFF57,
+        "pageup": 0xFF55, "pagedown": 0xFF56, "pgup": 0xFF55, "pgdn": 0xFF56,
+        "delete": 0xFFFF, "del": 0xFFFF, "insert": 0xFF63, "ins": 0xFF63,
+        "f1": 0xFFBE, "f2": 0xFFBF, "f3": 0xFFC0, "f4": 0xFFC1, "f5": 0xFFC2, "f6": 0xFFC3,
+        "f7": 0xFFC4, "f8": 0xFFC5, "f9": 0xFFC6, "f10": 0xFFC7, "f11": 0xFFC8, "f12": 0xFFC9,
+    }
+    _CHAR_KEYSYMS = {"\n": 0xFF0D, "\r": 0xFF0D, "\t": 0xFF09, "\b": 0xFF08}
+    _XK_SHIFT_L = 0xFFE1
+    # Seconds a spare keycode rests before it is rebound to another
+    # character. Clients translate a key press with the mapping they fetch
+    # on MappingNotify, so a press still in flight must not see the rebind.
+    UNICODE_REBIND_SETTLE = 0.05
+
+    def _char_keysym(ch: str) -> int:
+        special = _CHAR_KEYSYMS.get(ch)
+        if special is not None:
+            return special
+        cp = ord(ch)
+        # Latin-1 keysyms equal their code points; everything else uses the
+        # 0x01000000 Unicode keysym range.
+        if 0x20 <= cp <= 0x7E or 0xA0 <= cp <= 0xFF:
+            return cp
+        return 0x01000000 | cp
+
+    class _UnicodeBinder:
+        """Binds characters the layout can't type to spare keycodes.
+
+        Spare keycodes are the ones with no keysyms in the core mapping.
+        Bindings are kept in LRU order, so a repeated character reuses its
+        keycode and only a new character costs a ``ChangeKeyboardMapping``;
+        when every spare keycode is taken the least recently used one is
+        rebound. :meth:`release` restores the original mapping.
+        """
+
+        def __init__(self, conn) -> None:
+            self._conn = conn
+            self._spares = None  # None = not scanned yet
+            self._blank = (0,)
+            self._bound = OrderedDict()  # char -> keycode
+            self._used_at = {}  # keycode -> time.monotonic() of last use
+
+        def _spare_keycodes(self) -> list:
+            if self._spares is None:
+                lo, hi = self._conn.keycode_range()
+                mapping = self._conn.keyboard_mapping(lo, hi - lo + 1)
+                self._spares = [lo + i for i, syms in enumerate(mapping) if not any(syms)]
+                # NoSymbol in every group/level: what a spare keycode had.
+                self._blank = (0,) * len(mapping[0]) if mapping else (0,)
+            return self._spares
+
+        def would_evict(self, ch: str) -> bool:
+            """Whether binding ``ch`` rebinds a keycode already in use."""
+            spares = self._spare_keycodes()
+            return ch not in self._bound and bool(spares) and len(self._bound) >= len(spares)
+
+        def keycode(self, ch: str) -> Optional[int]:
+            """A keycode that types ``ch``; None without spare keycodes."""
+            kc = self._bound.get(ch)
+            if kc is None:
+                spares = self._spare_keycodes()
+                if not spares:
+                    return None
+                if len(self._bound) < len(spares):
+                    kc = spares[len(self._bound)]
+                else:
+                    _, kc = self._bound.popitem(last=False)
+                    wait = self._used_at[kc] + UNICODE_REBIND_SETTLE - time.monotonic()
+                    if wait > 0:
+                        time.sleep(wait)
+                keysym = _char_keysym(ch)
+                # Both levels, so a held shift doesn't matter.
+                self._conn.change_keyboard_mapping(kc, (keysym, keysym))
+                self._bound[ch] = kc
+            else:
+                self._bound.move_to_end(ch)
+            self._used_at[kc] = time.monotonic()
+            return kc
+
+        def release(self) -> None:
+            """Unbind every spare keycode once its last press has settled."""
+            if not self._bound:
+                return
+            last = max(self._used_at[kc] for kc in self._bound.values())
+            wait = last + UNICODE_REBIND_SETTLE - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            for kc in self._bound.values():
+                self._conn.change_keyboard_mapping(kc, self._blank)
+            self._conn.sync()
+            self._bound.clear()
+            self._used_at.clear()
+
+    class _XTestBackend:
+        """XTest keyboard backend for Linux/X11.
+
+        Mirrors the pyautogui subset the typing engine uses. Owns a private
+        display connection (opened on first use; the worker thread is the
+        only caller) and a keysym -> ``(keycode, needs_shift)`` cache that is
+        cleared at the start of every run so layout switches are picked up.
+        Characters are typed from the layout keymap (Shift and AltGr levels)
+        when one is loaded; other non-ASCII characters are bound to spare
+        keycodes (:class:`_UnicodeBinder`). Keys that still can't be
+        produced fall back to pyautogui.
+        """
+
+        def __init__(self) -> None:
+            self._conn = None  # None = not tried, False = unavailable
+            self._keycodes = {}
+            self._keymap = None
+            self._provider = None
+            self._binder = None
+
+        def keymap_provider(self):
+            """The XKB keymap provider over this backend's connection."""
+            if self._provider is None and self.available():
+                self._provider = XkbKeymapProvider(self._conn)
+            return self._provider
+
+        def set_keymap(self, keymap) -> None:
+            self._keymap = keymap
+
+        def available(self) -> bool:
+            if self._conn is None:
+                try:
+                    from nexustyper.platform import _x11
+                    conn = _x11.open_connection()
+                    if conn is not None and not conn.xtest_available():
+                        conn.close()
+                        conn = None
+                    self._conn = conn or False
+                except Exception:
+                    _log_caught('_XTestBackend.available')
+                    self._conn = False
+            return bool(self._conn)
+
+        def reset_cache(self) -> None:
+            self.release_bindings()
+            self._keycodes.clear()
+
+        def release_bindings(self) -> None:
+            """Restore the keycodes bound to Unicode characters."""
+            if self._binder is None:
+                return
+            try:
+                self._binder.release()
+            except Exception:
+                _log_caught('_XTestBackend.release_bindings')
+
+        def _lookup(self, keysym: int):
+            try:
+                return self._keycodes[keysym]
+            except KeyError:
+                pass
+            try:
+                res = self._conn.keycode_for(keysym)
+            except Exception:
+                _log_caught('_XTestBackend._lookup')
+                res = None
+            self._keycodes[keysym] = res
+            return res
+
+        def _name_keysym(self, name) -> Optional[int]:
+            if name is None:
+                return None
+            n = str(name)
+            ks = _KEYSYM_NAME_MAP.get(n.lower())
+            if ks is not None:
+                return ks
+            if len(n) == 1:
+                return _char_keysym(n)
+            return None
+
+        def _tap_events(self, keycode: int, shift: bool, out: list) -> None:
+            shift_kc = self._lookup(_XK_SHIFT_L) if shift else None
+            if shift_kc:
+                out.append((shift_kc[0], True))
+            out.append((keycode, True))
+            out.append((keycode, False))
+            if shift_kc:
+                out.append((shift_kc[0], False))
+
+        def _char_events(self, ch: str, out: list) -> bool:
+            """Append the events that type ``ch``; False when the layout
+            can't produce it."""
+            keymap = self._keymap
+            if keymap is not None and ch not in _CHAR_KEYSYMS:
+                stroke = keymap.stroke(ch)
+                if stroke is not None:
+                    keycode, mods = stroke
+                    held = [keymap.modifiers[m] for m in (MOD_SHIFT, MOD_ALTGR) if mods & m]
+                    out.extend((kc, True) for kc in held)
+                    out.append((keycode, True))
+                    out.append((keycode, False))
+                    out.extend((kc, False) for kc in reversed(held))
+                    return True
+            res = self._lookup(_char_keysym(ch))
+            if res is None:
+                return self._unicode_events(ch, out)
+            self._tap_events(res[0], res[1], out)
+            return True
+
+        def _unicode_events(self, ch: str, out: list) -> bool:
+            if len(ch) != 1 or ord(ch) <= 0x7F:
+                return False
+            if self._binder is None:
+                self._binder = _UnicodeBinder(self._conn)
+            try:
+                if out and self._binder.would_evict(ch):
+                    # The keycode may be in the pending batch: send it first
+                    # so the rebind settle is measured from the real press.
+                    self._send(out)
+                    del out[:]
+                keycode = self._binder.keycode(ch)
+            except Exception:
+                _log_caught('_XTestBackend._unicode_events')
+                return False
+            if keycode is None:
+                return False
+            out.append((keycode, True))
+            out.append((keycode, False))
+            return True
+
+        def _send(self, events) -> None:
+            conn = self._conn
+            for keycode, down in events:
+                conn.fake_key(keycode, down)
+            conn.flush()
+
+        def press(self, key) -> None:
+            ks = self._name_keysym(key)
+            res = self._lookup(ks) if ks is not None else None
+            if res is None:
+                if isinstance(key, str) and len(key) == 1:
+                    self.typewrite(key)
+                else:
+                    pyautogui.press(key)
+                return
+            events = []
+            self._tap_events(res[0], res[1], events)
+            self._send(events)
+
+        def keyDown(self, key) -> None:
+            ks = self._name_keysym(key)
+            res = self._lookup(ks) if ks is not None else None
+            if res is None:
+                pyautogui.keyDown(key)
+                return
+            self._send([(res[0], True)])
+
+        def keyUp(self, key) -> None:
+            ks = self._name_keysym(key)
+            res = self._lookup(ks) if ks is not None else None
+            if res is None:
+                pyautogui.keyUp(key)
+                return
+            self._send([(res[0], False)])
+
+        def typewrite(self, text, interval: float = 0.0) -> None:
+            events = []
+            for ch in str(text):
+                if not self._char_events(ch, events):
+                    # Not on this layout: flush what we have so ordering
+                    # holds, then let pyautogui try.
+                    if events:
+                        self._send(events)
+                        events = []
+                    pyautogui.typewrite(ch)
+                if interval > 0:
+                    if events:
+                        self._send(events)
+                        events = []
+                    time.sleep(interval)
+            if events:
+                self._send(events)
+
+        def type_batch(self, text) -> None:
+            # typewrite already sends the whole string as one flushed batch.
+            self.typewrite(text)
+
+        def hotkey(self, *keys) -> None:
+            resolved = []
+            for k in keys:
+                ks = self._name_keysym(k)
+                res = self._lookup(ks) if ks is not None else None
+                if res is None:
+                    pyautogui.hotkey(*keys)
+                    return
+                resolved.append(res[0])
+            events = [(kc, True) for kc in resolved]
+            events += [(kc, False) for kc in reversed(resolved)]
+            self._send(events)
+
+        def repeat_hotkey(self, keys, count: int) -> None:
+            resolved = []
+            for k in keys:
+                ks = self._name_keysym(k)
+                res = self._lookup(ks) if ks is not None else None
+                if res is None:
+                    for _ in range(count):
+                        pyautogui.hotkey(*keys)
+                    return
+                resolved.append(res[0])
+            mods, key = resolved[:-1], resolved[-1]
+            events = [(kc, True) for kc in mods]
+            events += [(key, True), (key, False)] * count
+            events += [(kc, False) for kc in reversed(mods)]
+            self._send(events)
+
+else:
+    _XTestBackend = None  # type: ignore[assignment]
+
+
+def _shift_runs(text: str, keymap=None):
+    """Split ``text`` into ``(shifted, run)`` pieces for a US layout.
+
+    With a ``keymap``, characters that aren't Shift + their US base key on
+    the active layout go in unshifted runs (pyautogui types them itself).
+    """
+    runs = []
+    start = 0
+    shifted = None
+    for i, ch in enumerate(text):
+        s = ch in SHIFTED_US_SYMBOLS or (ch.isascii() and ch.isupper())
+        if s and keymap is not None:
+            s = keymap.us_shift_ok(ch, SHIFTED_US_SYMBOLS.get(ch) or ch.lower())
+        if s != shifted:
+            if i > start:
+                runs.append((shifted, text[start:i]))
+            start, shifted = i, s
+    if text[start:]:
+        runs.append((shifted, text[start:]))
+    return runs
+
+
 class KeyboardShim:
     """Routes keyboard events to either pyautogui or the Windows scancode
     backend based on the user's Remote Desktop compatibility mode. On
-    non-Windows platforms the scancode backend is None and every call
-    transparently delegates to pyautogui."""
+    Linux, ``set_native(True)`` routes everything through the XTest backend
+    when an X display is reachable. Otherwise every call transparently
+    delegates to pyautogui."""
 
     MODE_OFF = "off"
     MODE_AUTO = "auto"
@@ -283,10 +691,64 @@ class KeyboardShim:
     def __init__(self) -> None:
         self.mode = self.MODE_AUTO
         self._sc = _WinScancodeBackend() if _WinScancodeBackend else None
+        self._xt = _XTestBackend() if _XTestBackend else None
+        self._native = False
+        self._keymaps = KeymapService(WinKeymapProvider() if WinKeymapProvider else None)
+        self.keymap = None
 
     def set_mode(self, mode: str) -> None:
         self.mode = mode if mode in (self.MODE_OFF, self.MODE_AUTO, self.MODE_ON) else self.MODE_OFF
 
+    def set_native(self, enabled: bool) -> None:
+        """Use the native XTest backend on Linux when available.
+
+        Called by the worker at run start; refreshes the keycode cache so a
+        keyboard-layout change since the last run is picked up.
+        """
+        self._native = bool(enabled) and self._xt is not None and self._xt.available()
+        if self._native:
+            self._xt.reset_cache()
+
+    def native_available(self) -> bool:
+        """True when an X display with the XTest extension is reachable."""
+        return self._xt is not None and self._xt.available()
+
+    def native_active(self) -> bool:
+        """True when keys go through the native XTest backend."""
+        return self._native
+
+    def load_keymap(self, chars: str = ""):
+        """Load the active keyboard layout's keymap for this run.
+
+        Called by the worker once the target window is focused (the Windows
+        table follows the foreground window's layout). Tables are cached per
+        layout id, so only a layout switch rebuilds one. ``chars`` (a plain
+        string: the run's text or a stream's buffered head) is resolved up
+        front. Returns the keymap, or None when no layout source is
+        available (pyautogui on Linux/macOS), in which case the US shift
+        assumptions stay in place.
+        """
+        if self._native:
+            self._keymaps.set_provider(self._xt.keymap_provider())
+        elif self._xt is not None:
+            self._keymaps.set_provider(None)
+        keymap = self._keymaps.current()
+        if keymap is not None and isinstance(chars, str) and chars:
+            keymap.prime(chars)
+        self.keymap = keymap
+        for backend in (self._sc, self._xt):
+            if backend is not None:
+                backend.set_keymap(keymap)
+        return keymap
+
+    def release_unicode_bindings(self) -> None:
+        """Restore keycodes the XTest backend bound to Unicode characters.
+
+        Called by the worker when a run ends; a no-op elsewhere.
+        """
+        if self._xt is not None:
+            self._xt.release_bindings()
+
     def scancode_available(self) -> bool:
         return self._sc is not None
 
@@ -299,6 +761,8 @@ class KeyboardShim:
         return any(h in title for h in _RDP_TITLE_HINTS)
 
     def _backend(self):
+        if self._native:
+            return self._xt
         if self._sc is None:
             return pyautogui
         if self.mode == self.MODE_ON:
@@ -308,7 +772,10 @@ class KeyboardShim:
         return pyautogui
 
     def active_backend_name(self) -> str:
-        return "scancode" if self._backend() is self._sc else "pyautogui"
+        backend = self._backend()
+        if backend is self._xt and self._xt is not None:
+            return "xtest"
+        return "scancode" if backend is self._sc and self._sc is not None else "pyautogui"
 
     def press(self, key):
         return self._backend().press(key)
@@ -325,6 +792,55 @@ class KeyboardShim:
     def hotkey(self, *keys):
         return self._backend().hotkey(*keys)
 
+    def repeat_hotkey(self, keys, count: int):
+        """Press the ``keys`` combination ``count`` times in one batch.
+
+        The modifiers are held once around all the presses. The scancode and
+        XTest backends submit the whole sequence in one call; with pyautogui
+        it is one ``press(..., presses=count)`` under the held modifiers.
+        """
+        keys = tuple(keys)
+        if count <= 0 or not keys:
+            return None
+        backend = self._backend()
+        batch = getattr(backend, "repeat_hotkey", None)
+        if batch is not None:
+            return batch(keys, count)
+        mods, key = keys[:-1], keys[-1]
+        held = []
+        try:
+            for mod in mods:
+                pyautogui.keyDown(mod)
+                held.append(mod)
+            pyautogui.press(key, presses=count, interval=0.0)
+        finally:
+            for mod in reversed(held):
+                pyautogui.keyUp(mod)
+        return None
+
+    def type_batch(self, text):
+        """Inject a whole word or line with as few backend calls as possible.
+
+        The scancode and XTest backends submit ``text`` as one batch. With
+        pyautogui, each run of unshifted characters is one ``typewrite`` and
+        each run of shifted ones is typed under a single explicit shift hold
+        (pyautogui's implicit per-character shift is what races on macOS).
+        """
+        backend = self._backend()
+        batch = getattr(backend, "type_batch", None)
+        if batch is not None:
+            return batch(text)
+        for shifted, run in _shift_runs(str(text), self.keymap):
+            if not shifted:
+                pyautogui.typewrite(run, interval=0.0)
+                continue
+            pyautogui.keyDown('shift')
+            try:
+                for ch in run:
+                    pyautogui.press(SHIFTED_US_SYMBOLS.get(ch) or ch.lower())
+            finally:
+                pyautogui.keyUp('shift')
+
 
 # Module-level singleton. The typing worker calls ``set_mode`` on this at the
 # start of each run; one worker is active at a time so there's no race.
@@ -0,0 +1,285 @@
+"""Layout-aware keymap tables for the keyboard backends.
+
+:class:`KeymapService` builds a character -> ``(keycode, modifiers)``
+table for the active keyboard layout (XKB on X11, ``VkKeyScanExW`` on
+Windows) and caches it per layout. :meth:`Keymap.us_shift_ok` tells the
+worker where "Shift + US base key" is wrong for this layout.
+"""
+
+from __future__ import annotations
+from nexustyper.services.logging_setup import _log_caught
+
+import ctypes
+import ctypes.util
+import platform
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+MOD_SHIFT = 1
+MOD_ALTGR = 2
+
+# (keycode, MOD_* bits); the keycode is an X keycode or a Windows VK.
+KeyStroke = Tuple[int, int]
+
+# XKB shift levels in enumeration order: the lowest-modifier stroke wins.
+_XKB_LEVEL_MODS = (0, MOD_SHIFT, MOD_ALTGR, MOD_ALTGR | MOD_SHIFT)
+
+_XK_SHIFT_L = 0xFFE1
+_XK_ISO_LEVEL3_SHIFT = 0xFE03
+_XK_MODE_SWITCH = 0xFF7E
+
+# Legacy (pre-Unicode) keysyms that common European layouts still use.
+_LEGACY_KEYSYMS = {
+    0x13BC: 'Œ', 0x13BD: 'œ', 0x13BE: 'Ÿ',   # OE, oe, Ydiaeresis
+    0x20AC: '€',                                        # EuroSign
+    0x0AAA: '—', 0x0AA9: '–',                      # emdash, endash
+    0x0AD0: '‘', 0x0AD1: '’', 0x0AD2: '“', 0x0AD3: '”',
+    0x0AFD: '‚', 0x0AFE: '„',                      # low quotes
+    0x0AAE: '…',                                        # ellipsis
+    0x08FB: '←', 0x08FC: '↑', 0x08FD: '→', 0x08FE: '↓',
+    0x01A1: 'Ą', 0x01A3: 'Ł', 0x01A5: 'Ľ', 0x01A6: 'Ś',
+    0x01A9: 'Š', 0x01AA: 'Ş', 0x01AB: 'Ť', 0x01AC: 'Ź',
+    0x01AE: 'Ž', 0x01AF: 'Ż', 0x01B1: 'ą', 0x01B3: 'ł',
+    0x01B5: 'ľ', 0x01B6: 'ś', 0x01B9: 'š', 0x01BA: 'ş',
+    0x01BB: 'ť', 0x01BC: 'ź', 0x01BE: 'ž', 0x01BF: 'ż',
+    0x01C6: 'Ć', 0x01C8: 'Č', 0x01CA: 'Ę', 0x01CC: 'Ě',
+    0x01CF: 'Ď', 0x01D1: 'Ń', 0x01D2: 'Ň', 0x01D5: 'Ő',
+    0x01D8: 'Ř', 0x01D9: 'Ů', 0x01DB: 'Ű', 0x01E6: 'ć',
+    0x01E8: 'č', 0x01EA: 'ę', 0x01EC: 'ě', 0x01EF: 'ď',
+    0x01F1: 'ń', 0x01F2: 'ň', 0x01F5: 'ő', 0x01F8: 'ř',
+    0x01F9: 'ů', 0x01FB: 'ű',
+}
+
+_xkbcommon = None
+
+
+def _keysym_to_utf32_lib():
+    """libxkbcommon's ``xkb_keysym_to_utf32``, or None when not installed."""
+    global _xkbcommon
+    if _xkbcommon is None:
+        try:
+            path = ctypes.util.find_library("xkbcommon")
+            lib = ctypes.CDLL(path) if path else None
+            if lib is not None:
+                lib.xkb_keysym_to_utf32.argtypes = [ctypes.c_uint32]
+                lib.xkb_keysym_to_utf32.restype = ctypes.c_uint32
+            _xkbcommon = lib or False
+        except Exception:
+            _log_caught('_keysym_to_utf32_lib')
+            _xkbcommon = False
+    return _xkbcommon or None
+
+
+def keysym_to_char(keysym: int) -> Optional[str]:
+    """The printable character a keysym types, or None (function keys,
+    keypad, dead keys, control characters)."""
+    if 0x20 <= keysym <= 0x7E or 0xA0 <= keysym <= 0xFF:
+        return chr(keysym)
+    if keysym & 0xFF000000 == 0x01000000:
+        cp = keysym & 0x00FFFFFF
+        return chr(cp) if cp >= 0x20 and cp != 0x7F and cp <= 0x10FFFF else None
+    if 0xFE00 <= keysym <= 0xFFFF:
+        # Modifiers, dead keys, keypad and function keys.
+        return None
+    if keysym in _LEGACY_KEYSYMS:
+        return _LEGACY_KEYSYMS[keysym]
+    lib = _keysym_to_utf32_lib()
+    if lib is not None:
+        try:
+            cp = lib.xkb_keysym_to_utf32(keysym)
+        except Exception:
+            _log_caught('keysym_to_char')
+            return None
+        if cp >= 0x20 and cp != 0x7F:
+            return chr(cp)
+    return None
+
+
+class Keymap:
+    """Character -> :data:`KeyStroke` table for one keyboard layout.
+
+    ``modifiers`` maps ``MOD_SHIFT``/``MOD_ALTGR`` to the key that produces
+    them. Characters missing from the table are resolved once through
+    ``resolve`` (when given) and cached, misses included.
+    """
+
+    __slots__ = ('layout_id', 'modifiers', '_strokes', '_resolve', '_shift_ok')
+
+    def __init__(
+        self,
+        layout_id: str,
+        strokes: Dict[str, Optional[KeyStroke]],
+        modifiers: Dict[int, int],
+        resolve: Optional[Callable[[str], Optional[KeyStroke]]] = None,
+    ) -> None:
+        self.layout_id = layout_id
+        self.modifiers = modifiers
+        self._strokes = strokes
+        self._resolve = resolve
+        self._shift_ok: Dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        return sum(1 for s in self._strokes.values() if s is not None)
+
+    def stroke(self, ch: str) -> Optional[KeyStroke]:
+        """How to type ``ch`` on this layout; None when it has no key."""
+        try:
+            return self._strokes[ch]
+        except KeyError:
+            pass
+        res = None
+        if self._resolve is not None:
+            try:
+                res = self._resolve(ch)
+            except Exception:
+                _log_caught('Keymap.stroke')
+        self._strokes[ch] = res
+        return res
+
+    def prime(self, chars: Iterable[str]) -> None:
+        """Resolve ``chars`` up front so typing them is a dict lookup."""
+        for ch in set(chars):
+            self.stroke(ch)
+
+    def us_shift_ok(self, ch: str, base: str) -> bool:
+        """Whether ``ch`` is Shift + ``base``'s key on this layout, as the
+        plan assumes for ``SHIFTED_US_SYMBOLS`` and uppercase letters."""
+        try:
+            return self._shift_ok[ch]
+        except KeyError:
+            pass
+        s = self.stroke(ch)
+        b = self.stroke(base)
+        ok = s is not None and b is not None and b[1] == 0 and s == (b[0], MOD_SHIFT)
+        self._shift_ok[ch] = ok
+        return ok
+
+
+class XkbKeymapProvider:
+    """Keymaps from the X server's XKB state (current group)."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def layout_id(self) -> str:
+        conn = self._conn
+        return f"xkb:{conn.layout_names()}:{conn.keyboard_group()}"
+
+    def build(self, layout_id: str) -> Keymap:
+        conn = self._conn
+        group = conn.keyboard_group()
+        lo, hi = conn.keycode_range()
+        strokes: Dict[str, Optional[KeyStroke]] = {}
+        for level, mods in enumerate(_XKB_LEVEL_MODS):
+            for keycode in range(max(lo, 8), hi + 1):
+                ch = keysym_to_char(conn.keysym_at(keycode, group, level))
+                if ch is not None and ch not in strokes:
+                    strokes[ch] = (keycode, mods)
+        modifiers = {}
+        shift = conn.keycode_of(_XK_SHIFT_L)
+        if shift:
+            modifiers[MOD_SHIFT] = shift
+        altgr = conn.keycode_of(_XK_ISO_LEVEL3_SHIFT) or conn.keycode_of(_XK_MODE_SWITCH)
+        if altgr:
+            modifiers[MOD_ALTGR] = altgr
+        if MOD_ALTGR not in modifiers:
+            strokes = {ch: s for ch, s in strokes.items() if not s[1] & MOD_ALTGR}
+        if MOD_SHIFT not in modifiers:
+            strokes = {ch: s for ch, s in strokes.items() if not s[1] & MOD_SHIFT}
+        return Keymap(layout_id, strokes, modifiers)
+
+
+if platform.system() == "Windows":
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.VkKeyScanExW.argtypes = [wintypes.WCHAR, ctypes.c_void_p]
+    _user32.VkKeyScanExW.restype = ctypes.c_short
+    _user32.GetKeyboardLayout.argtypes = [wintypes.DWORD]
+    _user32.GetKeyboardLayout.restype = ctypes.c_void_p
+    _user32.GetForegroundWindow.restype = wintypes.HWND
+    _user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+    _user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+
+    class WinKeymapProvider:
+        """Keymaps from ``VkKeyScanExW`` against the foreground window's
+        keyboard layout (HKL). Strokes carry virtual-key codes; AltGr
+        (Ctrl+Alt) characters are marked ``MOD_ALTGR`` and Ctrl- or
+        Alt-only ones are left out."""
+
+        def _hkl(self) -> int:
+            thread = _user32.GetWindowThreadProcessId(_user32.GetForegroundWindow(), None)
+            return _user32.GetKeyboardLayout(thread) or 0
+
+        def layout_id(self) -> str:
+            return f"hkl:{self._hkl():x}"
+
+        def build(self, layout_id: str) -> Keymap:
+            hkl = ctypes.c_void_p(self._hkl())
+
+            def resolve(ch: str) -> Optional[KeyStroke]:
+                if len(ch) != 1 or ord(ch) > 0xFFFF:
+                    return None
+                res = _user32.VkKeyScanExW(ch, hkl)
+                if res == -1:
+                    return None
+                state = (res >> 8) & 0x07
+                if state & 0x06 == 0x06:
+                    mods = MOD_ALTGR | (MOD_SHIFT if state & 0x01 else 0)
+                elif state & 0x06:
+                    return None
+                else:
+                    mods = MOD_SHIFT if state & 0x01 else 0
+                return res & 0xFF, mods
+
+            keymap = Keymap(layout_id, {}, {MOD_SHIFT: 0xA0}, resolve)
+            keymap.prime(chr(cp) for cp in range(0x20, 0x7F))
+            keymap.prime(chr(cp) for cp in range(0xA0, 0x100))
+            return keymap
+
+else:
+    WinKeymapProvider = None  # type: ignore[assignment,misc]
+
+
+class KeymapService:
+    """Per-layout :class:`Keymap` cache over one provider.
+
+    :meth:`current` asks the provider for the active layout id and builds
+    the table only the first time that layout is seen.
+    """
+
+    def __init__(self, provider=None) -> None:
+        self._provider = provider
+        self._cache: Dict[str, Keymap] = {}
+
+    def set_provider(self, provider) -> None:
+        if provider is not self._provider:
+            self._provider = provider
+            self._cache.clear()
+
+    def current(self) -> Optional[Keymap]:
+        """The active layout's keymap, or None without a provider."""
+        provider = self._provider
+        if provider is None:
+            return None
+        try:
+            layout_id = provider.layout_id()
+            keymap = self._cache.get(layout_id)
+            if keymap is None:
+                keymap = provider.build(layout_id)
+                self._cache[layout_id] = keymap
+            return keymap
+        except Exception:
+            _log_caught('KeymapService.current')
+            return None
+
+
+__all__ = [
+    "MOD_SHIFT",
+    "MOD_ALTGR",
+    "Keymap",
+    "KeymapService",
+    "WinKeymapProvider",
+    "XkbKeymapProvider",
+    "keysym_to_char",
+]
@@ -2,6 +2,13 @@
 
 Inline macros are parsed from text segments and look like ``{{PAUSE:1.5}}``,
 ``{{PRESS:enter}}``, ``{{CLICK:120,240}}``, or ``{{COMMENT:notes}}``.
+Directives shape the text itself: ``{{REPEAT:n}}`` … ``{{END}}`` types a
+block ``n`` times and ``{{INCLUDE:path}}`` types a file in place; both are
+replayed lazily, so the expansion never exists as one string. Span markers
+change how the text after them goes out: ``{{PASTE}}`` … ``{{/PASTE}}``
+pastes the enclosed text instead of typing it, and ``{{SPEED:min,max}}``
+switches the WPM range until the next ``{{SPEED}}`` (bare: back to the
+run's own range).
 
 This module exposes:
 
@@ -11,7 +18,13 @@ This module exposes:
 - ``validate_macro``: check a (command, params) pair and normalize it.
 - ``execute_macro``: execute a normalized (command, params) tuple. Takes a
   ``sleep_fn(seconds)`` callback so the worker can keep its
-  pause/stop-aware sleep semantics.
+  pause/stop-aware sleep semantics, and a ``speed_fn`` for SPEED.
+- ``compile_macros``: tokenize text once into a :class:`MacroProgram` —
+  text segments and validated :class:`MacroToken` s with line/column
+  diagnostics. The keystroke plan, the dry run, the stats panel, the
+  duration estimate and the CLICK confirmation all read the same program.
+- ``macro_environment``: the key table and screen size macros are checked
+  against, cached so validation doesn't query the OS per token.
 
 ``validate_macro`` and ``execute_macro`` are pure-ish helpers — they don't
 own worker state. The worker still owns the per-keystroke loop and decides
@@ -19,28 +32,59 @@ when to call them.
 """
 
 from __future__ import annotations
+from nexustyper.constants import MAX_WPM_LIMIT, MIN_WPM_LIMIT
 from nexustyper.services.logging_setup import _log_caught
 
+import os
 import re
-from typing import Callable, Optional, Set, Tuple
+import time
+from typing import Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 
 
+# One macro token. ``NAME:params`` commands match in any case; the bare
+# markers only in upper case, so template text such as ``{{end}}`` stays text.
+_MACRO_TOKEN = r'\{\{(?:(?i:PAUSE|PRESS|CLICK|COMMENT|REPEAT|INCLUDE|SPEED):.*?|END|PASTE|/PASTE|SPEED)\}\}'
+
 # Regex used to split text into [text, macro, text, macro, ...] segments.
-MACRO_SPLIT_RE = re.compile(r'(?i)(\{\{(?:PAUSE|PRESS|CLICK|COMMENT):.*?\}\})')
+MACRO_SPLIT_RE = re.compile('(' + _MACRO_TOKEN + ')')
 
 # Regex used to match a single macro segment exactly.
 MACRO_FULLMATCH_RE = re.compile(r'\{\{([A-Za-z]+):(.*)\}\}')
 
 # Used by strip_macros to remove macros wholesale.
-_MACRO_STRIP_RE = re.compile(r'(?i)\{\{(?:PAUSE|PRESS|CLICK|COMMENT):.*?\}\}')
+_MACRO_STRIP_RE = re.compile(_MACRO_TOKEN)
+
+# Structural macros: shape what gets typed instead of running at a point.
+DIRECTIVES = frozenset({'REPEAT', 'END', 'INCLUDE'})
+# Bounds for REPEAT counts and INCLUDE nesting.
+REPEAT_MAX = 100_000
+INCLUDE_DEPTH_MAX = 8
+# Span markers: switch paste/speed state for the text that follows.
+SPAN_MARKERS = frozenset({'PASTE', '/PASTE', 'SPEED'})
 
 
 def strip_macros(text: str) -> str:
-    """Remove every macro token from ``text``. Safe on falsy/non-str input."""
+    """Remove every macro token from ``text``. Safe on falsy/non-str input.
+
+    An ``{{END}}`` with no open ``{{REPEAT}}`` is text and is kept.
+    """
     if not text:
         return text
+    depth = 0
+
+    def _strip(m) -> str:
+        nonlocal depth
+        token = m.group()
+        if token == '{{END}}':
+            if not depth:
+                return token
+            depth -= 1
+        elif token[2:9].upper() == 'REPEAT:':
+            depth += 1
+        return ''
+
     try:
-        return _MACRO_STRIP_RE.sub('', text)
+        return _MACRO_STRIP_RE.sub(_strip, text)
     except Exception:
         _log_caught('strip_macros@L43')
         return text
@@ -100,22 +144,539 @@ def validate_macro(
         return True, None, (cmd, key)
     elif cmd == 'COMMENT':
         return True, None, (cmd, p)
+    elif cmd == 'REPEAT':
+        try:
+            n = int(p)
+        except Exception:
+            _log_caught('validate_macro@REPEAT')
+            return False, f"Invalid REPEAT count: '{p}'", None
+        if n < 0:
+            return False, "REPEAT count must be non-negative", None
+        return True, None, (cmd, str(min(n, REPEAT_MAX)))
+    elif cmd == 'END':
+        return True, None, (cmd, '')
+    elif cmd == 'INCLUDE':
+        if not p:
+            return False, "INCLUDE requires a file path", None
+        return True, None, (cmd, p)
+    elif cmd in ('PASTE', '/PASTE'):
+        if p:
+            return False, f"{cmd} takes no parameters", None
+        return True, None, (cmd, '')
+    elif cmd == 'SPEED':
+        if not p or p.lower() == 'reset':
+            return True, None, (cmd, '')
+        try:
+            values = [int(v) for v in p.split(',')]
+            lo, hi = values * 2 if len(values) == 1 else values
+        except Exception:
+            _log_caught('validate_macro@SPEED')
+            return False, f"Invalid SPEED range, expected 'min,max' WPM got '{p}'", None
+        lo, hi = min(lo, hi), max(lo, hi)
+        if lo < MIN_WPM_LIMIT or hi > MAX_WPM_LIMIT:
+            return False, f"SPEED must be within {MIN_WPM_LIMIT}-{MAX_WPM_LIMIT} WPM", None
+        return True, None, (cmd, f"{lo},{hi}")
     else:
         return False, f"Unknown macro: '{cmd}'", None
 
 
+def parse_speed(params: str) -> Optional[Tuple[int, int]]:
+    """``(min_wpm, max_wpm)`` from a normalized SPEED param, or None for a
+    reset to the run's own range."""
+    if not params:
+        return None
+    lo, hi = params.split(',')
+    return int(lo), int(hi)
+
+
+class MacroEnvironment:
+    """What macros are validated against: pyautogui's key names and the
+    screen size. Validation results are memoized per ``(command, params)``,
+    so a script with thousands of identical PAUSE/PRESS tokens validates
+    each distinct one once.
+    """
+
+    __slots__ = ("allowed_keys", "screen_size", "_memo")
+
+    # Bounds the memo on scripts with many distinct tokens (e.g. CLICKs).
+    MEMO_MAX = 4096
+
+    def __init__(
+        self,
+        allowed_keys: Optional[FrozenSet[str]] = None,
+        screen_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self.allowed_keys = allowed_keys
+        self.screen_size = screen_size
+        self._memo: Dict[Tuple[str, str], Tuple[bool, Optional[str], Optional[Tuple[str, str]]]] = {}
+
+    def validate(self, command: str, params: str):
+        """``validate_macro`` against this environment, memoized."""
+        key = (command, params)
+        hit = self._memo.get(key)
+        if hit is None:
+            hit = validate_macro(
+                command, params, allowed_keys=self.allowed_keys, screen_size=self.screen_size)
+            if len(self._memo) >= self.MEMO_MAX:
+                self._memo.clear()
+            self._memo[key] = hit
+        return hit
+
+
+# Screen size can change (monitor plugged in, resolution change), so the
+# cached environment is refreshed after this many seconds.
+_ENV_TTL = 5.0
+_env_cache: Optional[Tuple[float, MacroEnvironment]] = None
+_key_table: Optional[FrozenSet[str]] = None
+
+
+def macro_environment() -> MacroEnvironment:
+    """The current :class:`MacroEnvironment`, cached for ``_ENV_TTL`` seconds.
+
+    Falls back to no key/bounds checks when pyautogui (or a display) isn't
+    available.
+    """
+    global _env_cache, _key_table
+    now = time.monotonic()
+    if _env_cache is not None and now - _env_cache[0] < _ENV_TTL:
+        return _env_cache[1]
+    screen_size = None
+    try:
+        import pyautogui  # local import: keeps this module importable in tests
+        if _key_table is None:
+            _key_table = frozenset(getattr(pyautogui, "KEYBOARD_KEYS", ()))
+        w, h = pyautogui.size()
+        screen_size = (int(w), int(h))
+    except Exception:
+        _log_caught('macro_environment')
+    env = MacroEnvironment(_key_table or None, screen_size)
+    _env_cache = (now, env)
+    return env
+
+
+class MacroToken(NamedTuple):
+    """One macro occurrence. ``normalized`` is set when it validated,
+    ``error`` otherwise; ``line``/``col`` are 1-based and ``raw`` is the
+    token's source text."""
+
+    command: str
+    params: str
+    normalized: Optional[Tuple[str, str]]
+    error: Optional[str]
+    line: int
+    col: int
+    raw: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return self.normalized is not None
+
+    def diagnostic(self) -> str:
+        return f"Line {self.line}, col {self.col}: {self.error}"
+
+
+Segment = Union[str, MacroToken]
+
+
+class MacroSpan(NamedTuple):
+    """A run of text and ordinary macros typed ``times`` times per lap;
+    ``paste`` inside a PASTE region, ``speed`` the SPEED override in effect
+    (None: the run's own range)."""
+
+    text: str
+    times: int
+    paste: bool
+    speed: Optional[Tuple[int, int]]
+
+
+class MacroBlock(NamedTuple):
+    """``{{REPEAT:n}}`` … ``{{END}}``: ``body`` runs ``count`` times."""
+
+    token: MacroToken
+    count: int
+    body: list
+
+
+class MacroInclude(NamedTuple):
+    """``{{INCLUDE:path}}``; ``program`` is None when the file couldn't be read."""
+
+    token: MacroToken
+    path: str
+    program: Optional["MacroProgram"]
+
+
+# A directive token standing alone on its line takes the line with it.
+_LINE_TAIL_RE = re.compile(r'\n[ \t]*$')
+_LINE_HEAD_RE = re.compile(r'[ \t]*(?:\r?\n|$)')
+
+
+class MacroProgram:
+    """Text compiled into alternating text segments and macro tokens.
+
+    ``segments`` keeps source order with empty text segments dropped; the
+    keystroke plan consumes it directly. When the text uses ``REPEAT`` /
+    ``INCLUDE`` directives, :meth:`tree` nests the segments into
+    :class:`MacroBlock` / :class:`MacroInclude` nodes (reading included
+    files once), :meth:`iter_text` replays it lazily, and the summaries for
+    the UI are computed from the structure (count × block) instead of from
+    the expanded text.
+    """
+
+    __slots__ = ("segments", "tokens", "open_repeats", "_env", "_base_dir", "_include_stack",
+                 "_tree", "_structure_errors", "_counts")
+
+    def __init__(
+        self,
+        segments: List[Segment],
+        env: Optional[MacroEnvironment] = None,
+        base_dir: Optional[str] = None,
+        include_stack: Tuple[str, ...] = (),
+    ) -> None:
+        self.segments = segments
+        self.tokens = [seg for seg in segments if type(seg) is MacroToken]
+        # REPEATs still open at the end of the text (see compile_macros).
+        self.open_repeats = 0
+        self._env = env
+        self._base_dir = base_dir
+        self._include_stack = include_stack
+        self._tree: Optional[list] = None
+        self._structure_errors: List[str] = []
+        self._counts: Optional[Dict[str, int]] = None
+
+    def has_directives(self) -> bool:
+        return any(t.command in DIRECTIVES for t in self.tokens)
+
+    def has_spans(self) -> bool:
+        return any(t.command in SPAN_MARKERS for t in self.tokens)
+
+    # --- structure ---------------------------------------------------------
+
+    def tree(self) -> list:
+        """Segments nested into blocks; plain segments when no directives."""
+        if self._tree is None:
+            if self.has_directives():
+                self._tree = self._build_tree()
+            else:
+                self._tree = list(self.segments)
+        return self._tree
+
+    def _error(self, token: MacroToken, msg: str) -> None:
+        self._structure_errors.append(f"Line {token.line}, col {token.col}: {msg}")
+
+    def _build_tree(self) -> list:
+        segs = list(self.segments)
+        root: list = []
+        stack: List[Tuple[MacroToken, int, list]] = []
+        out = root
+        at_bol = True
+        for k, seg in enumerate(segs):
+            if type(seg) is str:
+                if seg:
+                    out.append(seg)
+                    if seg.strip(' \t'):
+                        at_bol = bool(_LINE_TAIL_RE.search(seg))
+                continue
+            if seg.command not in DIRECTIVES:
+                out.append(seg)
+                at_bol = False
+                continue
+            # Drop the directive's own line when it stands alone on it.
+            nxt = segs[k + 1] if k + 1 < len(segs) else None
+            if at_bol and (nxt is None or (type(nxt) is str and _LINE_HEAD_RE.match(nxt))):
+                if out and type(out[-1]) is str:
+                    out[-1] = out[-1].rstrip(' \t')
+                    if not out[-1]:
+                        out.pop()
+                if nxt is not None:
+                    segs[k + 1] = nxt[_LINE_HEAD_RE.match(nxt).end():]
+            else:
+                at_bol = False
+            if not seg.ok:
+                self._error(seg, seg.error)
+                continue
+            if seg.command == 'REPEAT':
+                stack.append((seg, int(seg.normalized[1]), out))
+                out = []
+            elif seg.command == 'END':
+                if not stack:
+                    self._error(seg, "END without a matching REPEAT")
+                    continue
+                token, count, parent = stack.pop()
+                parent.append(MacroBlock(token, count, out))
+                out = parent
+            else:
+                out.append(self._include(seg))
+        while stack:
+            token, count, parent = stack.pop()
+            self._error(token, "REPEAT without a matching END (runs to the end of the text)")
+            parent.append(MacroBlock(token, count, out))
+            out = parent
+        return root
+
+    def _include(self, token: MacroToken) -> MacroInclude:
+        path = os.path.expanduser(token.normalized[1])
+        if not os.path.isabs(path):
+            if not self._base_dir:
+                # Resolving against the cwd would depend on where the app
+                # was launched from.
+                self._error(token, f"Can't include '{token.normalized[1]}': relative paths "
+                                   "need a document opened from a file; use an absolute path")
+                return MacroInclude(token, path, None)
+            path = os.path.join(self._base_dir, path)
+        path = os.path.abspath(path)
+        if path in self._include_stack:
+            self._error(token, f"INCLUDE cycle: '{token.normalized[1]}'")
+            return MacroInclude(token, path, None)
+        if len(self._include_stack) >= INCLUDE_DEPTH_MAX:
+            self._error(token, f"INCLUDE nested deeper than {INCLUDE_DEPTH_MAX} files")
+            return MacroInclude(token, path, None)
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except Exception as e:
+            _log_caught('MacroProgram._include')
+            self._error(token, f"Can't include '{token.normalized[1]}': {e}")
+            return MacroInclude(token, path, None)
+        program = compile_macros(
+            text, self._env, base_dir=os.path.dirname(path),
+            include_stack=self._include_stack + (path,))
+        return MacroInclude(token, path, program)
+
+    @staticmethod
+    def _walk(nodes: list, mult: int = 1):
+        """Yield ``(segment, multiplier)`` for every leaf, without repeating."""
+        for node in nodes:
+            t = type(node)
+            if t is MacroBlock:
+                if node.count:
+                    yield from MacroProgram._walk(node.body, mult * node.count)
+            elif t is MacroInclude:
+                if node.program is not None:
+                    yield from MacroProgram._walk(node.program.tree(), mult)
+            else:
+                yield node, mult
+
+    @staticmethod
+    def _replay(nodes: list):
+        for node in nodes:
+            t = type(node)
+            if t is MacroBlock:
+                for _ in range(node.count):
+                    yield from MacroProgram._replay(node.body)
+            elif t is MacroInclude:
+                if node.program is not None:
+                    yield from MacroProgram._replay(node.program.tree())
+            elif t is MacroToken:
+                yield node.raw
+            else:
+                yield node
+
+    def iter_text(self) -> Iterator[str]:
+        """The expanded text, piece by piece, with directives applied and
+        other macros left in place. Never builds the whole expansion."""
+        return self._replay(self.tree())
+
+    def pieces(self) -> List[MacroSpan]:
+        """Runs of text and ordinary macros as :class:`MacroSpan` s, split
+        wherever the repeat count, PASTE region or SPEED override changes;
+        for estimates computed from the structure. Span markers themselves
+        are left out."""
+        out: List[MacroSpan] = []
+        buf: List[str] = []
+        cur = (1, False, None)
+        paste, speed = False, None
+        for seg, mult in self._walk(self.tree()):
+            if type(seg) is MacroToken and seg.ok and seg.command in SPAN_MARKERS:
+                if seg.command == 'SPEED':
+                    speed = parse_speed(seg.normalized[1])
+                else:
+                    paste = seg.command == 'PASTE'
+                continue
+            state = (mult, paste, speed)
+            if state != cur and buf:
+                out.append(MacroSpan(''.join(buf), *cur))
+                buf = []
+            cur = state
+            buf.append(seg.raw if type(seg) is MacroToken else seg)
+        if buf:
+            out.append(MacroSpan(''.join(buf), *cur))
+        return out
+
+    def expanded_size(self) -> int:
+        """Characters of text (macros excluded) in the full expansion."""
+        return sum(len(seg) * mult for seg, mult in self._walk(self.tree()) if type(seg) is str)
+
+    # --- summaries ---------------------------------------------------------
+
+    @property
+    def errors(self) -> List[MacroToken]:
+        out = [t for t in self.tokens if not t.ok]
+        for node, _mult in self._includes():
+            out.extend(node.program.errors)
+        return out
+
+    def _includes(self):
+        def walk(nodes, mult):
+            for node in nodes:
+                if type(node) is MacroBlock:
+                    yield from walk(node.body, mult * node.count)
+                elif type(node) is MacroInclude and node.program is not None:
+                    yield node, mult
+        return walk(self.tree(), 1)
+
+    def diagnostics(self) -> List[str]:
+        out = [t.diagnostic() for t in self.tokens if not t.ok and t.command not in DIRECTIVES]
+        self.tree()
+        out.extend(self._structure_errors)
+        for node, _mult in self._includes():
+            name = os.path.basename(node.path)
+            out.extend(f"{name}: {d}" for d in node.program.diagnostics())
+        return out
+
+    def counts(self) -> Dict[str, int]:
+        """Macro runs per lap: ``total`` plus one entry per known command.
+        Directives and span markers aren't counted; repeated blocks count
+        once per repeat."""
+        if self._counts is None:
+            counts = {"total": 0, "pause": 0, "press": 0, "click": 0, "comment": 0}
+            for seg, mult in self._walk(self.tree()):
+                if type(seg) is MacroToken and seg.command not in SPAN_MARKERS:
+                    counts["total"] += mult
+                    name = seg.command.lower()
+                    if name in counts:
+                        counts[name] += mult
+            self._counts = counts
+        return self._counts
+
+    def pause_seconds(self) -> float:
+        """Total valid PAUSE time per lap (each clamped to 60s by validation)."""
+        return sum(float(seg.normalized[1]) * mult for seg, mult in self._walk(self.tree())
+                   if type(seg) is MacroToken and seg.ok and seg.normalized[0] == 'PAUSE')
+
+    def clicks(self) -> List[Tuple[int, int]]:
+        """Coordinates of the CLICK macros that will run (each listed once)."""
+        out = []
+        for seg, _mult in self._walk(self.tree()):
+            if type(seg) is MacroToken and seg.ok and seg.normalized[0] == 'CLICK':
+                x, y = seg.normalized[1].split(',')
+                out.append((int(x), int(y)))
+        return out
+
+    def text(self) -> str:
+        """The text with every macro token removed (directives not applied)."""
+        return ''.join(seg for seg in self.segments if type(seg) is str)
+
+
+class ExpandedText:
+    """Re-iterable view of a program's expansion, for the worker's streaming
+    path (``TextSource``); each iteration replays it from the start, joining
+    pieces into chunks of about ``chunk_size`` characters."""
+
+    def __init__(self, program: MacroProgram, chunk_size: int = 64 * 1024) -> None:
+        self.program = program
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[str]:
+        buf: List[str] = []
+        size = 0
+        for piece in self.program.iter_text():
+            buf.append(piece)
+            size += len(piece)
+            if size >= self.chunk_size:
+                yield ''.join(buf)
+                buf, size = [], 0
+        if buf:
+            yield ''.join(buf)
+
+    def size_hint(self) -> int:
+        return self.program.expanded_size()
+
+
+def compile_macros(
+    text: str,
+    env: Optional[MacroEnvironment] = None,
+    *,
+    continues: bool = False,
+    base_dir: Optional[str] = None,
+    include_stack: Tuple[str, ...] = (),
+    open_repeats: int = 0,
+) -> MacroProgram:
+    """Tokenize and validate ``text`` into a :class:`MacroProgram`.
+
+    Known commands (``MACRO_SPLIT_RE``) become tokens; a text segment that
+    as a whole looks like ``{{NAME:...}}`` is an unknown-macro token, which
+    the worker skips instead of typing. ``continues`` marks text that
+    continues an earlier chunk, so its first segment is plain text.
+    Relative ``INCLUDE`` paths resolve against ``base_dir`` (the directory
+    of the document the text came from) and are an error when it's None. An ``{{END}}`` with no open ``{{REPEAT}}`` is
+    text; ``open_repeats`` carries the REPEATs an earlier chunk left open,
+    and the program's ``open_repeats`` is the count after this text.
+    """
+    if env is None:
+        env = MacroEnvironment()
+    parts = MACRO_SPLIT_RE.split(text)
+    segments: List[Segment] = []
+    line, line_start, pos = 1, 0, 0
+    depth = open_repeats
+    for j, part in enumerate(parts):
+        if part:
+            is_macro = j % 2 == 1
+            if is_macro and part == '{{END}}':
+                if not depth:
+                    # Stray END: text, and the text after it continues it.
+                    if segments and type(segments[-1]) is str:
+                        segments[-1] += part
+                    else:
+                        segments.append(part)
+                    pos += len(part)
+                    continue
+                depth -= 1
+            name = params = None
+            continued = (j == 0 and continues) or (segments and type(segments[-1]) is str)
+            if is_macro or not continued:
+                match = MACRO_FULLMATCH_RE.fullmatch(part)
+                if match is not None:
+                    name, params = match.group(1), match.group(2)
+                elif is_macro:
+                    name, params = part[2:-2], ''  # {{END}}, {{PASTE}}, ...
+            if name is None:
+                if continued and segments:
+                    segments[-1] += part
+                else:
+                    segments.append(part)
+            else:
+                nl = text.count('\n', line_start, pos)
+                if nl:
+                    line += nl
+                    line_start = text.rindex('\n', line_start, pos) + 1
+                ok, msg, normalized = env.validate(name, params)
+                if is_macro and name.upper() == 'REPEAT':
+                    depth += 1
+                segments.append(MacroToken(
+                    name.upper(), params,
+                    normalized if ok else None, None if ok else msg,
+                    line, pos - line_start + 1, part,
+                ))
+        pos += len(part)
+    program = MacroProgram(segments, env, base_dir, include_stack)
+    program.open_repeats = depth
+    return program
+
+
 def execute_macro(
     command: str,
     params: str,
     *,
     sleep_fn: Callable[[float], None],
+    speed_fn: Optional[Callable[[Optional[Tuple[int, int]]], None]] = None,
 ) -> None:
     """Execute a *validated* macro tuple.
 
     ``sleep_fn`` is the worker's pause/stop-aware sleep so PAUSE macros can be
-    interrupted. Other macros call into pyautogui directly. The caller is
-    responsible for catching/reporting exceptions (so it can include
-    platform-specific hints, e.g. macOS Accessibility errors).
+    interrupted. ``speed_fn`` receives SPEED's ``(min_wpm, max_wpm)`` (None
+    to restore the run's range). Other macros call into pyautogui directly.
+    The caller is responsible for catching/reporting exceptions (so it can
+    include platform-specific hints, e.g. macOS Accessibility errors).
     """
     import pyautogui  # local import: keeps this module importable in tests
     # Local import: matches the ``import pyautogui`` style above and avoids
@@ -132,7 +693,12 @@ def execute_macro(
     elif command == 'CLICK':
         x, y = params.split(',')
         pyautogui.click(int(x), int(y))
-    # COMMENT is a no-op.
+    elif command == 'SPEED':
+        if speed_fn is not None:
+            speed_fn(parse_speed(params))
+    # COMMENT is a no-op, and so are directives: REPEAT/END/INCLUDE are
+    # applied before planning (see MacroProgram.iter_text), PASTE regions
+    # while planning (see PlanCompiler).
 
 
 __all__ = [
@@ -141,4 +707,16 @@ __all__ = [
     "strip_macros",
     "validate_macro",
     "execute_macro",
+    "MacroEnvironment",
+    "MacroToken",
+    "MacroProgram",
+    "MacroBlock",
+    "MacroInclude",
+    "ExpandedText",
+    "MacroSpan",
+    "DIRECTIVES",
+    "SPAN_MARKERS",
+    "parse_speed",
+    "compile_macros",
+    "macro_environment",
 ]
@@ -0,0 +1,128 @@
+"""Closed-loop speed controller for the typing loop.
+
+:class:`SpeedController` compares the real interval between typed keys
+with the planned delay and learns the slip per key class, shortening later
+delays so a run settles on its planned rate. It also keeps the smoothed
+planned and achieved intervals behind the target/achieved WPM readout.
+"""
+
+from __future__ import annotations
+
+import time
+
+from nexustyper.typing.plan import F_GUARD, OP_BURST, OP_NEWLINE, OP_SHIFTED, OP_UNICODE
+
+
+PACE_PLAIN = 0
+PACE_SHIFTED = 1
+PACE_GUARDED = 2
+PACE_UNICODE = 3
+PACE_NEWLINE = 4
+PACE_BURST = 5
+PACE_CLASSES = 6
+
+# Share of each measured slip folded into the class's compensation.
+GAIN = 0.25
+# Compensation never exceeds this (seconds per key).
+MAX_COMP = 0.25
+# Slip beyond this is a pause or a wait on focus, not backend overhead.
+MAX_SLIP = 0.25
+# Smoothing for the target/achieved readout.
+READOUT_ALPHA = 0.02
+
+
+def pace_class(op: int, flags: int) -> int:
+    """The ``PACE_*`` class of a typed or burst plan event."""
+    if flags & F_GUARD:
+        return PACE_GUARDED
+    if op == OP_SHIFTED:
+        return PACE_SHIFTED
+    if op == OP_UNICODE:
+        return PACE_UNICODE
+    if op == OP_NEWLINE:
+        return PACE_NEWLINE
+    if op == OP_BURST:
+        return PACE_BURST
+    return PACE_PLAIN
+
+
+class SpeedController:
+    """Per-run overhead compensation; one instance per worker run.
+
+    Call :meth:`mark` right before emitting plan event ``i`` and
+    :meth:`plan` with the timing model's delay after it, then wait the
+    returned delay. :meth:`reset` breaks the measurement chain (mistake
+    corrections, anything else that is meant to take time).
+    """
+
+    __slots__ = ('_comp', '_t', '_index', '_pending', '_planned_pc', '_actual_pc')
+
+    def __init__(self) -> None:
+        self._comp = [0.0] * PACE_CLASSES
+        self._t = 0.0
+        self._index = -2
+        # (class, planned delay, returned delay, chars) of the last key.
+        self._pending = None
+        self._planned_pc = 0.0
+        self._actual_pc = 0.0
+
+    def reset(self) -> None:
+        self._pending = None
+
+    def mark(self, i: int) -> None:
+        now = time.monotonic()
+        pending = self._pending
+        if pending is not None and self._index == i - 1:
+            cls, planned, waited, chars = pending
+            actual = now - self._t
+            slip = actual - planned
+            if slip <= MAX_SLIP:
+                comp = self._comp[cls]
+                # Anti-windup: with the delay already at zero, more
+                # compensation can't help.
+                if slip < 0 or waited > 0:
+                    self._comp[cls] = min(MAX_COMP, max(0.0, comp + GAIN * slip))
+                if self._planned_pc:
+                    self._planned_pc += READOUT_ALPHA * (planned / chars - self._planned_pc)
+                    self._actual_pc += READOUT_ALPHA * (actual / chars - self._actual_pc)
+                else:
+                    self._planned_pc = planned / chars
+                    self._actual_pc = actual / chars
+        self._t = now
+        self._index = i
+        self._pending = None
+
+    def plan(self, cls: int, delay: float, chars: int = 1) -> float:
+        """The delay to wait after the key just emitted: ``delay`` less the
+        class's learned overhead, never below zero."""
+        waited = delay - self._comp[cls]
+        if waited < 0.0:
+            waited = 0.0
+        self._pending = (cls, delay, waited, max(1, chars))
+        return waited
+
+    def compensation(self, cls: int) -> float:
+        """Seconds currently taken off delays after keys of ``cls``."""
+        return self._comp[cls]
+
+    @property
+    def target_wpm(self) -> float:
+        """Smoothed WPM the timing model planned (0.0 before any key)."""
+        return 12.0 / self._planned_pc if self._planned_pc > 0 else 0.0
+
+    @property
+    def achieved_wpm(self) -> float:
+        """Smoothed WPM actually delivered over the same keys."""
+        return 12.0 / self._actual_pc if self._actual_pc > 0 else 0.0
+
+
+__all__ = [
+    "PACE_PLAIN",
+    "PACE_SHIFTED",
+    "PACE_GUARDED",
+    "PACE_UNICODE",
+    "PACE_NEWLINE",
+    "PACE_BURST",
+    "SpeedController",
+    "pace_class",
+]
@@ -0,0 +1,714 @@
+"""Keystroke plan compiler for the typing engine.
+
+``compile_plan`` resolves macros, newline handling and every character's
+key path once per run into a flat list of ``PlanEvent`` tuples
+``(op, arg, char, weight, flags)``, which the worker replays lap after lap.
+Only settings that change what is emitted are baked in; see
+:func:`plan_settings_key`. :class:`PlanCompiler` does the same for text
+that arrives in chunks.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from nexustyper.typing.autocomplete import PopupModel
+from nexustyper.typing.blocks import STRATEGY_LIST, STRATEGY_PASTE, BlockSegmenter, TextBlock, block_strategy
+from nexustyper.typing.indent import IndentPlanner
+from nexustyper.typing.macros import MacroEnvironment, MacroToken, Segment, compile_macros, strip_macros
+from nexustyper.typing.mistakes import KEY_ADJACENCY
+from nexustyper.typing.sanitize import apply_smart_newlines
+from nexustyper.typing.transliterate import TRANSLIT
+
+
+# --- Event op codes ----------------------------------------------------------
+OP_CHAR = 0         # arg: char, typed via kbd.typewrite
+OP_SHIFTED = 1      # arg: base key, pressed with explicit shift down/up
+OP_TAB = 2          # arg: None
+OP_NEWLINE = 3      # arg: None (Enter or Shift+Enter, decided live)
+OP_UNICODE = 4      # arg: ASCII fallback spelling (TRANSLIT); char: typed via platform Unicode input
+OP_PASTE = 5        # arg: (text, settle_lo, settle_hi)
+OP_MACRO = 6        # arg: normalized (COMMAND, params) from validate_macro
+OP_MACRO_ERROR = 7  # arg: validation message, surfaced as "Macro ignored"
+OP_DEDENT = 8       # arg: Shift+Tab steps before a List Mode line, sent as one batch
+OP_LINE_END = 9     # arg: None, List Mode Enter after each line
+OP_BURST = 10       # arg: printable-ASCII run, injected with one kbd.type_batch
+OP_INDENT = 11      # arg: Tab steps before a List Mode line, sent as one batch
+
+# Ops that go through the per-character humanized path (mistakes, delay).
+TYPED_OPS = frozenset((OP_CHAR, OP_SHIFTED, OP_TAB, OP_NEWLINE, OP_UNICODE))
+
+# --- Event flags -------------------------------------------------------------
+F_GUARD = 1         # autocomplete guard applies before this char
+F_PUNCT = 2         # sentence punctuation: '.,?!'
+F_BRACKET = 4       # bracket: '()[]{}'
+F_BOUNDARY = 8      # previous char was a space/tab (thinking-pause slot)
+F_MISTAKE = 16      # char has an adjacent key, eligible for a fat-finger
+F_SHIFT_RUN = 32    # OP_SHIFTED followed by another OP_SHIFTED: keep shift held
+F_CLIP_HOLD = 64    # OP_PASTE with another paste close behind (or any Paste Mode chunk): keep the clipboard borrowed
+# Autocomplete popup likelihood (``POPUP_*`` level, 0-3) on guarded keys,
+# newlines and List Mode line ends; see ``nexustyper.typing.autocomplete``.
+F_POPUP_SHIFT = 7
+F_POPUP = 3 << F_POPUP_SHIFT
+
+# Burst modes: how much printable ASCII one OP_BURST event may carry.
+BURST_OFF = 'off'
+BURST_WORD = 'word'
+BURST_LINE = 'line'
+BURST_MODES = (BURST_OFF, BURST_WORD, BURST_LINE)
+
+# Paste settle ranges (seconds) mirroring the original per-mode sleeps.
+PASTE_LINE_SETTLE = (0.05, 0.15)
+PASTE_SEGMENT_SETTLE = (0.02, 0.06)
+
+# Paste Mode groups whole lines into one paste of at most this many lines
+# and UTF-8 bytes (a longer single line goes out alone). Configurable per
+# run; one line per chunk is the old line-by-line behaviour.
+PASTE_CHUNK_LINES = 200
+PASTE_CHUNK_BYTES = 16 * 1024
+
+# IME-friendly typing pastes only non-ASCII runs. ASCII gaps of up to two
+# printable characters between them (a space, ", ") ride along in the paste.
+IME_RUN_RE = re.compile(r'[^\x00-\x7f]+(?:[ -~]{1,2}[^\x00-\x7f]+)*')
+# What may follow a run at the end of a chunk that the next chunk's text
+# could still join to it.
+_IME_GAP_RE = re.compile(r'[ -~]{0,2}')
+# Pastes at most this many events apart share one clipboard save/restore.
+CLIP_CLUSTER_EVENTS = 48
+
+# Shifted symbols on a US layout, mapped to their unshifted base key.
+SHIFTED_US_SYMBOLS = {
+    '!': '1',
+    '@': '2',
+    '#': '3',
+    '$': '4',
+    '%': '5',
+    '^': '6',
+    '&': '7',
+    '*': '8',
+    '(': '9',
+    ')': '0',
+    '_': '-',
+    '+': '=',
+    '{': '[',
+    '}': ']',
+    '|': '\\',
+    ':': ';',
+    '"': "'",
+    '<': ',',
+    '>': '.',
+    '?': '/',
+    '~': '`',
+}
+AUTOCOMPLETE_GUARD_CHARS = frozenset("()[]{}.,;:=#\"'")
+
+
+class PlanEvent(NamedTuple):
+    op: int
+    arg: object
+    char: str
+    weight: int
+    flags: int
+
+
+class KeystrokePlan:
+    """A compiled run: the event list, its per-lap output size, and the
+    per-event flags column the timing model draws against."""
+
+    __slots__ = ("events", "output_chars", "key", "flags")
+
+    def __init__(self, events: List[PlanEvent], key: Tuple) -> None:
+        self.events = events
+        self.output_chars = sum(ev[3] for ev in events)
+        self.key = key
+        self.flags = [ev[4] for ev in events]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+def plan_settings_key(
+    *,
+    newline_mode: Optional[str],
+    type_tabs: bool,
+    enable_macros: bool,
+    ime_friendly: bool,
+    unicode_hex_typing: bool,
+    burst: Optional[str] = BURST_OFF,
+    code_target: bool = False,
+    paste_chunk_lines: int = PASTE_CHUNK_LINES,
+    paste_chunk_bytes: int = PASTE_CHUNK_BYTES,
+) -> Tuple:
+    """Return the tuple of settings a plan was compiled against.
+
+    The worker compares this against its live settings at every lap start and
+    recompiles only when something that changes the emitted events moved.
+    ``code_target`` (the focused window is a code editor) only matters in
+    Block Mode, the paste chunk budget only in Paste Mode.
+    """
+    mode = newline_mode or 'Standard'
+    chunk = None
+    if mode == 'Paste Mode':
+        chunk = (max(1, int(paste_chunk_lines)), max(1, int(paste_chunk_bytes)))
+    return (
+        mode,
+        bool(type_tabs),
+        bool(enable_macros),
+        bool(ime_friendly),
+        bool(unicode_hex_typing),
+        burst if burst in BURST_MODES else BURST_OFF,
+        bool(code_target) and mode == 'Block Mode',
+        chunk,
+    )
+
+
+def _char_flags(ch: str, prev: str) -> int:
+    flags = 0
+    if ch in '.,?!':
+        flags |= F_PUNCT
+    elif ch in '()[]{}':
+        flags |= F_BRACKET
+    if prev and prev in ' \t':
+        flags |= F_BOUNDARY
+    if ch.lower() in KEY_ADJACENCY:
+        flags |= F_MISTAKE
+    if ch == '\t' or (
+        prev and (prev.isalnum() or prev == '_') and ch in AUTOCOMPLETE_GUARD_CHARS
+    ):
+        flags |= F_GUARD
+    return flags
+
+
+def char_flags(text: str, prev: str = '') -> List[int]:
+    """``F_*`` flags for each character of ``text``.
+
+    ``prev`` is the character typed just before ``text`` (for the
+    word-boundary and autocomplete-guard checks). Used by callers that pace
+    raw text without compiling a plan, e.g. the dry-run preview.
+    """
+    out = []
+    for ch in text:
+        out.append(_char_flags(ch, prev))
+        prev = ch
+    return out
+
+
+def _append_typed(
+    out: List[PlanEvent],
+    segment: str,
+    *,
+    type_tabs: bool,
+    unicode_hex: bool,
+    burst: str = BURST_OFF,
+    prev: str = '',
+) -> str:
+    """Resolve each character of ``segment`` to its key path once.
+
+    ``prev`` is the character typed just before ``segment`` (for the
+    boundary and guard flags); the return value is the last character typed,
+    so a caller feeding text in pieces can carry it over.
+
+    With ``burst`` set to ``BURST_WORD`` or ``BURST_LINE``, runs of printable
+    ASCII are grouped into ``OP_BURST`` events instead: a word plus its
+    trailing spaces, or everything up to the next newline/tab/non-ASCII
+    character. A run is also cut before any autocomplete-guarded character
+    so the Esc guard still fires in front of it; the run it starts carries
+    ``F_GUARD``.
+    """
+    run: List[str] = []
+    run_flags = 0
+
+    def flush() -> None:
+        if run:
+            text = ''.join(run)
+            out.append(PlanEvent(OP_BURST, text, '', len(text), run_flags))
+            run.clear()
+
+    for ch in segment:
+        if ch == '\t' and not type_tabs:
+            continue
+        flags = _char_flags(ch, prev)
+        if burst != BURST_OFF and ' ' <= ch <= '~':
+            if run and (flags & F_GUARD or (burst == BURST_WORD and prev == ' ' and ch != ' ')):
+                flush()
+            if not run:
+                run_flags = flags & F_GUARD
+            run.append(ch)
+            prev = ch
+            continue
+        flush()
+        if ch == '\n':
+            out.append(PlanEvent(OP_NEWLINE, None, ch, 1, flags & ~F_GUARD))
+        elif unicode_hex and ord(ch) > 0x7F:
+            out.append(PlanEvent(OP_UNICODE, TRANSLIT[ord(ch)], ch, 1, flags & ~F_GUARD))
+        elif ch == '\t':
+            out.append(PlanEvent(OP_TAB, None, ch, 1, flags))
+        elif ch in SHIFTED_US_SYMBOLS:
+            out.append(PlanEvent(OP_SHIFTED, SHIFTED_US_SYMBOLS[ch], ch, 1, flags))
+        elif ch.isascii() and ch.isalpha() and ch.isupper():
+            out.append(PlanEvent(OP_SHIFTED, ch.lower(), ch, 1, flags))
+        else:
+            out.append(PlanEvent(OP_CHAR, ch, ch, 1, flags))
+        prev = ch
+    flush()
+    return prev
+
+
+def _mark_shift_runs(events: List[PlanEvent]) -> List[PlanEvent]:
+    """Flag shifted keys whose successor is shifted too (``F_SHIFT_RUN``).
+
+    The executor holds shift across such a run — ``CONSTANT_NAME`` or
+    ``{"a": (1)}`` cost one shift press/release per run instead of per
+    character — and releases it on the first key without the flag. Anything
+    live that needs shift up mid-run (mistakes, Esc guard, pause, stop)
+    releases it at runtime.
+    """
+    for i in range(len(events) - 1):
+        ev = events[i]
+        if ev[0] == OP_SHIFTED and events[i + 1][0] == OP_SHIFTED:
+            events[i] = ev._replace(flags=ev[4] | F_SHIFT_RUN)
+    return events
+
+
+def popup_level(flags: int) -> int:
+    """The ``POPUP_*`` level stored in an event's flags."""
+    return (flags & F_POPUP) >> F_POPUP_SHIFT
+
+
+def _mark_popups(events: List[PlanEvent], model: PopupModel) -> List[PlanEvent]:
+    """Store the popup likelihood (``F_POPUP``) on every event the Esc
+    guard may fire before: guarded keys, newlines and List Mode line ends.
+
+    ``model`` carries the editor context across calls, so a plan compiled
+    in chunks is marked the same as in one go.
+    """
+    for i, ev in enumerate(events):
+        op = ev[0]
+        if op in TYPED_OPS:
+            if ev[4] & F_GUARD or op == OP_NEWLINE:
+                level = model.level(ev[2])
+                if level:
+                    events[i] = ev._replace(flags=ev[4] | (level << F_POPUP_SHIFT))
+            model.feed(ev[2])
+        elif op == OP_BURST:
+            if ev[4] & F_GUARD:
+                level = model.level(ev[1][0])
+                if level:
+                    events[i] = ev._replace(flags=ev[4] | (level << F_POPUP_SHIFT))
+            model.feed_text(ev[1])
+        elif op == OP_LINE_END:
+            level = model.level('\n')
+            if level:
+                events[i] = ev._replace(flags=ev[4] | (level << F_POPUP_SHIFT))
+            model.reset()
+        elif op == OP_PASTE or (op == OP_MACRO and ev[1][0] not in ('PAUSE', 'SPEED')):
+            # Pasted text and key macros leave no popup context we know of.
+            model.reset()
+    return events
+
+
+def _mark_clip_clusters(events: List[PlanEvent]) -> List[PlanEvent]:
+    """Flag pastes followed by another paste within ``CLIP_CLUSTER_EVENTS``
+    events (``F_CLIP_HOLD``).
+
+    The executor saves the user's clipboard before the first paste of such
+    a cluster and restores it after the last one (or on pause/stop), instead
+    of a save/restore round trip per paste. A macro in between ends the
+    cluster.
+    """
+    nxt = None
+    for i in range(len(events) - 1, -1, -1):
+        op = events[i][0]
+        if op == OP_PASTE:
+            if nxt is not None and nxt - i <= CLIP_CLUSTER_EVENTS:
+                events[i] = events[i]._replace(flags=events[i][4] | F_CLIP_HOLD)
+            nxt = i
+        elif op == OP_MACRO or op == OP_MACRO_ERROR:
+            nxt = None
+    return events
+
+
+class PasteChunker:
+    """Groups Paste Mode lines into chunks within a line and byte budget.
+
+    :meth:`add` returns the chunk a line closed (the line starts the next
+    one), :meth:`flush` whatever is pending. Lines are never split.
+    """
+
+    __slots__ = ('max_lines', 'max_bytes', '_lines', '_bytes')
+
+    def __init__(self, max_lines: int = PASTE_CHUNK_LINES, max_bytes: int = PASTE_CHUNK_BYTES) -> None:
+        self.max_lines = max(1, int(max_lines))
+        self.max_bytes = max(1, int(max_bytes))
+        self._lines: List[str] = []
+        self._bytes = 0
+
+    def add(self, line: str) -> str:
+        size = len(line) if line.isascii() else len(line.encode('utf-8', 'surrogatepass'))
+        done = ''
+        if self._lines and (len(self._lines) >= self.max_lines or self._bytes + size > self.max_bytes):
+            done = self.flush()
+        self._lines.append(line)
+        self._bytes += size
+        return done
+
+    def flush(self) -> str:
+        chunk = ''.join(self._lines)
+        self._lines = []
+        self._bytes = 0
+        return chunk
+
+
+def paste_chunks(text: str, max_lines: int = PASTE_CHUNK_LINES,
+                 max_bytes: int = PASTE_CHUNK_BYTES) -> List[str]:
+    """The Paste Mode chunks of macro-free ``text``."""
+    chunker = PasteChunker(max_lines, max_bytes)
+    out = [c for c in map(chunker.add, text.splitlines(keepends=True)) if c]
+    rest = chunker.flush()
+    if rest:
+        out.append(rest)
+    return out
+
+
+class PlanCompiler:
+    """Incremental :func:`compile_plan` for text that arrives in chunks.
+
+    :meth:`feed` compiles one chunk and returns its events. State that spans
+    chunks carries over: List Mode's indentation model, whether a
+    ``{{PASTE}}`` region is open and the text it has yet to paste, Block
+    Mode's open paragraph, the last typed character (for the boundary/guard
+    flags) and the autocomplete popup context. Chunks must not split a
+    macro token, and in List Mode, Paste Mode and Block Mode must end on a
+    line boundary; text for Smart Newlines must already be reflowed.
+    ``nexustyper.typing.stream`` prepares chunks that way. Call
+    :meth:`finish` after the last chunk.
+    """
+
+    def __init__(
+        self,
+        *,
+        newline_mode: Optional[str] = 'Standard',
+        type_tabs: bool = True,
+        enable_macros: bool = True,
+        ime_friendly: bool = False,
+        unicode_hex_typing: bool = False,
+        burst: Optional[str] = BURST_OFF,
+        code_target: bool = False,
+        paste_chunk_lines: int = PASTE_CHUNK_LINES,
+        paste_chunk_bytes: int = PASTE_CHUNK_BYTES,
+        macro_env: Optional[MacroEnvironment] = None,
+    ) -> None:
+        self.key = plan_settings_key(
+            newline_mode=newline_mode,
+            type_tabs=type_tabs,
+            enable_macros=enable_macros,
+            ime_friendly=ime_friendly,
+            unicode_hex_typing=unicode_hex_typing,
+            burst=burst,
+            code_target=code_target,
+            paste_chunk_lines=paste_chunk_lines,
+            paste_chunk_bytes=paste_chunk_bytes,
+        )
+        self.mode = self.key[0]
+        self._type_tabs = bool(type_tabs)
+        self._enable_macros = bool(enable_macros)
+        self._unicode_hex = bool(unicode_hex_typing)
+        self._burst = self.key[5]
+        self._paste_segments = bool(ime_friendly) and not unicode_hex_typing
+        self._macro_env = macro_env if macro_env is not None else MacroEnvironment()
+        self._indent = IndentPlanner()
+        self._popups = PopupModel()
+        self._prev = ''
+        # Inside {{PASTE}} ... {{/PASTE}}: text segments become OP_PASTE.
+        self._pasting = False
+        # Text to paste ({{PASTE}} regions, IME runs), held until something
+        # else is planned so a region that spans chunks is still one paste.
+        self._pending_paste: List[str] = []
+        # IME-friendly: the end of the last chunk from a non-ASCII run on,
+        # planned with the next chunk since the run may continue there.
+        self._ime_tail = ''
+        # Block Mode: per-block strategy; the current block is pasted.
+        self._blocks = BlockSegmenter() if self.mode == 'Block Mode' else None
+        self._code_target = self.key[6]
+        self._block_strategy = None
+        self._block_paste = False
+        # Paste Mode: lines pending for the next chunk.
+        self._chunker = PasteChunker(*self.key[7]) if self.key[7] else None
+        # Whether the previous chunk ended inside a text segment; if so the
+        # next chunk's first segment continues it and can't be a macro.
+        self._open = False
+        # REPEATs opened by earlier chunks, so a later {{END}} closes one
+        # instead of being typed as text.
+        self._repeats = 0
+
+    def _segments(self, s: str, continues: bool = False) -> List[Segment]:
+        if self._enable_macros:
+            program = compile_macros(
+                s, self._macro_env, continues=continues, open_repeats=self._repeats)
+            self._repeats = program.open_repeats
+            return program.segments
+        return [s] if s else []
+
+    def _split(self, text: str) -> List[Segment]:
+        """Segments of ``text``; tracks whether it ends inside text."""
+        segments = self._segments(text, self._open)
+        if segments:
+            self._open = type(segments[-1]) is str
+        return segments
+
+    def _macro(self, events: List[PlanEvent], token: MacroToken) -> None:
+        """Plan a macro token; PASTE markers only switch the paste state."""
+        self._flush_paste(events)
+        if not token.ok:
+            events.append(PlanEvent(OP_MACRO_ERROR, token.error, '', 0, 0))
+        elif token.command in ('PASTE', '/PASTE'):
+            self._pasting = token.command == 'PASTE'
+        else:
+            events.append(PlanEvent(OP_MACRO, token.normalized, '', 0, 0))
+
+    def _paste(self, events: List[PlanEvent], segment: str) -> None:
+        if not self._type_tabs:
+            segment = segment.replace('\t', '')
+        if segment:
+            self._pending_paste.append(segment)
+
+    def _flush_paste(self, events: List[PlanEvent]) -> None:
+        if self._pending_paste:
+            text = ''.join(self._pending_paste)
+            self._pending_paste = []
+            events.append(PlanEvent(OP_PASTE, (text,) + PASTE_SEGMENT_SETTLE, '', len(text), 0))
+
+    def _typed(self, events: List[PlanEvent], segment: str, prev: str = '') -> str:
+        self._flush_paste(events)
+        return _append_typed(
+            events, segment, type_tabs=self._type_tabs, unicode_hex=self._unicode_hex,
+            burst=self._burst, prev=prev)
+
+    def _hybrid(self, events: List[PlanEvent], segment: str, prev: str = '', hold: bool = False) -> str:
+        """IME-friendly: type the ASCII runs of ``segment`` per key and
+        paste only its non-ASCII runs (see ``IME_RUN_RE``). With ``hold``,
+        a run the next chunk could extend is kept in ``_ime_tail``."""
+        pos = 0
+        for m in IME_RUN_RE.finditer(segment):
+            if hold and _IME_GAP_RE.fullmatch(segment, m.end()):
+                self._ime_tail = segment[m.start():]
+                segment = segment[:m.start()]
+                break
+            if m.start() > pos:
+                prev = self._typed(events, segment[pos:m.start()], prev)
+            run = m.group()
+            self._paste(events, run)
+            prev = run[-1]
+            pos = m.end()
+        if pos < len(segment):
+            prev = self._typed(events, segment[pos:], prev)
+        return prev
+
+    def feed(self, text: str) -> List[PlanEvent]:
+        events: List[PlanEvent] = []
+        if self.mode == 'Paste Mode':
+            self._feed_paste(text, events)
+        elif self.mode == 'List Mode':
+            self._feed_list(text, events)
+        elif self._blocks is not None:
+            self._feed_blocks(self._blocks.feed(text), events)
+        else:
+            self._feed_typed(text, events)
+        return _mark_clip_clusters(_mark_shift_runs(_mark_popups(events, self._popups)))
+
+    def finish(self) -> List[PlanEvent]:
+        """Events for text held back until the end of the input: Block
+        Mode's last paragraph, Paste Mode's last chunk and any paste still
+        pending."""
+        events: List[PlanEvent] = []
+        if self._blocks is not None:
+            self._feed_blocks(self._blocks.finish(), events)
+        elif self._chunker is not None:
+            self._paste_chunk(events, self._chunker.flush())
+        if self._ime_tail:
+            tail, self._ime_tail = self._ime_tail, ''
+            self._prev = self._hybrid(events, tail, self._prev)
+        self._flush_paste(events)
+        return _mark_clip_clusters(_mark_shift_runs(_mark_popups(events, self._popups)))
+
+    def _feed_blocks(self, blocks: List[TextBlock], events: List[PlanEvent]) -> None:
+        # Prose is typed; code and tables are pasted, or go through List
+        # Mode when the target is a code editor.
+        for block in blocks:
+            strategy = block_strategy(block.kind, self._code_target)
+            if strategy == STRATEGY_LIST:
+                if self._block_strategy != STRATEGY_LIST:
+                    # Typed/pasted text before it left the cursor at column 0.
+                    self._indent.reset()
+                self._feed_list(block.text, events)
+            else:
+                self._block_paste = strategy == STRATEGY_PASTE
+                self._feed_typed(block.text, events)
+                self._block_paste = False
+            self._block_strategy = strategy
+
+    def _feed_paste(self, text: str, events: List[PlanEvent]) -> None:
+        # Paste text fast, in chunks of whole lines, but still honor macros
+        # and guardrails: a macro closes the pending chunk, and the executor
+        # runs its focus/pause checks before every chunk.
+        chunker = self._chunker
+        for segment in self._split(text):
+            if type(segment) is MacroToken:
+                self._paste_chunk(events, chunker.flush())
+                self._macro(events, segment)
+                continue
+            for line in segment.splitlines(keepends=True):
+                self._paste_chunk(events, chunker.add(line))
+
+    def _paste_chunk(self, events: List[PlanEvent], chunk: str) -> None:
+        # The whole run shares one clipboard save/restore (F_CLIP_HOLD on
+        # every chunk); the executor restores it on pause and at the end.
+        if chunk:
+            events.append(PlanEvent(OP_PASTE, (chunk,) + PASTE_LINE_SETTLE, '', len(chunk), F_CLIP_HOLD))
+
+    def _feed_list(self, text: str, events: List[PlanEvent]) -> None:
+        # Strip leading indentation and always send Enter per line. The
+        # indentation model (``nexustyper.typing.indent``) predicts the
+        # editor's auto-indent, so only the difference is sent, as one
+        # batched Tab or Shift+Tab event before the line.
+        indent = self._indent
+        for line in text.splitlines():
+            steps = indent.line(strip_macros(line) if self._enable_macros and '{{' in line else line)
+            self._flush_paste(events)
+            if steps < 0:
+                events.append(PlanEvent(OP_DEDENT, -steps, '', 0, 0))
+            elif steps > 0:
+                events.append(PlanEvent(OP_INDENT, steps, '', 0, 0))
+            stripped = line.lstrip(' \t')
+            if not self._type_tabs:
+                stripped = stripped.replace('\t', '')
+            for segment in self._segments(stripped):
+                if type(segment) is MacroToken:
+                    self._macro(events, segment)
+                    continue
+                # In List Mode (code editors), prefer per-key typing; only
+                # non-ASCII runs are pasted when they would fail without
+                # IME/Unicode support.
+                if self._pasting:
+                    self._paste(events, segment)
+                elif self._paste_segments:
+                    self._hybrid(events, segment)
+                else:
+                    self._typed(events, segment)
+            self._flush_paste(events)
+            events.append(PlanEvent(OP_LINE_END, None, '', 1, 0))
+
+    def _feed_typed(self, text: str, events: List[PlanEvent]) -> None:
+        # Only the first segment continues the previous chunk; the rest
+        # follow a macro and start fresh, as in a one-shot compile.
+        prev, self._prev = self._prev, ''
+        segments = self._split(text)
+        if self._ime_tail:
+            if segments and type(segments[0]) is str:
+                segments[0] = self._ime_tail + segments[0]
+            else:
+                segments.insert(0, self._ime_tail)
+            self._ime_tail = ''
+        # Blocks arrive whole, so only a chunk's last text can continue.
+        last = len(segments) - 1 if self._blocks is None and self._open else -1
+        for i, segment in enumerate(segments):
+            if type(segment) is MacroToken:
+                self._macro(events, segment)
+                prev = self._prev = ''
+                continue
+            if self._pasting or self._block_paste:
+                self._paste(events, segment)
+            elif self._paste_segments:
+                if not self._type_tabs:
+                    segment = segment.replace('\t', '')
+                self._prev = self._hybrid(events, segment, prev, hold=i == last)
+            else:
+                self._prev = self._typed(events, segment, prev)
+            prev = ''
+
+
+def compile_plan(
+    text: str,
+    *,
+    newline_mode: Optional[str] = 'Standard',
+    type_tabs: bool = True,
+    enable_macros: bool = True,
+    ime_friendly: bool = False,
+    unicode_hex_typing: bool = False,
+    burst: Optional[str] = BURST_OFF,
+    code_target: bool = False,
+    paste_chunk_lines: int = PASTE_CHUNK_LINES,
+    paste_chunk_bytes: int = PASTE_CHUNK_BYTES,
+    macro_env: Optional[MacroEnvironment] = None,
+) -> KeystrokePlan:
+    """Compile sanitized ``text`` into a :class:`KeystrokePlan`.
+
+    Macros are tokenized by :func:`compile_macros` and validated against
+    ``macro_env`` (no key/bounds checks when omitted) once per compile
+    instead of once per occurrence per lap. ``burst`` (one of ``BURST_MODES``)
+    groups typed ASCII into ``OP_BURST`` events; see :func:`_append_typed`.
+    In Block Mode ``code_target`` sends code blocks through List Mode
+    instead of pasting them; see ``nexustyper.typing.blocks``. Paste Mode
+    groups lines into chunks of at most ``paste_chunk_lines`` lines and
+    ``paste_chunk_bytes`` UTF-8 bytes; see :class:`PasteChunker`.
+    """
+    compiler = PlanCompiler(
+        newline_mode=newline_mode,
+        type_tabs=type_tabs,
+        enable_macros=enable_macros,
+        ime_friendly=ime_friendly,
+        unicode_hex_typing=unicode_hex_typing,
+        burst=burst,
+        code_target=code_target,
+        paste_chunk_lines=paste_chunk_lines,
+        paste_chunk_bytes=paste_chunk_bytes,
+        macro_env=macro_env,
+    )
+    if compiler.mode == 'Smart Newlines':
+        text = apply_smart_newlines(text)
+    return KeystrokePlan(compiler.feed(text) + compiler.finish(), compiler.key)
+
+
+__all__ = [
+    "OP_CHAR",
+    "OP_SHIFTED",
+    "OP_TAB",
+    "OP_NEWLINE",
+    "OP_UNICODE",
+    "OP_PASTE",
+    "OP_MACRO",
+    "OP_MACRO_ERROR",
+    "OP_DEDENT",
+    "OP_LINE_END",
+    "OP_BURST",
+    "OP_INDENT",
+    "TYPED_OPS",
+    "F_GUARD",
+    "F_PUNCT",
+    "F_BRACKET",
+    "F_BOUNDARY",
+    "F_MISTAKE",
+    "F_SHIFT_RUN",
+    "F_CLIP_HOLD",
+    "F_POPUP",
+    "F_POPUP_SHIFT",
+    "IME_RUN_RE",
+    "PASTE_CHUNK_LINES",
+    "PASTE_CHUNK_BYTES",
+    "BURST_OFF",
+    "BURST_WORD",
+    "BURST_LINE",
+    "BURST_MODES",
+    "SHIFTED_US_SYMBOLS",
+    "AUTOCOMPLETE_GUARD_CHARS",
+    "PlanEvent",
+    "KeystrokePlan",
+    "PlanCompiler",
+    "PasteChunker",
+    "paste_chunks",
+    "plan_settings_key",
+    "char_flags",
+    "popup_level",
+    "compile_plan",
+]
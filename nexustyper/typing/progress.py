@@ -0,0 +1,113 @@
+"""Progress counter shared between the typing thread and the UI.
+
+The worker writes plain attributes on a :class:`ProgressCounter` instead of
+emitting a signal per keystroke, and the UI polls it on its own timer.
+The worker thread is the only writer of the counters, so no lock is needed;
+``seq`` is bumped after every update so a poller can skip idle repaints.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+STATE_IDLE = "idle"
+STATE_RUNNING = "running"
+STATE_PAUSED = "paused"
+STATE_FINISHED = "finished"
+
+
+class ProgressSnapshot(NamedTuple):
+    chars_done: int
+    total: int
+    lap: int
+    laps: int
+    elapsed: float
+    state: str
+    seq: int
+    # Speed controller readout (0.0 until the first keys are measured).
+    target_wpm: float = 0.0
+    achieved_wpm: float = 0.0
+
+    def wpm(self) -> float:
+        """Average words per minute over the active (unpaused) time."""
+        if self.elapsed <= 0 or self.chars_done <= 0:
+            return 0.0
+        return (self.chars_done / self.elapsed) * 12.0
+
+    def etr_seconds(self) -> float:
+        """Estimated seconds remaining at the average pace so far."""
+        if self.elapsed <= 0 or self.chars_done <= 0:
+            return 0.0
+        remaining = max(0, self.total - self.chars_done)
+        return remaining * (self.elapsed / self.chars_done)
+
+
+class ProgressCounter:
+    """Lock-free progress slots written by the worker, polled by the UI."""
+
+    __slots__ = ("chars_done", "total", "lap", "laps", "elapsed", "state", "seq",
+                 "target_wpm", "achieved_wpm")
+
+    def __init__(self) -> None:
+        self.chars_done = 0
+        self.total = 0
+        self.lap = 0
+        self.laps = 0
+        self.elapsed = 0.0
+        self.state = STATE_IDLE
+        self.seq = 0
+        self.target_wpm = 0.0
+        self.achieved_wpm = 0.0
+
+    # --- writer (worker thread) ----------------------------------------------
+
+    def start(self, total: int, laps: int) -> None:
+        self.chars_done = 0
+        self.total = int(total)
+        self.lap = 0
+        self.laps = int(laps)
+        self.elapsed = 0.0
+        self.state = STATE_RUNNING
+        self.target_wpm = 0.0
+        self.achieved_wpm = 0.0
+        self.seq += 1
+
+    def set_total(self, total: int) -> None:
+        self.total = int(total)
+        self.seq += 1
+
+    def set_lap(self, lap: int) -> None:
+        self.lap = int(lap)
+        self.seq += 1
+
+    def advance(self, chars_done: int, elapsed: float) -> None:
+        self.chars_done = chars_done
+        self.elapsed = elapsed
+        self.seq += 1
+
+    def set_pace(self, target_wpm: float, achieved_wpm: float) -> None:
+        """Speed controller readout; rides along with the next ``advance``."""
+        self.target_wpm = target_wpm
+        self.achieved_wpm = achieved_wpm
+
+    def set_state(self, state: str) -> None:
+        self.state = state
+        self.seq += 1
+
+    # --- reader (UI thread) --------------------------------------------------
+
+    def snapshot(self) -> ProgressSnapshot:
+        return ProgressSnapshot(
+            self.chars_done, self.total, self.lap, self.laps, self.elapsed, self.state, self.seq,
+            self.target_wpm, self.achieved_wpm)
+
+
+__all__ = [
+    "ProgressCounter",
+    "ProgressSnapshot",
+    "STATE_IDLE",
+    "STATE_RUNNING",
+    "STATE_PAUSED",
+    "STATE_FINISHED",
+]
@@ -9,13 +9,19 @@ must be cheap and idempotent. The two main entry points are:
 - ``apply_smart_newlines``: collapse soft-wrapped single newlines into
   spaces while preserving paragraph breaks, lists, blockquotes, headings,
   and indented/code-like lines.
+
+``iter_sanitized`` and ``iter_smart_newlines`` are the same two steps over
+an iterable of text chunks (see ``nexustyper.typing.stream``), for sources
+too large to hold in memory several times over.
 """
 
 from __future__ import annotations
 from nexustyper.services.logging_setup import _log_caught
 
 import html
+import itertools
 import re
+from typing import Iterable, Iterator
 
 
 # --- Smart-newline regexes ---------------------------------------------------
@@ -23,6 +29,31 @@ _SMART_BULLET_RE = re.compile(r"^\s*(?:[-*+]|•)\s+")
 _SMART_NUMBERED_RE = re.compile(r"^\s*\d+[.)]\s+")
 _SMART_BLOCKQUOTE_RE = re.compile(r"^\s*>+\s+")
 _SMART_HEADING_RE = re.compile(r"^\s*#{1,6}\s+")
+# Streaming reflow decides "looks like code" from this much leading text.
+_SMART_DETECT_WINDOW = 64 * 1024
+_SMART_CODE_MARKERS = (
+    "def ",
+    "class ",
+    "import ",
+    "from ",
+    "try:",
+    "except ",
+    "finally:",
+    "elif ",
+    "else:",
+    "return",
+    "function ",
+    "const ",
+    "let ",
+    "var ",
+    "#include",
+    "std::",
+    "public ",
+    "private ",
+)
+# Longest HTML entity name is 31 chars plus '&' and ';'; a '&' this close to
+# a chunk's end is held back so the entity isn't split.
+_ENTITY_HOLD = 40
 
 
 # --- Invisible/bidi/punctuation tables --------------------------------------
@@ -83,6 +114,68 @@ def sanitize_ai_text(text: str) -> str:
     return text
 
 
+def iter_sanitized(chunks: Iterable[str]) -> Iterator[str]:
+    """``sanitize_ai_text`` over a stream of chunks.
+
+    A trailing ``\r`` (half a CRLF) and a ``&`` near the end of a chunk
+    (a possibly split entity) are held back and prepended to the next
+    chunk, so the output matches sanitizing the joined text.
+    """
+    held = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if held:
+            chunk = held + chunk
+        cut = len(chunk)
+        if chunk.endswith('\r'):
+            cut -= 1
+        amp = chunk.rfind('&', max(0, cut - _ENTITY_HOLD), cut)
+        if amp >= 0:
+            cut = amp
+        held = chunk[cut:]
+        if cut:
+            yield sanitize_ai_text(chunk[:cut])
+    if held:
+        yield sanitize_ai_text(held)
+
+
+def _smart_reflow_disabled(text: str) -> bool:
+    """True when ``text`` looks like code overall, so lines must not be joined."""
+    t = text.strip()
+    marker_hits = sum(1 for m in _SMART_CODE_MARKERS if m in t)
+    symbol_hits = sum(1 for ch in t[:2000] if ch in "{}();<>[]=")
+    return marker_hits >= 2 or symbol_hits >= 18
+
+
+def _smart_separator(line: str, nxt: str) -> str:
+    """What replaces the newline between ``line`` and ``nxt``: ``"\n"`` or ``" "``."""
+    # Paragraph breaks.
+    if line == "" or nxt == "":
+        return "\n"
+    # Preserve lists/quotes/headings.
+    if (
+        _SMART_BULLET_RE.match(line)
+        or _SMART_BULLET_RE.match(nxt)
+        or _SMART_NUMBERED_RE.match(line)
+        or _SMART_NUMBERED_RE.match(nxt)
+        or _SMART_BLOCKQUOTE_RE.match(line)
+        or _SMART_BLOCKQUOTE_RE.match(nxt)
+        or _SMART_HEADING_RE.match(line)
+        or _SMART_HEADING_RE.match(nxt)
+    ):
+        return "\n"
+    # Preserve indented/code-like lines.
+    if (
+        line.startswith("    ")
+        or line.startswith("\t")
+        or nxt.startswith("    ")
+        or nxt.startswith("\t")
+    ):
+        return "\n"
+    return " "
+
+
 def apply_smart_newlines(text: str) -> str:
     """Join soft-wrapped single newlines into spaces, preserving semantic breaks.
 
@@ -102,30 +195,7 @@ def apply_smart_newlines(text: str) -> str:
     # If the input looks like code overall, do not reflow lines.
     # This prevents "Smart Newlines" from collapsing top-level code (e.g., imports) into one line.
     try:
-        t = s.strip()
-        markers = (
-            "def ",
-            "class ",
-            "import ",
-            "from ",
-            "try:",
-            "except ",
-            "finally:",
-            "elif ",
-            "else:",
-            "return",
-            "function ",
-            "const ",
-            "let ",
-            "var ",
-            "#include",
-            "std::",
-            "public ",
-            "private ",
-        )
-        marker_hits = sum(1 for m in markers if m in t)
-        symbol_hits = sum(1 for ch in t[:2000] if ch in "{}();<>[]=")
-        if marker_hits >= 2 or symbol_hits >= 18:
+        if _smart_reflow_disabled(s):
             return s
     except Exception:
         _log_caught('apply_smart_newlines@L128')
@@ -137,44 +207,68 @@ def apply_smart_newlines(text: str) -> str:
         out.append(line)
         if i >= len(lines) - 1:
             break
-        nxt = lines[i + 1]
+        out.append(_smart_separator(line, lines[i + 1]))
+    return "".join(out)
 
-        # Paragraph breaks.
-        if line == "" or nxt == "":
-            out.append("\n")
-            continue
 
-        # Preserve lists/quotes/headings.
-        if (
-            _SMART_BULLET_RE.match(line)
-            or _SMART_BULLET_RE.match(nxt)
-            or _SMART_NUMBERED_RE.match(line)
-            or _SMART_NUMBERED_RE.match(nxt)
-            or _SMART_BLOCKQUOTE_RE.match(line)
-            or _SMART_BLOCKQUOTE_RE.match(nxt)
-            or _SMART_HEADING_RE.match(line)
-            or _SMART_HEADING_RE.match(nxt)
-        ):
-            out.append("\n")
-            continue
+def iter_smart_newlines(chunks: Iterable[str]) -> Iterator[str]:
+    """``apply_smart_newlines`` over a stream of sanitized chunks.
 
-        # Preserve indented/code-like lines.
-        if (
-            line.startswith("    ")
-            or line.startswith("\t")
-            or nxt.startswith("    ")
-            or nxt.startswith("\t")
-        ):
-            out.append("\n")
-            continue
+    Each line is held until its successor arrives, so joins that span chunk
+    boundaries come out the same as on the joined text. The "looks like
+    code" check runs on the first ``_SMART_DETECT_WINDOW`` characters
+    rather than the whole document.
+    """
+    it = iter(chunks)
+    head = []
+    size = 0
+    for chunk in it:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= _SMART_DETECT_WINDOW:
+            break
+    head_text = "".join(head)
+    try:
+        disabled = _smart_reflow_disabled(head_text)
+    except Exception:
+        _log_caught('iter_smart_newlines')
+        disabled = False
+    if disabled:
+        if head_text:
+            yield head_text
+        yield from it
+        return
 
-        out.append(" ")
-    return "".join(out)
+    pending = None  # last complete line, waiting for its successor
+    partial = []    # pieces of the line currently being read
+    for chunk in itertools.chain((head_text,), it):
+        if "\n" not in chunk:
+            if chunk:
+                partial.append(chunk)
+            continue
+        parts = chunk.split("\n")
+        parts[0] = "".join(partial) + parts[0]
+        partial = [parts.pop()]
+        out = []
+        for line in parts:
+            if pending is not None:
+                out.append(pending)
+                out.append(_smart_separator(pending, line))
+            pending = line
+        if out:
+            yield "".join(out)
+    last = "".join(partial)
+    if pending is not None:
+        yield pending + _smart_separator(pending, last) + last
+    elif last:
+        yield last
 
 
 __all__ = [
     "sanitize_ai_text",
     "apply_smart_newlines",
+    "iter_sanitized",
+    "iter_smart_newlines",
     "_SMART_BULLET_RE",
     "_SMART_NUMBERED_RE",
     "_SMART_BLOCKQUOTE_RE",
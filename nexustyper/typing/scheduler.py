@@ -0,0 +1,126 @@
+"""Deadline-based keystroke scheduler on a monotonic clock.
+
+The worker used to compute every inter-key delay relative to "now" after the
+backend call returned and sleep it off in 20 ms ``time.time()`` slices. Any
+per-call overhead (pyautogui's ``PAUSE`` cushion, several events per shifted
+character, focus checks) was therefore added on top of the planned delay and
+achieved WPM drifted well below the slider.
+
+``KeystrokeScheduler`` plans *absolute* deadlines instead: each keystroke is
+due ``delay`` after the previous keystroke's deadline, not after the previous
+keystroke finished, so overhead is absorbed rather than accumulated. It
+sleeps coarsely until just before the deadline and spins the last
+sub-millisecond, and it bounds how far behind schedule it will try to catch
+up so a slow stretch never turns into a burst of keys.
+
+Pause and stop are honored within one coarse slice (``SLICE_NS``); time spent
+paused is never billed against a pending delay.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class KeystrokeScheduler:
+    """Absolute-deadline pacing for the typing loop.
+
+    ``is_running`` is polled between slices; ``pause_event`` is the worker's
+    "not paused" event (set = running). Both are owned by the worker.
+    ``on_pause`` (optional) runs on the waiting thread as soon as a pause is
+    observed — the worker uses it to release a held modifier.
+    """
+
+    # Coarse sleep slice — the worst-case latency for noticing stop/pause.
+    SLICE_NS = 20_000_000
+    # Final stretch before a deadline that is spun instead of slept; OS sleep
+    # granularity (1-15 ms depending on platform) would otherwise overshoot.
+    SPIN_NS = 1_000_000
+    # Maximum lag the scheduler will try to win back by sending the next
+    # keys early. Beyond this the schedule is rebased to "now".
+    MAX_LAG_NS = 250_000_000
+
+    def __init__(
+        self,
+        is_running: Callable[[], bool],
+        pause_event: threading.Event,
+        on_pause: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._is_running = is_running
+        self._pause_event = pause_event
+        self._on_pause = on_pause
+        self._deadline: Optional[int] = None
+
+    def rebase(self) -> None:
+        """Forget the running schedule; the next wait starts from "now".
+
+        Called after pauses and intentional non-keystroke sleeps so the
+        scheduler never tries to "catch up" time that was meant to pass.
+        """
+        self._deadline = None
+
+    def lag_seconds(self) -> float:
+        """How far the current time is past the last planned deadline."""
+        if self._deadline is None:
+            return 0.0
+        return max(0.0, (time.monotonic_ns() - self._deadline) / 1e9)
+
+    def wait_next(self, delay: float) -> bool:
+        """Wait until ``delay`` seconds after the previous keystroke deadline.
+
+        Returns False if the worker stopped while waiting.
+        """
+        now = time.monotonic_ns()
+        base = self._deadline if self._deadline is not None else now
+        deadline = base + int(max(0.0, delay) * 1e9)
+        # Overrun compensation: if the backend ran long, the next key goes
+        # out early to get back on schedule — but never by more than
+        # MAX_LAG_NS worth of catch-up.
+        floor = now - self.MAX_LAG_NS
+        if deadline < floor:
+            deadline = floor
+        self._deadline = deadline
+        return self._sleep_until(deadline)
+
+    def sleep(self, duration: float) -> bool:
+        """Interruptible plain sleep that rebases the keystroke schedule.
+
+        Used for settle delays, macro PAUSEs and mistake corrections — time
+        that is meant to pass rather than be absorbed into the next key.
+        """
+        deadline = time.monotonic_ns() + int(max(0.0, duration) * 1e9)
+        ok = self._sleep_until(deadline)
+        self._deadline = None
+        return ok
+
+    def _sleep_until(self, deadline: int) -> bool:
+        is_running = self._is_running
+        pause_event = self._pause_event
+        while is_running():
+            if not pause_event.is_set():
+                # Block during pauses without busy-waiting and push the
+                # deadline out by however long we were paused.
+                if self._on_pause is not None:
+                    self._on_pause()
+                paused_at = time.monotonic_ns()
+                pause_event.wait(timeout=0.1)
+                shift = time.monotonic_ns() - paused_at
+                deadline += shift
+                if self._deadline is not None:
+                    self._deadline += shift
+                continue
+            remaining = deadline - time.monotonic_ns()
+            if remaining <= 0:
+                return True
+            if remaining > self.SPIN_NS:
+                time.sleep(min(remaining - self.SPIN_NS, self.SLICE_NS) / 1e9)
+            else:
+                # Spin the last sub-millisecond; sleep(0) yields the GIL so
+                # the GUI thread isn't starved while we wait.
+                time.sleep(0)
+        return False
+
+
+__all__ = ["KeystrokeScheduler"]
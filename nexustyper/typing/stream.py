@@ -0,0 +1,212 @@
+"""Streaming text sources for the typing engine.
+
+:class:`TextSource` reads a file object or an iterable of strings in
+``STREAM_CHUNK`` pieces, and :func:`prepare_chunks` runs sanitizing, smart
+newlines and chunk cutting as a generator pipeline for
+``PlanCompiler.feed``, so large sources type with flat memory. No stage
+splits a CRLF, an HTML entity, a macro token or (where the mode needs it)
+a line.
+"""
+
+from __future__ import annotations
+
+import codecs
+import os
+from typing import Iterable, Iterator, Optional
+
+from nexustyper.services.logging_setup import _log_caught
+from nexustyper.typing.macros import MACRO_SPLIT_RE
+from nexustyper.typing.sanitize import iter_sanitized, iter_smart_newlines
+
+
+STREAM_CHUNK = 64 * 1024
+# How much leading text auto-detect and the empty-source check look at.
+PEEK_CHARS = 4096
+# An unterminated "{{" further back than this is plain text, not a macro.
+MACRO_HOLD_MAX = 4096
+
+
+def iter_line_aligned(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-cut ``chunks`` so every chunk but the last ends with a newline."""
+    tail = []
+    for chunk in chunks:
+        i = chunk.rfind('\n')
+        if i < 0:
+            if chunk:
+                tail.append(chunk)
+            continue
+        tail.append(chunk[:i + 1])
+        yield ''.join(tail)
+        tail = [chunk[i + 1:]]
+    rest = ''.join(tail)
+    if rest:
+        yield rest
+
+
+def _macro_cut(chunk: str) -> int:
+    """Where to cut ``chunk`` so no macro token is split, else ``len``.
+
+    Only the final line matters (tokens never span lines). If its trailing
+    segment — the text after the last complete macro — starts with ``{{``,
+    all of it is held: continued in the next chunk it may turn out to be a
+    whole ``{{NAME:...}}`` segment or plain text. Otherwise everything from
+    the last ``{{`` is held in case it is an unfinished macro.
+    """
+    line = chunk.rfind('\n') + 1
+    seg = line
+    for m in MACRO_SPLIT_RE.finditer(chunk, line):
+        seg = m.end()
+    if (seg > line or line == 0) and chunk.startswith('{{', seg):
+        cut = seg
+    else:
+        cut = chunk.rfind('{{', line)
+    if 0 <= cut and len(chunk) - cut <= MACRO_HOLD_MAX:
+        return cut
+    if chunk.endswith('{'):
+        return len(chunk) - 1
+    return len(chunk)
+
+
+def iter_macro_safe(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-cut ``chunks`` so no ``{{COMMAND:...}}`` token straddles two."""
+    held = ''
+    for chunk in chunks:
+        if held:
+            chunk = held + chunk
+        cut = _macro_cut(chunk)
+        held = chunk[cut:]
+        if cut:
+            yield chunk[:cut]
+    if held:
+        yield held
+
+
+def prepare_chunks(
+    chunks: Iterable[str], *, newline_mode: Optional[str], enable_macros: bool
+) -> Iterator[str]:
+    """Sanitize and cut raw chunks for ``PlanCompiler.feed``."""
+    out = iter_sanitized(chunks)
+    mode = newline_mode or 'Standard'
+    if mode == 'Smart Newlines':
+        out = iter_smart_newlines(out)
+    if enable_macros:
+        out = iter_macro_safe(out)
+    # Last: cutting on newlines can't split a macro, but the macro
+    # hold-back can split a line.
+    if mode in ('List Mode', 'Paste Mode', 'Block Mode'):
+        out = iter_line_aligned(out)
+    return out
+
+
+class TextSource:
+    """A typing source read in chunks: a text/binary file object or an
+    iterable of strings.
+
+    Seekable files and re-iterable collections can be replayed once per
+    lap; a one-shot iterator or pipe can be typed once. Bytes are decoded
+    as UTF-8.
+    """
+
+    def __init__(self, source, chunk_size: int = STREAM_CHUNK) -> None:
+        self._source = source
+        self._chunk_size = max(1, int(chunk_size))
+        self._is_file = hasattr(source, 'read')
+        self._start = None
+        if self._is_file:
+            try:
+                if source.seekable():
+                    self._start = source.tell()
+            except Exception:
+                _log_caught('TextSource.__init__@tell')
+                self._start = None
+        self._head: Optional[str] = None
+        self._first_pass = None  # (head, rest) kept for the first open()
+        self._passes = 0
+
+    def rewindable(self) -> bool:
+        if self._is_file:
+            return self._start is not None
+        try:
+            return iter(self._source) is not self._source
+        except TypeError:
+            return False
+
+    def size_hint(self) -> int:
+        """Approximate characters per pass (file size, summed lengths or the
+        source's own ``size_hint()``), or 0."""
+        src = self._source
+        try:
+            if callable(getattr(src, 'size_hint', None)):
+                return int(src.size_hint())
+            if self._is_file:
+                if self._start is None:
+                    return 0
+                return max(0, os.fstat(src.fileno()).st_size - self._start)
+            if isinstance(src, (list, tuple)):
+                return sum(len(c) for c in src)
+        except Exception:
+            _log_caught('TextSource.size_hint')
+        return 0
+
+    def _raw(self) -> Iterator[str]:
+        src = self._source
+        decoder = None
+        if self._is_file:
+            if self._start is not None:
+                src.seek(self._start)
+            pieces = iter(lambda: src.read(self._chunk_size), src.read(0))
+        else:
+            pieces = iter(src)
+        for piece in pieces:
+            if isinstance(piece, (bytes, bytearray)):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                piece = decoder.decode(piece)
+            if piece:
+                yield piece
+        if decoder is not None:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+
+    def peek(self, n: int = PEEK_CHARS) -> str:
+        """Up to ``n`` leading characters, without losing them for typing."""
+        if self._head is None:
+            rest = self._raw()
+            head = []
+            got = 0
+            for piece in rest:
+                head.append(piece)
+                got += len(piece)
+                if got >= n:
+                    break
+            self._head = ''.join(head)
+            self._first_pass = (self._head, rest)
+        return self._head[:n]
+
+    def open(self) -> Optional[Iterator[str]]:
+        """Raw chunks for one pass, or None when the source can't be replayed."""
+        if self._first_pass is not None:
+            head, rest = self._first_pass
+            self._first_pass = None
+            self._passes += 1
+            return self._chain(head, rest)
+        if self._passes and not self.rewindable():
+            return None
+        self._passes += 1
+        return self._raw()
+
+    @staticmethod
+    def _chain(head: str, rest: Iterator[str]) -> Iterator[str]:
+        if head:
+            yield head
+        yield from rest
+
+
+__all__ = [
+    "STREAM_CHUNK",
+    "TextSource",
+    "iter_line_aligned",
+    "iter_macro_safe",
+    "prepare_chunks",
+]
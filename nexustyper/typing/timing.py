@@ -0,0 +1,252 @@
+"""Batched timing model: inter-key delays, mistakes and thinking pauses.
+
+``TimingModel.draw`` generates a whole segment's randomness in one batch
+(NumPy when installed, pure Python otherwise). Draws are stored unscaled,
+so the WPM range and punctuation-pause toggle stay live mid-run, and the
+same constants back the duration estimate (:meth:`TimingModel.overhead_bounds`).
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import List, Optional, Sequence, Tuple
+
+from nexustyper.constants import MISTAKE_CHANCE
+from nexustyper.services.logging_setup import _log_caught
+from nexustyper.typing.plan import F_BOUNDARY, F_BRACKET, F_MISTAKE, F_PUNCT
+
+
+# Beta shape for the delay spread — biases to the middle of the WPM range.
+SPREAD_ALPHA = 2.5
+SPREAD_BETA = 2.5
+# Extra pause ranges (seconds).
+PUNCT_PAUSE = (0.08, 0.15)
+BRACKET_PAUSE = (0.10, 0.30)
+THINKING_PAUSE = (0.12, 0.35)
+# Fat-finger correction: hold after the wrong key, then after backspace.
+MISTAKE_HOLD = (0.10, 0.25)
+MISTAKE_RECOVER = (0.05, 0.15)
+THINKING_PAUSE_CHANCE = 0.04
+# Backspace-and-retype races the next key at high speed, so mistakes are
+# suppressed once the top of the WPM range reaches this.
+MISTAKE_MAX_WPM = 220
+# Floor on any inter-key delay.
+MIN_DELAY = 0.01
+
+_NUMPY = None
+_NUMPY_CHECKED = False
+
+
+def _numpy():
+    """Return the numpy module, or None when it isn't installed."""
+    global _NUMPY, _NUMPY_CHECKED
+    if not _NUMPY_CHECKED:
+        _NUMPY_CHECKED = True
+        try:
+            import numpy  # type: ignore
+            _NUMPY = numpy
+        except Exception:
+            _log_caught('_numpy')
+            _NUMPY = None
+    return _NUMPY
+
+
+def delay_bounds(min_wpm: float, max_wpm: float) -> Tuple[float, float]:
+    """Return ``(min_delay, max_delay)`` seconds per key for a WPM range."""
+    min_wpm = max(1.0, float(min_wpm or 1))
+    max_wpm = max(min_wpm, float(max_wpm or min_wpm))
+    return 60 / (max_wpm * 5), 60 / (min_wpm * 5)
+
+
+class TimingDraw:
+    """Pre-drawn randomness for one batch of keys.
+
+    ``spread[i]`` is the beta fraction of the WPM delay range, ``punct[i]``
+    the punctuation/bracket extra (0.0 if none), ``think[i]`` the thinking
+    pause extra (0.0 if none). ``mistakes`` holds the indices that get a
+    fat-finger correction.
+    """
+
+    __slots__ = ("spread", "punct", "think", "mistakes")
+
+    def __init__(self, spread: List[float], punct: List[float], think: List[float], mistakes: frozenset) -> None:
+        self.spread = spread
+        self.punct = punct
+        self.think = think
+        self.mistakes = mistakes
+
+    def __len__(self) -> int:
+        return len(self.spread)
+
+    def delay(self, i: int, min_d: float, span: float, pause_on_punct: bool) -> float:
+        """Inter-key delay after key ``i`` under the live speed settings."""
+        d = min_d + self.spread[i] * span + self.think[i]
+        if pause_on_punct:
+            d += self.punct[i]
+        return d if d > MIN_DELAY else MIN_DELAY
+
+
+class TimingModel:
+    """Seedable source of humanized timing.
+
+    One instance per run; pass ``seed`` for reproducible runs. The ``rng``
+    attribute is a ``random.Random`` for the rare per-event draws that
+    aren't worth batching (which adjacent key, correction holds).
+    """
+
+    def __init__(
+        self,
+        *,
+        seed: Optional[int] = None,
+        mistake_chance: float = MISTAKE_CHANCE,
+        thinking_pause_chance: float = THINKING_PAUSE_CHANCE,
+    ) -> None:
+        self.mistake_chance = float(mistake_chance)
+        self.thinking_pause_chance = float(thinking_pause_chance)
+        self.rng = random.Random(seed)
+        np = _numpy()
+        self._np_rng = np.random.default_rng(seed) if np is not None else None
+
+    # --- batch generation -----------------------------------------------------
+
+    def draw(self, flags: Sequence[int]) -> TimingDraw:
+        """Draw timing for a batch of keys described by their plan ``F_*`` flags."""
+        n = len(flags)
+        punct_idx = [i for i, f in enumerate(flags) if f & F_PUNCT]
+        bracket_idx = [i for i, f in enumerate(flags) if f & F_BRACKET]
+        boundary_idx = [i for i, f in enumerate(flags) if f & F_BOUNDARY]
+        mistake_idx = [i for i, f in enumerate(flags) if f & F_MISTAKE]
+        if self._np_rng is not None:
+            return self._draw_numpy(n, punct_idx, bracket_idx, boundary_idx, mistake_idx)
+        return self._draw_python(n, punct_idx, bracket_idx, boundary_idx, mistake_idx)
+
+    def _draw_numpy(self, n, punct_idx, bracket_idx, boundary_idx, mistake_idx) -> TimingDraw:
+        np = _numpy()
+        g = self._np_rng
+        spread = g.beta(SPREAD_ALPHA, SPREAD_BETA, n)
+        punct = np.zeros(n)
+        if punct_idx:
+            punct[punct_idx] = g.uniform(*PUNCT_PAUSE, len(punct_idx))
+        if bracket_idx:
+            punct[bracket_idx] = g.uniform(*BRACKET_PAUSE, len(bracket_idx))
+        think = np.zeros(n)
+        hits = self._skip_hits_numpy(len(boundary_idx), self.thinking_pause_chance)
+        if hits:
+            think[[boundary_idx[k] for k in hits]] = g.uniform(*THINKING_PAUSE, len(hits))
+        mistakes = frozenset(
+            mistake_idx[k] for k in self._skip_hits_numpy(len(mistake_idx), self.mistake_chance)
+        )
+        return TimingDraw(spread.tolist(), punct.tolist(), think.tolist(), mistakes)
+
+    def _skip_hits_numpy(self, trials: int, p: float) -> List[int]:
+        """Ordinals of successes among ``trials`` Bernoulli(p) trials."""
+        if trials <= 0 or p <= 0.0:
+            return []
+        if p >= 1.0:
+            return list(range(trials))
+        np = _numpy()
+        g = self._np_rng
+        # Geometric gaps (>= 1) between successes; draw a little more than
+        # the expected count and top up in the rare case it falls short.
+        hits = []
+        pos = -1
+        while True:
+            batch = int(trials * p * 1.5) + 8
+            gaps = g.geometric(p, batch)
+            positions = pos + np.cumsum(gaps)
+            inside = positions[positions < trials]
+            hits.extend(inside.tolist())
+            if len(inside) < batch:
+                return hits
+            pos = int(positions[-1])
+
+    def _draw_python(self, n, punct_idx, bracket_idx, boundary_idx, mistake_idx) -> TimingDraw:
+        r = self.rng
+        betavariate = r.betavariate
+        uniform = r.uniform
+        spread = [betavariate(SPREAD_ALPHA, SPREAD_BETA) for _ in range(n)]
+        punct = [0.0] * n
+        lo, hi = PUNCT_PAUSE
+        for i in punct_idx:
+            punct[i] = uniform(lo, hi)
+        lo, hi = BRACKET_PAUSE
+        for i in bracket_idx:
+            punct[i] = uniform(lo, hi)
+        think = [0.0] * n
+        lo, hi = THINKING_PAUSE
+        for k in self._skip_hits_python(len(boundary_idx), self.thinking_pause_chance):
+            think[boundary_idx[k]] = uniform(lo, hi)
+        mistakes = frozenset(
+            mistake_idx[k] for k in self._skip_hits_python(len(mistake_idx), self.mistake_chance)
+        )
+        return TimingDraw(spread, punct, think, mistakes)
+
+    def _skip_hits_python(self, trials: int, p: float) -> List[int]:
+        """Ordinals of successes among ``trials`` Bernoulli(p) trials.
+
+        Jumps straight to the next success with an inverse-CDF geometric
+        draw: ``floor(log(U) / log(1 - p))`` failures before it.
+        """
+        if trials <= 0 or p <= 0.0:
+            return []
+        if p >= 1.0:
+            return list(range(trials))
+        r = self.rng.random
+        log_q = math.log1p(-p)
+        hits = []
+        pos = -1
+        while True:
+            pos += 1 + int(math.log(1.0 - r()) / log_q)
+            if pos >= trials:
+                return hits
+            hits.append(pos)
+
+    # --- rare per-event draws -------------------------------------------------
+
+    def mistake_holds(self) -> Tuple[float, float]:
+        """``(hold_after_wrong_key, hold_after_backspace)`` for one correction."""
+        return self.rng.uniform(*MISTAKE_HOLD), self.rng.uniform(*MISTAKE_RECOVER)
+
+    @staticmethod
+    def mistakes_active(add_mistakes: bool, max_wpm: float) -> bool:
+        """Whether fat-finger corrections apply under these settings."""
+        return bool(add_mistakes) and (max_wpm or 0) < MISTAKE_MAX_WPM
+
+    # --- estimation -----------------------------------------------------------
+
+    def overhead_bounds(
+        self,
+        *,
+        punct: int,
+        brackets: int,
+        boundaries: int,
+        eligible: int,
+        pause_on_punct: bool,
+        mistakes: bool,
+    ) -> Tuple[float, float]:
+        """Expected ``(lo, hi)`` seconds of extra pauses on top of the spread.
+
+        Counts are keys carrying the corresponding plan flags.
+        """
+        lo = hi = 0.0
+        if pause_on_punct:
+            lo += punct * PUNCT_PAUSE[0] + brackets * BRACKET_PAUSE[0]
+            hi += punct * PUNCT_PAUSE[1] + brackets * BRACKET_PAUSE[1]
+        expected_thinks = boundaries * self.thinking_pause_chance
+        lo += expected_thinks * THINKING_PAUSE[0]
+        hi += expected_thinks * THINKING_PAUSE[1]
+        if mistakes:
+            expected_mistakes = eligible * self.mistake_chance
+            lo += expected_mistakes * (MISTAKE_HOLD[0] + MISTAKE_RECOVER[0])
+            hi += expected_mistakes * (MISTAKE_HOLD[1] + MISTAKE_RECOVER[1])
+        return lo, hi
+
+
+__all__ = [
+    "TimingModel",
+    "TimingDraw",
+    "delay_bounds",
+    "THINKING_PAUSE_CHANCE",
+    "MISTAKE_MAX_WPM",
+]
@@ -0,0 +1,194 @@
+"""ASCII transliteration for the Unicode fallback path.
+
+:data:`TRANSLIT` is a read-only code point -> ASCII table built once at
+import (diacritics stripped, Greek letters named, symbols spelled out,
+``UNMAPPED`` otherwise); :class:`TransliterationReport` tells the user what
+was replaced.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+
+# Stand-in for characters without an ASCII spelling.
+UNMAPPED = '?'
+
+# Blocks transliterated by compatibility decomposition (NFKD) with the
+# combining marks dropped.
+_DECOMPOSED_BLOCKS = (
+    (0x00A0, 0x024F),   # Latin-1 Supplement, Latin Extended-A/B
+    (0x1E00, 0x1EFF),   # Latin Extended Additional
+    (0x2000, 0x209F),   # General Punctuation, super/subscripts
+    (0x2100, 0x218F),   # Letterlike Symbols, Number Forms
+    (0x2460, 0x24FF),   # Enclosed Alphanumerics
+    (0xFB00, 0xFB06),   # Latin ligatures
+    (0xFF01, 0xFF5E),   # full-width ASCII
+)
+
+_GREEK_NAMES = (
+    'alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta',
+    'iota', 'kappa', 'lambda', 'mu', 'nu', 'xi', 'omicron', 'pi', 'rho',
+    'sigma', 'sigma', 'tau', 'upsilon', 'phi', 'chi', 'psi', 'omega',
+)
+
+# Characters NFKD leaves alone or spells badly; these win over it.
+_EXPLICIT = {
+    # Letters without a decomposition.
+    'ß': 'ss', 'ẞ': 'SS', 'Æ': 'AE', 'æ': 'ae', 'Ø': 'O', 'ø': 'o',
+    'Œ': 'OE', 'œ': 'oe', 'Þ': 'Th', 'þ': 'th', 'Ð': 'D', 'ð': 'd',
+    'Đ': 'D', 'đ': 'd', 'Ħ': 'H', 'ħ': 'h', 'ı': 'i', 'Ł': 'L', 'ł': 'l',
+    'Ŋ': 'NG', 'ŋ': 'ng', 'Ŧ': 'T', 'ŧ': 't', 'ĸ': 'q', 'ƒ': 'f',
+    'Ɖ': 'D', 'ɖ': 'd', 'ƀ': 'b', 'Ɨ': 'I', 'ɨ': 'i', 'Ƶ': 'Z', 'ƶ': 'z',
+    'Ǥ': 'G', 'ǥ': 'g', 'ȼ': 'c', 'Ȼ': 'C', 'ŉ': "'n",
+    # Latin-1 symbols.
+    '¡': '!', '¢': 'c', '£': 'GBP', '¤': '$', '¥': 'JPY', '¦': '|',
+    '§': 'S', '¨': '"', '©': '(c)', '«': '<<', '¬': 'not ', '\u00ad': '',
+    '®': '(R)', '¯': '-', '°': ' deg', '±': '+/-', '´': "'", 'µ': 'mu',
+    '¶': 'P', '·': '*', '¸': ',', '»': '>>', '¼': '1/4', '½': '1/2',
+    '¾': '3/4', '¿': '?', '×': 'x', '÷': '/',
+    # Typography.
+    '\u200b': '', '\u200c': '', '\u200d': '', '\u2060': '', '\ufeff': '',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '--', '―': '--',
+    '‘': "'", '’': "'", '‚': ',', '‛': "'", '“': '"', '”': '"', '„': '"',
+    '‟': '"', '‹': '<', '›': '>', '†': '+', '‡': '++', '•': '*', '‣': '*',
+    '◦': '*', '′': "'", '″': '"', '‴': "'''", '‰': ' per mille',
+    '⁄': '/', '€': 'EUR', '₹': 'INR', '₽': 'RUB', '₩': 'KRW', '₺': 'TRY',
+    '℃': 'C', '℉': 'F', '✓': 'v', '✔': 'v', '✗': 'x', '✘': 'x',
+    '★': '*', '☆': '*',
+    # Arrows.
+    '→': '->', '←': '<-', '↔': '<->', '↑': '^', '↓': 'v', '⇒': '=>',
+    '⇐': '<=', '⇔': '<=>', '↦': '|->', '⟶': '-->', '⟵': '<--',
+    '⟹': '==>', '⟸': '<==', '⟺': '<=>',
+    # Math.
+    '∀': 'for all', '∃': 'exists', '∄': 'not exists', '∅': 'empty',
+    '∇': 'nabla', '∂': 'd', '∑': 'sum', '∏': 'prod', '∫': 'int',
+    '∬': 'iint', '∮': 'oint', '√': 'sqrt', '∛': 'cbrt', '∞': 'infty',
+    '≤': '<=', '≥': '>=', '≠': '!=', '≈': '~=', '≅': '~=', '≡': '==',
+    '∼': '~', '∝': ' propto ', '≪': '<<', '≫': '>>', '∓': '-/+',
+    '−': '-', '∗': '*', '∘': 'o', '⋅': '*', '∣': '|', '∥': '||',
+    '∈': ' in ', '∉': ' notin ', '∋': ' ni ', '⊂': ' subset ',
+    '⊆': ' subseteq ', '⊃': ' supset ', '⊇': ' supseteq ', '∪': ' U ',
+    '∩': ' n ', '∧': ' and ', '∨': ' or ', '⊕': ' xor ', '∴': ' therefore ',
+    '∵': ' because ', '⟨': '<', '⟩': '>', '⌊': 'floor(', '⌋': ')',
+    '⌈': 'ceil(', '⌉': ')',
+}
+
+_NON_ASCII_RUN = re.compile(r'[^\x00-\x7f]+')
+
+
+def _strip_marks(ch: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', ch) if not unicodedata.combining(c))
+
+
+def _ascii_spelling(ch: str) -> str:
+    """The NFKD spelling of ``ch`` when it is printable ASCII, else ''."""
+    base = _strip_marks(ch).replace('⁄', '/')
+    if base and base.isascii() and (base.isprintable() or base.isspace()):
+        # Spacing accents (´ ¨ ¸) decompose to a bare space.
+        if base.isspace() and not ch.isspace():
+            return ''
+        return base
+    return ''
+
+
+class _Table(dict):
+    """Code point -> ASCII table; unknown non-ASCII maps to ``UNMAPPED``
+    and ASCII to itself (``str.translate`` leaves it alone)."""
+
+    __slots__ = ()
+
+    def __missing__(self, cp: int) -> str:
+        if cp < 0x80:
+            raise LookupError(cp)
+        return UNMAPPED
+
+
+def _build_table() -> Mapping[int, str]:
+    table: Dict[int, str] = _Table()
+    for lo, hi in _DECOMPOSED_BLOCKS:
+        for cp in range(lo, hi + 1):
+            base = _ascii_spelling(chr(cp))
+            if base:
+                table[cp] = base
+    for cp in range(0x0370, 0x0400):
+        base = _strip_marks(chr(cp))
+        if len(base) != 1:
+            continue
+        index = ord(base.lower()) - 0x03B1
+        if 0 <= index < len(_GREEK_NAMES):
+            name = _GREEK_NAMES[index]
+            table[cp] = name.capitalize() if base.isupper() else name
+    for ch, spelling in _EXPLICIT.items():
+        table[ord(ch)] = spelling
+    return MappingProxyType(table)
+
+
+# Read-only code point -> ASCII spelling; missing non-ASCII keys read as
+# ``UNMAPPED``.
+TRANSLIT: Mapping[int, str] = _build_table()
+
+
+def transliterate(text: str) -> str:
+    """``text`` with every non-ASCII character replaced by its ASCII
+    spelling (``UNMAPPED`` when it has none)."""
+    if text.isascii():
+        return text
+    return text.translate(TRANSLIT)
+
+
+class TransliterationReport:
+    """Which non-ASCII characters a run typed as ASCII, and how often."""
+
+    __slots__ = ('_counts',)
+
+    def __init__(self) -> None:
+        self._counts: Counter = Counter()
+
+    def add(self, text: str) -> None:
+        for run in _NON_ASCII_RUN.findall(text):
+            self._counts.update(run)
+
+    def __bool__(self) -> bool:
+        return bool(self._counts)
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts.values())
+
+    @property
+    def unmapped(self) -> Counter:
+        """Characters typed as ``UNMAPPED``, with counts."""
+        return Counter({ch: n for ch, n in self._counts.items() if ord(ch) not in TRANSLIT})
+
+    def summary(self, limit: int = 5) -> str:
+        """One status line, e.g. ``Typed 12 characters as ASCII (é as 'e'
+        ×8, α as 'alpha' ×3); 1 had no equivalent (☃) and became '?'.``"""
+        if not self._counts:
+            return ""
+        mapped = [(ch, n) for ch, n in self._counts.most_common() if ord(ch) in TRANSLIT]
+        parts = [f"{ch} as '{TRANSLIT[ord(ch)]}' ×{n}" for ch, n in mapped[:limit]]
+        if len(mapped) > limit:
+            parts.append("…")
+        total = self.total
+        line = f"Typed {total} character{'s' if total != 1 else ''} as ASCII"
+        if parts:
+            line += f" ({', '.join(parts)})"
+        missing = self.unmapped
+        if missing:
+            count = sum(missing.values())
+            chars = ''.join(ch for ch, _ in missing.most_common(limit))
+            line += f"; {count} had no equivalent ({chars}) and became '{UNMAPPED}'"
+        return line + "."
+
+
+__all__ = [
+    "UNMAPPED",
+    "TRANSLIT",
+    "TransliterationReport",
+    "transliterate",
+]
@@ -1,10 +1,10 @@
 """TypingWorker — runs the human-like typing loop on a QThread.
 
-This is a near-verbatim extraction of the ``TypingWorker`` class from
-``NexusTyper Pro.py``. The pyqtSignal declarations and the
-``__init__(text, laps, delay, **kwargs)`` signature are byte-identical to
-the original so AutoTyperApp's existing ``connect()`` / construction
-callsites keep working.
+Extracted from the ``TypingWorker`` class in ``NexusTyper Pro.py``; the
+``__init__(text, laps, delay, **kwargs)`` signature is unchanged. Only
+state changes are signalled (``paused_signal``, ``resumed_signal``,
+``finished``, ``update_status``); progress, speed and ETA live in
+``worker.progress``, a ``ProgressCounter`` the UI polls on a timer.
 
 Platform-specific calls (Quartz/AppKit/Win32) are routed through
 ``nexustyper.platform.current()`` instead of ``platform.system() == "Darwin"``
@@ -15,38 +15,95 @@ from __future__ import annotations
 
 import platform as _stdlib_platform
 import random
-import re
 import threading
 import time
+from itertools import islice
+from typing import Optional
 
 import pyautogui
 import pyperclip
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 
 from nexustyper.platform import current as _current_platform
+from nexustyper.platform import focus_watcher as _focus_watcher
 from nexustyper.services.logging_setup import _log_caught, logger
+from nexustyper.services.run_journal import (
+    EV_DONE,
+    EV_ERROR,
+    EV_PAUSED,
+    EV_STOPPED,
+    RunJournal,
+    settings_hash,
+    text_hash,
+)
 from nexustyper.typing.browser import (
     auto_optimize_for_window as _auto_optimize_for_window_helper,
     is_browser_title as _is_browser_title_helper,
     looks_like_code_quick as _looks_like_code_quick_helper,
     normalize_browser_tab_prefix as _normalize_browser_tab_prefix_helper,
 )
+from nexustyper.typing.content_detection import categorize_title
 from nexustyper.typing.keyboard import kbd
 from nexustyper.typing.macros import (
-    MACRO_FULLMATCH_RE,
-    MACRO_SPLIT_RE,
+    ExpandedText,
+    compile_macros,
     execute_macro as _execute_macro_helper,
+    macro_environment,
+    parse_speed,
     strip_macros as _strip_macros_helper,
-    validate_macro as _validate_macro_helper,
 )
 from nexustyper.typing.mistakes import KEY_ADJACENCY
-from nexustyper.typing.sanitize import apply_smart_newlines, sanitize_ai_text
+from nexustyper.typing.plan import (
+    AUTOCOMPLETE_GUARD_CHARS,
+    F_CLIP_HOLD,
+    F_GUARD,
+    F_SHIFT_RUN,
+    OP_BURST,
+    OP_DEDENT,
+    OP_INDENT,
+    OP_LINE_END,
+    OP_MACRO,
+    OP_MACRO_ERROR,
+    OP_NEWLINE,
+    OP_PASTE,
+    OP_SHIFTED,
+    OP_TAB,
+    OP_UNICODE,
+    PASTE_CHUNK_BYTES,
+    PASTE_CHUNK_LINES,
+    SHIFTED_US_SYMBOLS,
+    KeystrokePlan,
+    PlanCompiler,
+    compile_plan,
+    popup_level,
+    plan_settings_key,
+)
+from nexustyper.typing.progress import (
+    STATE_FINISHED,
+    STATE_PAUSED,
+    STATE_RUNNING,
+    ProgressCounter,
+)
+from nexustyper.typing.sanitize import sanitize_ai_text
+from nexustyper.typing.scheduler import KeystrokeScheduler
+from nexustyper.typing.stream import TextSource, prepare_chunks
+from nexustyper.typing.deadline import RESOLVE_INTERVAL, profile_plan, solve_deadline
+from nexustyper.typing.autocomplete import POPUP_HIGH, guard_profile, settle_gap
+from nexustyper.typing.pace import SpeedController, pace_class
+from nexustyper.typing.timing import TimingModel, delay_bounds
+from nexustyper.typing.transliterate import TransliterationReport, transliterate
 
 
 # Mirrors the constant in NexusTyper Pro.py — the worker reads it as a class
 # default so the original behavior is preserved.
 MISTAKE_CHANCE = 0.02
 
+# Keys per timing-model batch; bounds the up-front draw on huge texts.
+TIMING_BATCH = 512
+
+# Settle (seconds) after a batched List Mode indent/outdent.
+INDENT_SETTLE = 0.03
+
 
 # Module-level Windows foreground-window helper kept here so the worker can
 # fall back when ``PLATFORM.active_app_identity()`` doesn't return a stable
@@ -59,11 +116,6 @@ class TypingWorker(QObject):
     resumed_signal = pyqtSignal()
     finished = pyqtSignal()
     update_status = pyqtSignal(str)
-    update_speed = pyqtSignal(float)
-    update_progress = pyqtSignal(int)
-    set_progress_max = pyqtSignal(int)
-    update_etr = pyqtSignal(str)
-    lap_progress = pyqtSignal(int, int)
 
     def __init__(self, text, laps, delay, **kwargs):
         super().__init__()
@@ -72,9 +124,37 @@ class TypingWorker(QObject):
         self._paused = False
         self.pause_event = threading.Event()
         self.pause_event.set()  # Not paused initially
+        # Pause accounting runs on time.monotonic() so wall-clock jumps (NTP,
+        # DST, sleep/wake) can't skew the ETR or the WPM readout.
         self._pause_started_at = None
         self._pause_total = 0.0
+        # Absolute-deadline pacing for every keystroke and interruptible sleep.
+        self._scheduler = KeystrokeScheduler(
+            lambda: self._running, self.pause_event, on_pause=self._yield_input)
+        # True while shift is held across a run of shifted keys (see
+        # _press_shifted_in_run); every exit path releases it.
+        self._shift_held = False
+        # The user's clipboard, saved while a cluster of pastes borrows the
+        # clipboard (F_CLIP_HOLD); put back after the cluster's last paste,
+        # on pause and when the run ends.
+        self._clip_borrowed = False
+        self._clip_original = None
+        # In-process clipboard owner (services.clipboard.ClipboardService);
+        # None falls back to pyperclip.
+        self._clipboard = kwargs.get('clipboard')
+        # Shared foreground watcher (acquired for the duration of run()) and
+        # the event it sets on focus changes; resume()/stop() set it too so
+        # a paused worker sleeps until something actually happens.
+        self._focus = None
+        self._wake = threading.Event()
+        self._auto_resume_armed = False
+        # Focus-snapshot version the guardrails last passed on; while it is
+        # unchanged the per-key check is skipped.
+        self._ready_version = -1
+        # A string, or a text/binary file object or iterable of strings that
+        # is streamed through the text pipeline chunk by chunk.
         self.text_to_type = text
+        self._stream = None
         self.laps = laps
         self.delay = delay
         self.persona = kwargs.get('typing_persona')
@@ -88,6 +168,8 @@ class TypingWorker(QObject):
         self.type_tabs = kwargs.get('type_tabs', True)
         self.min_wpm = kwargs.get('min_wpm')
         self.max_wpm = kwargs.get('max_wpm')
+        # The run's own WPM range while a {{SPEED}} macro overrides it.
+        self._speed_base = None
         self.add_mistakes = kwargs.get('add_mistakes')
         self.pause_on_punct = kwargs.get('pause_on_punct')
         self.enable_mouse_jitter = kwargs.get('mouse_jitter')
@@ -95,12 +177,31 @@ class TypingWorker(QObject):
         self.press_esc = kwargs.get('press_esc', False)
         self.mistake_chance = MISTAKE_CHANCE
         self.thinking_pause_chance = 0.04
-        self._last_ui_update = 0.0
-        try:
-            self._allowed_keys = set(getattr(pyautogui, "KEYBOARD_KEYS", []))
-        except Exception:
-            _log_caught('__init__@L101')
-            self._allowed_keys = set()
+        # Seeds the timing model (delays, mistakes, thinking pauses) for
+        # reproducible runs; None draws from OS entropy.
+        self.timing_seed = kwargs.get('timing_seed')
+        self._timing = None
+        # Closed-loop overhead compensation (see typing/pace.py); per run.
+        self._pace = SpeedController()
+        # Deadline run ("finish in N seconds", 0 = off; see typing/deadline.py):
+        # the WPM range and pause/mistake budget are re-solved as it goes.
+        self.deadline_seconds = float(kwargs.get('deadline_seconds') or 0)
+        self._deadline_at = None
+        self._deadline_due = 0.0
+        self._deadline_range = None
+        self._deadline_profile = None
+        self._deadline_warned = False
+        # Chars done / lap / active time / state, polled by the UI on its own
+        # timer instead of per-keystroke signals.
+        self.progress = ProgressCounter()
+        # Checkpoints (lap + plan offset) so an interrupted run can resume at
+        # the exact keystroke; ``resume_from`` is a RunCheckpoint to continue.
+        self.journal_enabled = kwargs.get('journal', True)
+        self.resume_from = kwargs.get('resume_from')
+        # Directory relative {{INCLUDE}} paths resolve against (None: the
+        # text wasn't opened from a file).
+        self.macro_base_dir = kwargs.get('macro_base_dir')
+        self._journal = RunJournal()
         # New modes
         self.ime_friendly = kwargs.get('ime_friendly', False)
         self.unicode_hex_typing = kwargs.get('unicode_hex_typing', False)
@@ -117,14 +218,35 @@ class TypingWorker(QObject):
             'kbd_rdp_mode',
             'auto' if _stdlib_platform.system() == 'Windows' else 'off',
         )
+        # Native XTest keyboard backend on Linux/X11 (ignored elsewhere).
+        self.kbd_native = kwargs.get('kbd_native', True)
+        # Burst mode ('off', 'word', 'line'): inject printable ASCII a word
+        # or a line per backend call, paced per batch instead of per key.
+        self.burst_mode = kwargs.get('burst_mode', 'off')
+        # Paste Mode chunk budget: lines and UTF-8 bytes per paste.
+        self.paste_chunk_lines = kwargs.get('paste_chunk_lines', PASTE_CHUNK_LINES)
+        self.paste_chunk_bytes = kwargs.get('paste_chunk_bytes', PASTE_CHUNK_BYTES)
+        # Set by auto-optimize when the target is a code editor; Block Mode
+        # then types code blocks in List Mode instead of pasting them.
+        self.code_target = False
         self._resume_settle_until = 0.0
         self._esc_on_next_ready = False
         self._target_is_browser = False
+        # Esc guard thresholds for the target's category, and when the last
+        # key went out.
+        self._guard_profile = guard_profile('unknown')
+        self._last_key_at = 0.0
+        # Active layout's keymap (kbd.load_keymap), None = assume US.
+        self._keymap = None
+        # Characters the ASCII fallback replaced, reported when the run ends.
+        self._transliterated = TransliterationReport()
         self._initial_tab_prefix = ""
         # Tracks the last live-lock state we emitted to the status bar so we
         # only emit on transitions (locked <-> lost-focus) instead of every
         # cycle.
         self._lock_state_emitted = None  # type: ignore[assignment]
+        # Compiled keystroke plan, reused across laps (see _compile_plan).
+        self._plan = None
 
     def _is_browser_title(self, title: str) -> bool:
         return _is_browser_title_helper(title)
@@ -138,132 +260,154 @@ class TypingWorker(QObject):
         tl = (title or "").lower()
         return any(k in tl for k in self.blocked_apps)
 
+    def _focus_snapshot(self):
+        """Current ``(identity, title, version)`` — a memory read while the
+        focus watcher runs, a live platform query otherwise (version 0)."""
+        if self._focus is not None:
+            return self._focus.snapshot()
+        title = self.get_active_window_title() or "Unknown"
+        return _focus_watcher.FocusSnapshot(self.get_active_window_identity() or title, title, 0)
+
+    def _wait_for_wake(self, timeout: float) -> None:
+        """Sleep until focus changes, resume/stop, or ``timeout`` elapses."""
+        self._wake.wait(timeout)
+        self._wake.clear()
+
     def _await_target_window(self):
         """If started from GUI, wait until focus leaves the source app before locking target."""
         if not (self.started_from_gui and self.source_app):
-            return (
-                self.get_active_window_title() or "Unknown",
-                self.get_active_window_identity() or "Unknown",
-            )
+            snap = self._focus_snapshot()
+            return snap.title or "Unknown", snap.identity or "Unknown"
 
         last_hint = 0.0
         while self._running:
-            cur_title = self.get_active_window_title() or "Unknown"
-            cur_identity = self.get_active_window_identity() or cur_title
+            snap = self._focus_snapshot()
+            cur_title = snap.title or "Unknown"
+            cur_identity = snap.identity or cur_title
             if cur_identity != self.source_app:
                 if self._is_title_blocked(cur_title) or self._is_title_blocked(cur_identity):
-                    now = time.time()
+                    now = time.monotonic()
                     if now - last_hint >= 1.0:
                         self.update_status.emit("Compliance mode: blocked app active. Focus an allowed app to start typing…")
                         last_hint = now
                 else:
                     return cur_title, cur_identity
-            now = time.time()
+            now = time.monotonic()
             if now - last_hint >= 1.0:
                 self.update_status.emit("Focus your target app and click the input field… (typing starts when it’s active)")
                 last_hint = now
-            self._sleep_interruptible(0.1)
+            # Woken by the focus watcher; the timeout only paces the hint.
+            self._wait_for_wake(1.0)
         return None, None
 
     def stop(self):
         self._running = False
         # Unblock any waits so the thread can exit promptly.
         self.pause_event.set()
+        self._wake.set()
 
     def pause(self, auto_resume_check=False):
         if not self._paused:
             self._paused = True
             self.pause_event.clear()
-            self._pause_started_at = time.time()
+            self._pause_started_at = time.monotonic()
+            # Auto-resume runs on the worker thread from _wait_until_ready.
+            self._auto_resume_armed = bool(auto_resume_check and self.initial_window_identity)
+            self.progress.set_state(STATE_PAUSED)
+            self._journal.flush(EV_PAUSED)
             self.paused_signal.emit()
-            if auto_resume_check and self.initial_window_identity:
-                threading.Thread(target=self._auto_resume_checker, daemon=True).start()
 
     def resume(self):
         if self._paused:
             self._paused = False
             if self._pause_started_at is not None:
                 try:
-                    self._pause_total += max(0.0, time.time() - self._pause_started_at)
+                    self._pause_total += max(0.0, time.monotonic() - self._pause_started_at)
                 except Exception:
                     _log_caught('resume@L187')
                     pass
                 self._pause_started_at = None
             # Give the OS/app a short moment to settle focus after resume.
             try:
-                self._resume_settle_until = time.time() + 0.25
+                self._resume_settle_until = time.monotonic() + 0.25
             except Exception:
                 _log_caught('resume@L193')
                 self._resume_settle_until = 0.0
+            # Don't let the next keystroke try to "catch up" the paused time.
+            self._scheduler.rebase()
+            # The pause ate into a deadline run's time: re-plan now.
+            self._deadline_due = 0.0
             # Dismiss autocomplete popups on resume (for IDEs) when enabled.
             if self.press_esc and not self._target_is_browser:
                 self._esc_on_next_ready = True
+            self._auto_resume_armed = False
             self.pause_event.set()
+            self._wake.set()
+            self.progress.set_state(STATE_RUNNING)
             self.resumed_signal.emit()
 
     def _current_pause_total(self) -> float:
         try:
             if self._pause_started_at is not None:
-                return self._pause_total + max(0.0, time.time() - self._pause_started_at)
+                return self._pause_total + max(0.0, time.monotonic() - self._pause_started_at)
         except Exception:
             _log_caught('_current_pause_total@L205')
             pass
         return self._pause_total
 
     def _auto_resume_checker(self):
-        """Monitors active window and resumes typing if focus returns.
+        """Resume typing once focus returns to the locked target.
 
-        Sleeps in short slices and rechecks ``self._running`` between each
-        slice so a stop signal lands within ~50 ms instead of up to a full
-        second. Prevents the checker from calling ``self.resume()`` after
-        the worker has already been torn down.
+        Runs on the worker thread while an auto-pause is armed (see
+        ``_wait_until_ready``) and sleeps on ``self._wake``, which the focus
+        watcher sets on every foreground change and resume()/stop() set on
+        their way out — no polling thread per pause. Returns when the
+        worker is resumed or stopped.
         """
-        def _short_sleep(total: float) -> bool:
-            """Sleep up to ``total`` seconds, breaking early if stopped or unpaused.
-            Returns True if the loop should continue, False to exit."""
-            end = time.time() + max(0.0, total)
-            while time.time() < end:
-                if not (self._paused and self._running):
+        def _still_paused() -> bool:
+            return self._paused and self._running
+
+        def _hold(total: float) -> bool:
+            """Wait ``total`` seconds while focus stays on target.
+            Returns False if focus left, or the worker resumed/stopped."""
+            end = time.monotonic() + max(0.0, total)
+            while _still_paused():
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return True
+                self._wait_for_wake(remaining)
+                snap = self._focus_snapshot()
+                if not self._lock_matches(snap.identity, snap.title):
                     return False
-                time.sleep(0.05)
-            return True
+            return False
 
-        if not _short_sleep(0.5):  # Prevent instant resume on quick window switches
-            return
-        while self._paused and self._running:
+        # Prevent instant resume on quick window switches.
+        end = time.monotonic() + 0.5
+        while _still_paused() and time.monotonic() < end:
+            self._wait_for_wake(end - time.monotonic())
+        while _still_paused():
             try:
-                if self._lock_matches(
-                    self.get_active_window_identity(),
-                    self.get_active_window_title(),
-                ):
+                snap = self._focus_snapshot()
+                if self._lock_matches(snap.identity, snap.title):
                     # Grace period to avoid missing text when focus returns.
                     for i in range(4, 0, -1):
-                        if not (self._paused and self._running):
-                            return
-                        if not self._lock_matches(
-                            self.get_active_window_identity(),
-                            self.get_active_window_title(),
-                        ):
-                            break
                         try:
                             self.update_status.emit(f"Resuming in {i}…")
                         except Exception:
                             _log_caught('_auto_resume_checker@L246')
                             pass
-                        if not _short_sleep(1.0):
-                            return
-                    else:
-                        if self._lock_matches(
-                            self.get_active_window_identity(),
-                            self.get_active_window_title(),
-                        ):
-                            self.resume()
+                        if not _hold(1.0):
                             break
+                    else:
+                        self.resume()
+                        return
+                    continue
             except Exception:
                 _log_caught('_auto_resume_checker@L257')
                 pass  # Ignore errors (e.g., window closed)
-            if not _short_sleep(0.2):
-                return
+            # Off target: sleep until the foreground changes. The timeout is
+            # a safety net in case the watcher isn't running.
+            self._wait_for_wake(0.5)
 
     def get_active_window_title(self):
         # Use the platform's per-window title (changes on tab/window switch)
@@ -327,8 +471,76 @@ class TypingWorker(QObject):
             pass
 
     def update_speed_range(self, min_wpm, max_wpm):
+        # A slider change wins over a {{SPEED}} override until the next one.
+        self._speed_base = None
         self.min_wpm = min_wpm
         self.max_wpm = max_wpm
+        if self._deadline_at is not None:
+            # New shape for the deadline solver; re-solve on the next key.
+            self._deadline_range = (min_wpm, max_wpm)
+            self._deadline_due = 0.0
+
+    def _profile_deadline(self, plan, chars_completed):
+        """Profile a plan about to run and re-solve the deadline pacing."""
+        if plan.output_chars:
+            self._deadline_profile = profile_plan(plan)
+        self._resolve_deadline(chars_completed)
+
+    def _resolve_deadline(self, chars_completed):
+        """Re-solve the WPM range and pause/mistake budget so the rest of
+        the run lands on the deadline."""
+        now = time.monotonic()
+        self._deadline_due = now + RESOLVE_INTERVAL
+        profile = self._deadline_profile
+        if profile is None:
+            return
+        lo, hi = self._deadline_range
+        solution = solve_deadline(
+            profile,
+            self.progress.total - chars_completed,
+            self._deadline_at - now,
+            (lo, hi),
+            pause_on_punct=self.pause_on_punct,
+            mistakes=TimingModel.mistakes_active(self.add_mistakes, hi),
+            thinking_chance=self.thinking_pause_chance,
+            mistake_chance=self.mistake_chance,
+        )
+        if solution is None:
+            return
+        wpm_range = (solution.min_wpm, solution.max_wpm)
+        if self._speed_base is not None:
+            # A {{SPEED}} span keeps its own range; the solved one applies
+            # once it ends.
+            self._speed_base = wpm_range
+        else:
+            self.min_wpm, self.max_wpm = wpm_range
+        scale = solution.extras_scale
+        self._timing.thinking_pause_chance = self.thinking_pause_chance * scale
+        self._timing.mistake_chance = self.mistake_chance * min(1.0, scale)
+        if not solution.feasible and not self._deadline_warned:
+            self._deadline_warned = True
+            self.update_status.emit(
+                f"Deadline can't be met; typing at up to {solution.max_wpm} WPM with no pauses.")
+
+    def _apply_speed(self, wpm_range):
+        """Switch to a SPEED macro's ``(min_wpm, max_wpm)``, or back to the
+        run's own range when ``wpm_range`` is None."""
+        if wpm_range is None:
+            if self._speed_base is not None:
+                self.min_wpm, self.max_wpm = self._speed_base
+                self._speed_base = None
+            return
+        if self._speed_base is None:
+            self._speed_base = (self.min_wpm, self.max_wpm)
+        self.min_wpm, self.max_wpm = wpm_range
+
+    def _replay_speed(self, plan, start):
+        """Re-apply the SPEED override in effect before event ``start``, for
+        a run resumed mid-plan."""
+        for op, arg, _char, _weight, _flags in reversed(plan.events[:start]):
+            if op == OP_MACRO and arg[0] == 'SPEED':
+                self._apply_speed(parse_speed(arg[1]))
+                return
 
     def execute_macro(self, command, params):
         try:
@@ -336,6 +548,7 @@ class TypingWorker(QObject):
                 command,
                 params,
                 sleep_fn=self._sleep_interruptible,
+                speed_fn=self._apply_speed,
             )
         except Exception as e:
             error_message = f"Macro execution failed: {e}"
@@ -346,105 +559,149 @@ class TypingWorker(QObject):
             self.update_status.emit(error_message)
 
     def validate_macro(self, command, params):
-        try:
-            screen_size = pyautogui.size()
-        except Exception:
-            _log_caught('validate_macro@L340')
-            screen_size = None
-        return _validate_macro_helper(
-            command,
-            params,
-            allowed_keys=self._allowed_keys,
-            screen_size=screen_size,
-        )
+        return macro_environment().validate(command, params)
 
     def _strip_macros(self, text: str) -> str:
         if not self.enable_macros:
             return text
         return _strip_macros_helper(text)
 
-    def _compute_total_chars_per_lap(self, text_content: str) -> int:
-        if not text_content:
-            return 0
-        mode = self.newline_mode or 'Standard'
-        if mode == 'Paste Mode':
-            # Paste Mode outputs the text minus macros; tabs are preserved.
-            return len(self._strip_macros(text_content))
-        if mode == 'List Mode':
-            # List Mode: strip leading whitespace per line, do not preserve tab characters,
-            # execute macros (so they're not output), and always send an Enter after each line.
-            lines = text_content.splitlines()
-            total = 0
-            for line in lines:
-                stripped = line.lstrip(' \t')
-                if not self.type_tabs:
-                    stripped = stripped.replace('\t', '')
-                stripped = self._strip_macros(stripped)
-                total += len(stripped)
-            total += len(lines)  # Enter after each line
-            return total
-        # Standard/Smart modes: remove macros; optionally skip tabs.
-        processed = apply_smart_newlines(text_content) if mode == 'Smart Newlines' else text_content
-        processed = self._strip_macros(processed)
-        if not self.type_tabs:
-            processed = processed.replace('\t', '')
-        return len(processed)
+    def _plan_options(self):
+        return dict(
+            newline_mode=self.newline_mode,
+            type_tabs=self.type_tabs,
+            enable_macros=self.enable_macros,
+            ime_friendly=self.ime_friendly,
+            unicode_hex_typing=self.unicode_hex_typing,
+            burst=self.burst_mode,
+            code_target=self.code_target,
+            paste_chunk_lines=self.paste_chunk_lines,
+            paste_chunk_bytes=self.paste_chunk_bytes,
+        )
+
+    def _plan_key(self):
+        return plan_settings_key(**self._plan_options())
+
+    def _compile_plan(self, text_content: str):
+        """Compile (or reuse) the keystroke plan for the current settings.
+
+        Runtime setting changes made while paused only invalidate the plan
+        when they change what gets emitted; the worker checks at each lap
+        start so the remaining laps pick them up.
+        """
+        key = self._plan_key()
+        if self._plan is None or self._plan.key != key:
+            self._plan = compile_plan(
+                text_content, macro_env=macro_environment(), **self._plan_options())
+        return self._plan
+
+    def _execute_stream(self, overall_start_time, chars_completed, start=0):
+        """One lap over a streamed source: read, sanitize, compile and type
+        it chunk by chunk so only a chunk's worth of text and events is held.
+
+        ``start`` is a journaled offset into the lap's events. The compiled
+        event sequence doesn't depend on where the chunks are cut, so a
+        resumed lap compiles and skips the chunks before it without typing.
+
+        Returns ``(chars_completed, still_running)``.
+        """
+        chunks = self._stream.open()
+        if chunks is None:
+            return chars_completed, True
+        compiler = PlanCompiler(macro_env=macro_environment(), **self._plan_options())
+
+        def chunk_events():
+            for text in prepare_chunks(chunks, newline_mode=self.newline_mode, enable_macros=self.enable_macros):
+                yield compiler.feed(text)
+            yield compiler.finish()
+
+        base = 0
+        for events in chunk_events():
+            plan = KeystrokePlan(events, compiler.key)
+            n = len(events)
+            skip = min(n, max(0, start - base))
+            if skip:
+                self._replay_speed(plan, skip)
+            if skip < n:
+                chars_completed, still_running = self._execute_plan(
+                    plan, overall_start_time, chars_completed, skip, base)
+                if not still_running:
+                    return chars_completed, False
+            base += n
+        return chars_completed, True
+
+    def _sample_text(self) -> str:
+        """The text to type, or the start of a streamed source, for content heuristics."""
+        if self._stream is not None:
+            return self._stream.peek()
+        return self.text_to_type or ""
 
     def _elapsed_active(self, overall_start_time: float) -> float:
         try:
-            return max(0.0, (time.time() - overall_start_time) - self._current_pause_total())
+            return max(0.0, (time.monotonic() - overall_start_time) - self._current_pause_total())
         except Exception:
             _log_caught('_elapsed_active@L384')
-            return max(0.0, time.time() - overall_start_time)
-
-    def _maybe_emit_progress(self, overall_start_time: float, chars_completed: int, total_chars_overall: int):
-        now = time.time()
-        if (now - self._last_ui_update) < 0.05 and chars_completed < total_chars_overall:
-            return
-        self.update_progress.emit(chars_completed)
-        elapsed = self._elapsed_active(overall_start_time)
-        if elapsed > 0 and chars_completed > 0:
-            cpm = (chars_completed / elapsed) * 60
-            self.update_speed.emit(cpm / 5)
-            if total_chars_overall > 0 and cpm > 0:
-                etr_seconds = ((total_chars_overall - chars_completed) / cpm) * 60
-                self.update_etr.emit(f"ETR: {time.strftime('%M:%S', time.gmtime(max(0.0, etr_seconds)))}")
-        self._last_ui_update = now
+            return max(0.0, time.monotonic() - overall_start_time)
+
+    def _publish_progress(self, overall_start_time: float, chars_completed: int, offset: int) -> None:
+        """``offset``: plan events completed so far in the current lap."""
+        progress = self.progress
+        progress.advance(chars_completed, self._elapsed_active(overall_start_time))
+        pace = self._pace
+        progress.set_pace(pace.target_wpm, pace.achieved_wpm)
+        if self._deadline_at is not None and time.monotonic() >= self._deadline_due:
+            self._resolve_deadline(chars_completed)
+        self._journal.note(self.progress.lap, offset, chars_completed)
 
     def _wait_until_ready(self) -> bool:
-        """Blocks while paused or while guardrails require auto-pausing."""
+        """Blocks while paused or while guardrails require auto-pausing.
+
+        The guardrails read the focus watcher's snapshot and only re-run
+        when its version moved, so on the common path this is a couple of
+        attribute reads per key.
+        """
         while self._running:
-            # Honor explicit pauses first.
-            self.pause_event.wait()
+            # Honor explicit pauses first; auto-pauses wait for focus to
+            # come back on this thread.
+            if not self.pause_event.is_set():
+                self._yield_input()
+                if self._auto_resume_armed:
+                    self._auto_resume_checker()
+                else:
+                    self.pause_event.wait()
+                continue
             if not self._running:
                 return False
 
-            title = self.get_active_window_title() or ""
-            identity = self.get_active_window_identity() or title
-
-            # Compliance guardrail
-            if self.compliance_mode:
-                tl = title.lower()
-                il = identity.lower()
-                if any(k in tl or k in il for k in self.blocked_apps):
+            snap = self._focus_snapshot()
+            if not snap.version or snap.version != self._ready_version:
+                title = snap.title or ""
+                identity = snap.identity or title
+
+                # Compliance guardrail
+                if self.compliance_mode:
+                    tl = title.lower()
+                    il = identity.lower()
+                    if any(k in tl or k in il for k in self.blocked_apps):
+                        if not self._paused:
+                            self.update_status.emit("Compliance mode: blocked app active. Pausing...")
+                            self.pause(auto_resume_check=True)
+                        continue
+
+                # Focus lock guardrail (HWND identity + browser tab-prefix).
+                if self.initial_window_identity and not self._lock_matches(identity, title):
+                    self._emit_lock_state(False, title)
                     if not self._paused:
-                        self.update_status.emit("Compliance mode: blocked app active. Pausing...")
                         self.pause(auto_resume_check=True)
                     continue
-
-            # Focus lock guardrail (HWND identity + browser tab-prefix).
-            if self.initial_window_identity and not self._lock_matches(identity, title):
-                self._emit_lock_state(False, title)
-                if not self._paused:
-                    self.pause(auto_resume_check=True)
-                continue
-            # Focus is held — refresh the live status if it just returned.
-            self._emit_lock_state(True, title)
+                # Focus is held — refresh the live status if it just returned.
+                self._emit_lock_state(True, title)
+                self._ready_version = snap.version
 
             # Post-resume settle delay (prevents dropped keystrokes in some apps).
             try:
-                if self._resume_settle_until and time.time() < self._resume_settle_until:
-                    self._sleep_interruptible(max(0.0, self._resume_settle_until - time.time()))
+                if self._resume_settle_until and time.monotonic() < self._resume_settle_until:
+                    self._sleep_interruptible(max(0.0, self._resume_settle_until - time.monotonic()))
                 self._resume_settle_until = 0.0
             except Exception:
                 _log_caught('_wait_until_ready@L436')
@@ -465,25 +722,14 @@ class TypingWorker(QObject):
         return False
 
     def _sleep_interruptible(self, duration):
-        """Sleep in small chunks while honoring stop/pause.
+        """Sleep while honoring stop/pause; paused time isn't billed.
 
-        Tracks remaining time *as duration*, not as an absolute deadline,
-        so a long pause doesn't make the function return immediately on
-        resume (which would drop the inter-keystroke delay).
+        For intentional waits (settle delays, macro PAUSE, mistake
+        corrections). Rebases the keystroke schedule afterwards so the next
+        key doesn't try to win this time back. Inter-key pacing goes
+        through ``self._scheduler.wait_next`` instead.
         """
-        remaining = max(0.0, duration)
-        last_tick = time.time()
-        while self._running and remaining > 0:
-            if not self.pause_event.is_set():
-                # Block during pauses without busy-waiting; don't bill the
-                # paused interval against the remaining budget.
-                self.pause_event.wait(timeout=0.1)
-                last_tick = time.time()
-                continue
-            slice_ = min(0.02, remaining)
-            time.sleep(max(0.0, slice_))
-            remaining -= time.time() - last_tick
-            last_tick = time.time()
+        self._scheduler.sleep(duration)
 
     def _mouse_jitter_thread(self):
         # Moves mouse slightly at random intervals to simulate activity
@@ -528,20 +774,50 @@ class TypingWorker(QObject):
                 time.sleep(0.3)
             time.sleep(random.uniform(0.5, 3))
 
-    def _paste_text(self, text):
-        original_clip = None
-        try:
-            original_clip = pyperclip.paste()
-        except Exception:
-            _log_caught('_paste_text@L516')
-            original_clip = None
+    def _clip_get(self):
+        svc = self._clipboard
+        if svc is not None:
+            text = svc.text()
+            if text is not None:
+                return text
+        return pyperclip.paste()
+
+    def _clip_set(self, text):
+        """Put ``text`` on the clipboard; True when the in-process service
+        owns it (and can tell when the target fetched it)."""
+        svc = self._clipboard
+        if svc is not None and svc.set_text(text):
+            return True
+        pyperclip.copy(text)
+        return False
+
+    def _paste_text(self, text, hold=False, settle=(0.0, 0.0)):
+        """Paste ``text`` via the clipboard, then wait for the target to
+        take it: until it fetched the data when the clipboard service can
+        see that, else a random ``settle`` time. With ``hold`` the user's
+        clipboard stays saved for the next paste instead of being restored
+        now (see ``_restore_clipboard``)."""
+        if not self._clip_borrowed:
+            try:
+                self._clip_original = self._clip_get()
+            except Exception:
+                _log_caught('_paste_text@L516')
+                self._clip_original = None
+            self._clip_borrowed = True
         try:
-            pyperclip.copy(text)
+            tracked = self._clip_set(text)
+            if tracked:
+                self._clipboard.expect_fetch()
             # Route the paste shortcut through the keyboard shim so it
             # propagates through Chrome Remote Desktop / RDP / AnyDesk in
             # RDP-compat mode. macOS uses Cmd+V, everything else Ctrl+V.
             modifier = 'command' if self._platform.name == 'macos' else 'ctrl'
             kbd.hotkey(modifier, 'v')
+            wait = random.uniform(*settle)
+            if tracked and self._clipboard.wait_fetched(wait):
+                self._scheduler.rebase()
+            else:
+                self._sleep_interruptible(wait)
             return True
         except Exception as e:
             # Fallback: type the text if paste/hotkey fails.
@@ -561,14 +837,26 @@ class TypingWorker(QObject):
                     pass
                 return False
         finally:
-            if original_clip is not None:
-                try:
-                    pyperclip.copy(original_clip)
-                except Exception:
-                    _log_caught('_paste_text@L545')
-                    pass
+            if not hold:
+                self._restore_clipboard()
 
-    def _type_unicode_char_macos(self, ch: str):
+    def _restore_clipboard(self):
+        if not self._clip_borrowed:
+            return
+        original, self._clip_original = self._clip_original, None
+        self._clip_borrowed = False
+        if original is not None:
+            try:
+                self._clip_set(original)
+            except Exception:
+                _log_caught('_paste_text@L545')
+
+    def _yield_input(self):
+        """On pause: release a held shift and give the clipboard back."""
+        self._release_held_shift()
+        self._restore_clipboard()
+
+    def _type_unicode_char_macos(self, ch: str, spelling: Optional[str] = None):
         """Types a single Unicode character via the platform layer.
 
         On macOS this routes through Unicode Hex Input (Option+Hex) — the user
@@ -576,43 +864,20 @@ class TypingWorker(QObject):
         False and we fall back to the ASCII transliteration table.
         """
         if not self._platform.type_unicode_char(ch):
-            self._type_with_ascii_fallback(ch)
-
-    def _type_with_ascii_fallback(self, ch: str):
-        mapping = {
-            '∀': 'for all', '∃': 'exists', '∑': 'sum', '∫': 'int', '√': 'sqrt', '∞': 'infty',
-            '≤': '<=', '≥': '>=', '≠': '!=', '≈': '~=', '→': '->', '←': '<-', '↔': '<->', '·': '*',
-            '×': '*', '÷': '/', '∈': ' in ', '∉': ' notin ', '⊂': ' subset ', '⊆': ' subseteq ', '∪': ' U ', '∩': ' n ',
-            'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon', 'θ': 'theta', 'λ': 'lambda', 'µ': 'mu',
-            'π': 'pi', 'σ': 'sigma', 'ω': 'omega', 'ℝ': 'R', '′': "'", '″': '"'
-        }
-        out = mapping.get(ch, '?')
-        kbd.typewrite(out, interval=0.002)
-
-    _SHIFTED_US_SYMBOLS = {
-        '!': '1',
-        '@': '2',
-        '#': '3',
-        '$': '4',
-        '%': '5',
-        '^': '6',
-        '&': '7',
-        '*': '8',
-        '(': '9',
-        ')': '0',
-        '_': '-',
-        '+': '=',
-        '{': '[',
-        '}': ']',
-        '|': '\\',
-        ':': ';',
-        '"': "'",
-        '<': ',',
-        '>': '.',
-        '?': '/',
-        '~': '`',
-    }
-    _AUTOCOMPLETE_GUARD_CHARS = set("()[]{}.,;:=#\"'")
+            self._type_with_ascii_fallback(ch, spelling)
+
+    def _type_with_ascii_fallback(self, ch: str, spelling: Optional[str] = None):
+        """Type ``ch``'s ASCII spelling (precomputed by the plan when
+        given) in one batch and note it in the run's transliteration report."""
+        out = transliterate(ch) if spelling is None else spelling
+        self._transliterated.add(ch)
+        if out:
+            kbd.type_batch(out)
+
+    # Kept as class attributes for callers that still reach for them; the
+    # plan compiler owns the tables.
+    _SHIFTED_US_SYMBOLS = SHIFTED_US_SYMBOLS
+    _AUTOCOMPLETE_GUARD_CHARS = AUTOCOMPLETE_GUARD_CHARS
 
     def _dismiss_autocomplete_popup(self, strong: bool = True):
         """Best-effort: close editor autocomplete/popups.
@@ -621,6 +886,7 @@ class TypingWorker(QObject):
         """
         if not self.press_esc or self._target_is_browser:
             return
+        self._release_held_shift()
         presses = 2 if strong else 1
         delay = 0.06 if strong else 0.02
         # Many editors need a tiny delay after Esc so the next key doesn't accept a suggestion.
@@ -632,23 +898,23 @@ class TypingWorker(QObject):
                 break
             self._sleep_interruptible(delay)
 
-    def _indent_level_for_list_mode(self, line: str) -> int:
-        """Return indentation level (approx, 4 spaces per level) for List Mode."""
-        try:
-            tab_count = 0
-            space_count = 0
-            for ch in (line or ""):
-                if ch == '\t':
-                    tab_count += 1
-                    continue
-                if ch == ' ':
-                    space_count += 1
-                    continue
-                break
-            return max(0, (tab_count * 4 + space_count) // 4)
-        except Exception:
-            _log_caught('_indent_level_for_list_mode@L625')
-            return 0
+    def _guard_popup(self, flags: int, newline: bool = False) -> None:
+        """Esc guard before a key that could accept an editor suggestion.
+
+        Dismisses only when the plan's popup likelihood (raised by one after
+        a pause well beyond the current pace) reaches the target category's
+        ``GuardProfile`` threshold; see ``nexustyper.typing.autocomplete``.
+        """
+        if not self.press_esc or self._target_is_browser:
+            return
+        level = popup_level(flags)
+        if level and time.monotonic() - self._last_key_at >= settle_gap(
+                *delay_bounds(self.min_wpm, self.max_wpm)):
+            level = min(POPUP_HIGH, level + 1)
+        profile = self._guard_profile
+        if level < (profile.newline if newline else profile.guard):
+            return
+        self._dismiss_autocomplete_popup(strong=newline and level >= profile.strong)
 
     def _release_modifiers_best_effort(self):
         # Clear any "stuck" modifiers which can cause shifted symbols to mis-type.
@@ -698,18 +964,41 @@ class TypingWorker(QObject):
                 pass
             return False
 
-    def _maybe_dismiss_autocomplete_before_char(self, ch: str, prev_char: str):
-        if not self.press_esc or self._target_is_browser:
-            return
-        if not ch:
-            return
-        # Tab is especially risky in VS Code (can accept suggestions).
-        if ch == '\t':
-            self._dismiss_autocomplete_popup(strong=False)
+    def _press_shifted_in_run(self, base: str, hold: bool) -> bool:
+        """Shifted key that may share one shift press with its neighbours.
+
+        Shift goes down before the first key of a run and stays down while
+        ``hold`` (the plan's ``F_SHIFT_RUN``) says the next key is shifted
+        too, so a run of N shifted keys costs 2N + 2 events instead of 4N.
+        """
+        try:
+            if not self._shift_held:
+                kbd.keyDown("shift")
+                self._shift_held = True
+            kbd.keyDown(base)
+            kbd.keyUp(base)
+        except Exception:
+            _log_caught('_press_shifted_in_run')
+            self._release_held_shift()
+            return False
+        if not hold:
+            self._release_held_shift()
+        return True
+
+    def _layout_shift_ok(self, ch: str, base: str) -> bool:
+        """Whether ``ch`` is Shift + its US base key on the active layout."""
+        keymap = self._keymap
+        return keymap is None or keymap.us_shift_ok(ch, base)
+
+    def _release_held_shift(self) -> None:
+        """Release shift if a shifted run is holding it. Safe to call anytime."""
+        if not self._shift_held:
             return
-        # If we're mid-identifier, punctuation can "commit" a suggestion in editors like VS Code.
-        if prev_char and (prev_char.isalnum() or prev_char == '_') and ch in self._AUTOCOMPLETE_GUARD_CHARS:
-            self._dismiss_autocomplete_popup(strong=False)
+        self._shift_held = False
+        try:
+            kbd.keyUp("shift")
+        except Exception:
+            _log_caught('_release_held_shift')
 
     def _type_character(self, ch: str) -> bool:
         """Type a single character with extra guardrails for code editors."""
@@ -725,11 +1014,11 @@ class TypingWorker(QObject):
                 except Exception:
                     _log_caught('_type_character@L696')
                     return False
-        if ch in self._SHIFTED_US_SYMBOLS:
+        if ch in self._SHIFTED_US_SYMBOLS and self._layout_shift_ok(ch, self._SHIFTED_US_SYMBOLS[ch]):
             return self._type_shifted_symbol_us(ch)
         # Route uppercase A-Z through explicit shift handling too; typewrite
         # races shift internally the same way hotkey does.
-        if len(ch) == 1 and ch.isascii() and ch.isalpha() and ch.isupper():
+        if len(ch) == 1 and ch.isascii() and ch.isalpha() and ch.isupper() and self._layout_shift_ok(ch, ch.lower()):
             return self._type_shifted_letter(ch)
         try:
             kbd.typewrite(ch, interval=0.0)
@@ -738,90 +1027,254 @@ class TypingWorker(QObject):
             _log_caught('_type_character@L707')
             return False
 
-    def _type_segment(self, segment, overall_start_time, chars_completed, total_chars_overall):
-        # Types a segment of text with human-like behavior, preserving code formatting
-        prev_char = ''
-        for char in segment:
-            if char == '\t' and not self.type_tabs:
-                continue  # Skip this character and go to the next one
+    def _shift_indent(self, steps: int) -> bool:
+        """List Mode indent (``steps`` > 0, Tab) or outdent (< 0,
+        Shift+Tab), injected as one backend batch with one settle."""
+        keys = ('tab',) if steps > 0 else ('shift', 'tab')
+        count = abs(steps)
+        if not count:
+            return True
+        if not self._wait_until_ready():
+            return False
+        try:
+            kbd.repeat_hotkey(keys, count)
+        except Exception:
+            # Fallback: explicit down/up per step so a batching
+            # incompatibility doesn't kill the indent. try/finally
+            # guarantees shift is released even if press('tab') raises
+            # mid-flight, which otherwise leaves shift latched and corrupts
+            # every subsequent keystroke.
+            _log_caught('_shift_indent')
+            for _ in range(count):
+                try:
+                    if steps > 0:
+                        kbd.press('tab')
+                        continue
+                    kbd.keyDown('shift')
+                    try:
+                        kbd.press('tab')
+                    finally:
+                        kbd.keyUp('shift')
+                except Exception:
+                    _log_caught('_shift_indent')
+                    break
+        self._sleep_interruptible(INDENT_SETTLE)
+        return True
+
+    def _emit_typed_event(self, op, arg, char, flags) -> None:
+        """Emit one typed plan event through the keyboard shim."""
+        if op == OP_NEWLINE:
+            self._guard_popup(flags, newline=True)
+            if self.use_shift_enter:
+                kbd.hotkey('shift', 'enter')
+            else:
+                kbd.press('enter')
+            return
+        if op == OP_UNICODE:
+            # Type non-ASCII via macOS Unicode Hex Input if enabled.
+            if self._platform.name == 'macos':
+                self._type_unicode_char_macos(char, arg)
+            else:
+                self._type_with_ascii_fallback(char, arg)
+            return
+        if flags & F_GUARD:
+            # Tab, or punctuation right after an identifier char: both can
+            # commit an editor suggestion (VS Code especially).
+            self._guard_popup(flags)
+        if op == OP_SHIFTED and not self._layout_shift_ok(char, arg):
+            # Not Shift + the US base key on this layout (e.g. '@' on
+            # German): the backend types it from the layout's keymap.
+            self._release_held_shift()
+            try:
+                kbd.typewrite(char, interval=0.0)
+                ok = True
+            except Exception:
+                _log_caught('_emit_typed_event')
+                ok = False
+        elif op == OP_SHIFTED:
+            ok = self._press_shifted_in_run(arg, bool(flags & F_SHIFT_RUN))
+        elif op == OP_TAB:
+            ok = self._type_character('\t')
+        else:
+            try:
+                kbd.typewrite(arg, interval=0.0)
+                ok = True
+            except Exception:
+                _log_caught('_emit_typed_event')
+                ok = False
+        if not ok:
+            kbd.typewrite(char, interval=0.01)
+
+    def _emit_burst(self, text, flags) -> None:
+        """Inject one burst-mode batch with a single ``kbd.type_batch`` call."""
+        if flags & F_GUARD:
+            self._guard_popup(flags)
+        try:
+            kbd.type_batch(text)
+        except Exception:
+            _log_caught('_emit_burst')
+            kbd.typewrite(text, interval=0.01)
+
+    def _execute_plan(self, plan, overall_start_time, chars_completed, start=0, base=0):
+        """Replay a compiled plan from event ``start``: wait, emit, advance.
+
+        Delay spread, mistakes and thinking pauses come from the timing
+        model in batches of ``TIMING_BATCH`` events; the WPM range and the
+        punctuation/mistake toggles are applied live per key. ``base`` is
+        the lap offset of the plan's first event (a streamed chunk's plan
+        starts after the events of the chunks before it).
+
+        Returns ``(chars_completed, still_running)``.
+        """
+        timing = self._timing
+        pace = self._pace
+        all_flags = plan.flags
+        journal = self._journal
+        draw = None
+        draw_base = 0
+        if self._deadline_at is not None:
+            self._profile_deadline(plan, chars_completed)
+        for i, (op, arg, char, weight, flags) in enumerate(islice(plan.events, start, None), start):
+            if self._shift_held and op != OP_SHIFTED:
+                self._release_held_shift()
+            if not self._running:
+                self._release_held_shift()
+                return chars_completed, False
+
+            if op == OP_MACRO:
+                if arg[0] not in ('PAUSE', 'SPEED') and not self._wait_until_ready():
+                    return chars_completed, False
+                self.execute_macro(*arg)
+                journal.note(self.progress.lap, base + i + 1, chars_completed)
+                continue
+            if op == OP_MACRO_ERROR:
+                self.update_status.emit(f"Macro ignored: {arg}")
+                continue
+            if op == OP_DEDENT or op == OP_INDENT:
+                if not self._shift_indent(-arg if op == OP_DEDENT else arg):
+                    return chars_completed, False
+                journal.note(self.progress.lap, base + i + 1, chars_completed)
+                continue
 
             if not self._wait_until_ready():
                 return chars_completed, False
 
-            # At high speeds the backspace-and-retype sequence can race the
-            # next keystroke and corrupt output, so suppress artificial
-            # mistakes when the target WPM is fast. The checkbox still governs
-            # slower, human-like ranges.
-            if (self.add_mistakes
-                    and self.max_wpm < 220
-                    and random.random() < self.mistake_chance):
-                if char.lower() in KEY_ADJACENCY:
-                    kbd.typewrite(random.choice(KEY_ADJACENCY[char.lower()]))
-                    self._sleep_interruptible(random.uniform(0.1, 0.25))
-                    kbd.press('backspace')
-                    self._sleep_interruptible(random.uniform(0.05, 0.15))
-
-            if char == '\n':
-                self._dismiss_autocomplete_popup()
+            if op == OP_PASTE:
+                text, settle_lo, settle_hi = arg
+                self._paste_text(text, hold=bool(flags & F_CLIP_HOLD), settle=(settle_lo, settle_hi))
+                chars_completed += weight
+                self._publish_progress(overall_start_time, chars_completed, base + i + 1)
+                continue
+            if op == OP_LINE_END:
+                self._guard_popup(flags, newline=True)
                 if self.use_shift_enter:
                     kbd.hotkey('shift', 'enter')
                 else:
                     kbd.press('enter')
-            else:
-                # Type non-ASCII via macOS Unicode Hex Input if enabled
-                if self.unicode_hex_typing and ord(char) > 0x7F:
-                    if self._platform.name == 'macos':
-                        self._type_unicode_char_macos(char)
-                    else:
-                        self._type_with_ascii_fallback(char)
-                else:
-                    self._maybe_dismiss_autocomplete_before_char(char, prev_char)
-                    if not self._type_character(char):
-                        kbd.typewrite(char, interval=0.01)
+                self._last_key_at = time.monotonic()
+                chars_completed += weight
+                self._publish_progress(overall_start_time, chars_completed, base + i + 1)
+                self._sleep_interruptible(0.1)
+                continue
 
-            chars_completed += 1
-            self._maybe_emit_progress(overall_start_time, chars_completed, total_chars_overall)
+            k = i - draw_base
+            if draw is None or k >= len(draw):
+                draw_base, k = i, 0
+                draw = timing.draw(all_flags[i:i + TIMING_BATCH])
+
+            pace.mark(i)
+            if op == OP_BURST:
+                self._emit_burst(arg, flags)
+                self._last_key_at = time.monotonic()
+                chars_completed += weight
+                self._publish_progress(overall_start_time, chars_completed, base + i + 1)
+                # The per-key delay scaled to the batch; no mistakes or
+                # punctuation/thinking pauses inside a burst.
+                min_d = 60 / (self.max_wpm * 5)
+                max_d = 60 / (self.min_wpm * 5)
+                delay = weight * (min_d + draw.spread[k] * (max_d - min_d))
+                self._scheduler.wait_next(pace.plan(pace_class(op, flags), delay, weight))
+                continue
+
+            # At high speeds the backspace-and-retype sequence can race the
+            # next keystroke and corrupt output, so suppress artificial
+            # mistakes when the target WPM is fast. The checkbox still governs
+            # slower, human-like ranges.
+            if k in draw.mistakes and timing.mistakes_active(self.add_mistakes, self.max_wpm):
+                # The correction's holds are meant to take time.
+                pace.reset()
+                self._release_held_shift()
+                hold, recover = timing.mistake_holds()
+                kbd.typewrite(timing.rng.choice(KEY_ADJACENCY[char.lower()]))
+                self._sleep_interruptible(hold)
+                kbd.press('backspace')
+                self._sleep_interruptible(recover)
+
+            self._emit_typed_event(op, arg, char, flags)
+            self._last_key_at = time.monotonic()
+
+            chars_completed += weight
+            self._publish_progress(overall_start_time, chars_completed, base + i + 1)
 
             # Smooth human-like delay: bias to mid-range via beta, extra thinking pauses
             min_d = 60 / (self.max_wpm * 5)
             max_d = 60 / (self.min_wpm * 5)
-            sf = random.betavariate(2.5, 2.5)
-            delay = min_d + sf * (max_d - min_d)
-            if self.pause_on_punct:
-                if char in '.,?!':
-                    delay += random.uniform(0.08, 0.15)
-                elif char in '()[]{}':
-                    delay += random.uniform(0.1, 0.3)
-            # Occasional cognitive pause at word boundaries
-            if prev_char and prev_char in ' \t' and random.random() < self.thinking_pause_chance:
-                delay += random.uniform(0.12, 0.35)
-            self._sleep_interruptible(max(0.01, delay))
-            prev_char = char
+            delay = draw.delay(k, min_d, max_d - min_d, self.pause_on_punct)
+            # Due ``delay`` after the previous key's *deadline*, so backend
+            # overhead is absorbed instead of stacking on top of the delay;
+            # the speed controller takes off what the schedule can't absorb.
+            self._scheduler.wait_next(pace.plan(pace_class(op, flags), delay))
 
         return chars_completed, True
 
     @pyqtSlot()
     def run(self):
+        outcome = EV_STOPPED
         try:
+            # Tell the keyboard shim which backend to use for this run.
+            kbd.set_mode(self.kbd_rdp_mode)
+            kbd.set_native(self.kbd_native)
             # A small global cushion between every pyautogui call. PAUSE=0 races
             # shift-up vs next-char-down on macOS, causing stuck shift state
             # ("Google"->"GOOGLE", ")"->"0"). 5ms is invisible to humans but
             # gives Quartz time to process modifier transitions in order.
-            pyautogui.PAUSE = 0.005
-            # Tell the keyboard shim which backend to use for this run.
-            kbd.set_mode(self.kbd_rdp_mode)
+            # The XTest backend sends each key's events as one ordered batch
+            # on a single X connection, so it doesn't need the cushion.
+            pyautogui.PAUSE = 0.0 if kbd.native_active() else 0.005
             if self.enable_mouse_jitter:
                 threading.Thread(target=self._mouse_jitter_thread, daemon=True).start()
 
-            text_content = self.text_to_type or ""
-            # Strip HTML entities, invisible/bidi chars, exotic spaces, and
-            # normalize smart punctuation before a single keystroke goes out.
-            text_content = sanitize_ai_text(text_content)
+            source = self.text_to_type
+            if isinstance(source, str) and self.enable_macros:
+                # REPEAT/INCLUDE scripts are replayed lazily through the
+                # streaming path instead of being expanded in memory.
+                program = compile_macros(source, macro_environment(), base_dir=self.macro_base_dir)
+                if program.has_directives():
+                    for diagnostic in program.diagnostics()[:3]:
+                        self.update_status.emit(f"Macro: {diagnostic}")
+                    source = ExpandedText(program)
+            if source is None or isinstance(source, str):
+                # Strip HTML entities, invisible/bidi chars, exotic spaces, and
+                # normalize smart punctuation before a single keystroke goes out.
+                text_content = sanitize_ai_text(source or "")
+            else:
+                # Streamed source: the same steps run per chunk as it's typed.
+                self._stream = TextSource(source)
+                text_content = None
 
-            if not text_content:
+            if not (text_content or (self._stream is not None and self._stream.peek())):
                 self.finished.emit()
                 return
 
+            # One shared foreground watcher for the whole run; the per-key
+            # focus check reads its snapshot instead of querying the OS.
+            try:
+                self._focus = _focus_watcher.acquire(self._platform)
+                self._focus.subscribe(self._wake)
+            except Exception:
+                _log_caught('run@focus_watcher')
+                self._focus = None
+
             for i in range(self.delay, 0, -1):
                 if not self._running:
                     self.finished.emit()
@@ -839,6 +1292,11 @@ class TypingWorker(QObject):
             self.initial_window = target
             self.initial_window_identity = target_identity
             self._target_is_browser = self._is_browser_title(self.initial_window)
+            self._guard_profile = guard_profile(categorize_title(self.initial_window))
+            # Prime from the compiled text or the stream's buffered head;
+            # iterating a streamed source here would consume it.
+            self._keymap = kbd.load_keymap(
+                text_content if text_content is not None else self._sample_text())
             self._initial_tab_prefix = (
                 _normalize_browser_tab_prefix_helper(self.initial_window)
                 if self._target_is_browser else ""
@@ -848,224 +1306,95 @@ class TypingWorker(QObject):
             self.update_status.emit(f"Typing locked on: {self.initial_window}")
             if self.auto_detect:
                 self._auto_optimize_for_window(self.initial_window)
-            overall_start_time = time.time()
-
-            total_per_lap = self._compute_total_chars_per_lap(text_content)
-            total_chars_overall = max(1, total_per_lap * max(1, self.laps))
-            try:
-                self.set_progress_max.emit(total_chars_overall)
-            except Exception:
-                _log_caught('run@L826')
-                pass
-            try:
-                self.update_progress.emit(0)
-            except Exception:
-                _log_caught('run@L830')
-                pass
-
-            macro_split_re = MACRO_SPLIT_RE.pattern
-
-            def split_segments(s: str):
-                # Allow toggling macros on/off while paused (runtime updates).
-                if self.enable_macros:
-                    return re.split(macro_split_re, s)
-                return [s]
-
-            chars_completed = 0
-            for lap in range(1, self.laps + 1):
+            overall_start_time = time.monotonic()
+            self._timing = TimingModel(
+                seed=self.timing_seed,
+                mistake_chance=self.mistake_chance,
+                thinking_pause_chance=self.thinking_pause_chance,
+            )
+            self._pace = SpeedController()
+            if self.deadline_seconds > 0:
+                self._deadline_at = time.monotonic() + self.deadline_seconds
+                self._deadline_range = (self.min_wpm, self.max_wpm)
+
+            first_lap, first_offset, chars_completed = 1, 0, 0
+            if self._stream is None:
+                plan = self._compile_plan(text_content)
+                plan_key = plan.key
+                total_chars_overall = max(1, plan.output_chars * max(1, self.laps))
+            else:
+                plan_key = self._plan_key()
+                # Best guess until the stream has been read (0 = unknown).
+                total_chars_overall = self._stream.size_hint() * max(1, self.laps)
+            # A REPEAT/INCLUDE script is replayed from its own text, so its
+            # streamed run can be journaled; a file or iterator source can't
+            # be matched up with the editor text again.
+            digest = None
+            if self.text_to_type is None or isinstance(self.text_to_type, str):
+                digest = text_hash(self.text_to_type or "")
+            resume = self.resume_from
+            if resume is not None:
+                # Offsets index this exact plan: same text, same settings.
+                if resume.text_hash != digest or resume.settings_hash != settings_hash(plan_key):
+                    self.update_status.emit(
+                        "Can't resume: the text or typing settings changed since that run.")
+                    return
+                first_lap, first_offset = resume.lap, resume.offset
+                chars_completed = resume.chars_done
+                overall_start_time -= resume.elapsed
+            if self.journal_enabled:
+                if digest is None:
+                    self.update_status.emit("Typing from a stream: this run can't be resumed if interrupted.")
+                else:
+                    self._journal.set_settings(settings_hash(plan_key))
+                    self._journal.begin(
+                        digest, self.laps, total_chars_overall,
+                        lambda: self._elapsed_active(overall_start_time),
+                        resume=resume,
+                    )
+            self.progress.start(total_chars_overall, self.laps)
+            self.progress.advance(chars_completed, self._elapsed_active(overall_start_time))
+
+            for lap in range(first_lap, self.laps + 1):
                 if not self._running:
                     break
-                self.lap_progress.emit(lap, self.laps)
-
-                mode = self.newline_mode or 'Standard'
-
-                if mode == 'Paste Mode':
-                    # Paste text fast, but still honor macros and guardrails.
-                    segments = split_segments(text_content)
-                    for segment in segments:
-                        if not self._running:
-                            break
-                        match = MACRO_FULLMATCH_RE.fullmatch(segment) if self.enable_macros else None
-                        if self.enable_macros and match:
-                            ok, msg, normalized = self.validate_macro(match.group(1), match.group(2))
-                            if ok and normalized:
-                                cmd = normalized[0]
-                                if cmd != 'PAUSE' and not self._wait_until_ready():
-                                    break
-                                self.execute_macro(*normalized)
-                            else:
-                                self.update_status.emit(f"Macro ignored: {msg}")
-                            continue
-                        if not segment:
-                            continue
-                        for line in segment.splitlines(keepends=True):
-                            if not self._running:
-                                break
-                            if not self._wait_until_ready():
-                                break
-                            self._paste_text(line)
-                            chars_completed += len(line)
-                            self._maybe_emit_progress(overall_start_time, chars_completed, total_chars_overall)
-                            self._sleep_interruptible(random.uniform(0.05, 0.15))
-                    continue
-
-                if mode == 'List Mode':
-                    # List Mode: strip leading indentation and always send Enter per line.
-                    # Tabs are intentionally not preserved in this mode.
-                    lines = text_content.splitlines()
-                    virtual_level = 0
-                    for line in lines:
-                        if not self._running:
-                            break
-                        desired_level = self._indent_level_for_list_mode(line)
-                        # If the next line should be dedented relative to the editor's current level,
-                        # outdent before typing to avoid "except/else" being stuck inside a block.
-                        if desired_level < virtual_level:
-                            steps = max(0, virtual_level - desired_level)
-                            for _ in range(steps):
-                                if not self._wait_until_ready():
-                                    break
-                                try:
-                                    kbd.hotkey('shift', 'tab')
-                                except Exception:
-                                    # Fallback: explicit down/up so a hotkey
-                                    # incompatibility doesn't kill the dedent.
-                                    # try/finally guarantees shift is released
-                                    # even if press('tab') raises mid-flight,
-                                    # which otherwise leaves shift latched and
-                                    # corrupts every subsequent keystroke.
-                                    _log_caught('run@L897')
-                                    try:
-                                        kbd.keyDown('shift')
-                                        try:
-                                            kbd.press('tab')
-                                        finally:
-                                            kbd.keyUp('shift')
-                                    except Exception:
-                                        _log_caught('run@L910')
-                                        break
-                                self._sleep_interruptible(0.03)
-                            virtual_level = desired_level
-
-                        stripped = line.lstrip(' \t')
-                        if not self.type_tabs:
-                            stripped = stripped.replace('\t', '')
-                        line_segments = split_segments(stripped)
-                        for segment in line_segments:
-                            if not self._running:
-                                break
-                            match = MACRO_FULLMATCH_RE.fullmatch(segment) if self.enable_macros else None
-                            if self.enable_macros and match:
-                                ok, msg, normalized = self.validate_macro(match.group(1), match.group(2))
-                                if ok and normalized:
-                                    cmd = normalized[0]
-                                    if cmd != 'PAUSE' and not self._wait_until_ready():
-                                        break
-                                    self.execute_macro(*normalized)
-                                else:
-                                    self.update_status.emit(f"Macro ignored: {msg}")
-                                continue
-                            if not segment:
-                                continue
-
-                            should_paste = False
-                            if self.ime_friendly and not self.unicode_hex_typing:
-                                # In List Mode (code editors), prefer per-key typing unless non-ASCII
-                                # would fail without IME/Unicode support.
-                                try:
-                                    should_paste = any(ord(ch) > 0x7F for ch in segment)
-                                except Exception:
-                                    _log_caught('run@L942')
-                                    should_paste = False
-
-                            if should_paste:
-                                if not self._wait_until_ready():
-                                    break
-                                self._paste_text(segment)
-                                chars_completed += len(segment)
-                                self._maybe_emit_progress(overall_start_time, chars_completed, total_chars_overall)
-                                self._sleep_interruptible(random.uniform(0.02, 0.06))
-                            else:
-                                chars_completed, still_running = self._type_segment(
-                                    segment, overall_start_time, chars_completed, total_chars_overall)
-                                if not still_running:
-                                    break
-
-                        if not self._running:
-                            break
-                        if not self._wait_until_ready():
-                            break
-                        self._dismiss_autocomplete_popup()
-                        if self.use_shift_enter:
-                            kbd.hotkey('shift', 'enter')
-                        else:
-                            kbd.press('enter')
-                        chars_completed += 1
-                        self._maybe_emit_progress(overall_start_time, chars_completed, total_chars_overall)
-                        self._sleep_interruptible(0.1)
-                        # Approximate next-line indentation level (common in code editors):
-                        # after block starters like ':' or '{', indentation increases.
-                        try:
-                            s = (stripped or "").rstrip()
-                        except Exception:
-                            _log_caught('run@L974')
-                            s = ""
-                        if s.endswith(':') or s.endswith('{'):
-                            virtual_level = desired_level + 1
-                        else:
-                            virtual_level = desired_level
+                if self._stream is not None and lap > 1 and not self._stream.rewindable():
+                    self.update_status.emit("Source can't be replayed; stopping after one lap.")
+                    break
+                self.progress.set_lap(lap)
+                # Every lap starts at the run's own speed.
+                self._apply_speed(None)
+                start = first_offset if lap == first_lap else 0
+                if self._stream is not None:
+                    self._journal.set_settings(settings_hash(self._plan_key()))
+                    chars_completed, still_running = self._execute_stream(
+                        overall_start_time, chars_completed, start)
                 else:
-                    processed_text = apply_smart_newlines(text_content) if mode == 'Smart Newlines' else text_content
-                    segments = split_segments(processed_text)
-                    for segment in segments:
-                        if not self._running:
-                            break
-                        match = MACRO_FULLMATCH_RE.fullmatch(segment) if self.enable_macros else None
-                        if self.enable_macros and match:
-                            ok, msg, normalized = self.validate_macro(match.group(1), match.group(2))
-                            if ok and normalized:
-                                cmd = normalized[0]
-                                if cmd != 'PAUSE' and not self._wait_until_ready():
-                                    break
-                                self.execute_macro(*normalized)
-                            else:
-                                self.update_status.emit(f"Macro ignored: {msg}")
-                            continue
-                        if not segment:
-                            continue
-
-                        if self.ime_friendly and not self.unicode_hex_typing:
-                            if not self.type_tabs:
-                                segment = segment.replace('\t', '')
-                            if not segment:
-                                continue
-                            if not self._wait_until_ready():
-                                break
-                            self._paste_text(segment)
-                            chars_completed += len(segment)
-                            self._maybe_emit_progress(overall_start_time, chars_completed, total_chars_overall)
-                            self._sleep_interruptible(random.uniform(0.02, 0.06))
-                        else:
-                            chars_completed, still_running = self._type_segment(
-                                segment, overall_start_time, chars_completed, total_chars_overall)
-                            if not still_running:
-                                break
-
-                if not self._running:
+                    # Picks up settings changed while paused (e.g. newline
+                    # mode, macros toggle); a no-op when nothing plan-relevant
+                    # moved.
+                    plan = self._compile_plan(text_content)
+                    self._journal.set_settings(settings_hash(plan.key))
+                    if start:
+                        self._replay_speed(plan, start)
+                    chars_completed, still_running = self._execute_plan(
+                        plan, overall_start_time, chars_completed, start)
+                if not still_running or not self._running:
                     break
                 self._sleep_interruptible(0.5)
 
             if self._running:
                 # Ensure the progress bar reaches 100% for edge cases (e.g., macros-only runs).
-                try:
-                    self.update_progress.emit(total_chars_overall)
-                except Exception:
-                    _log_caught('run@L1025')
-                    pass
-                self.update_status.emit("Typing completed successfully!")
+                if self._stream is not None:
+                    total_chars_overall = chars_completed
+                    self.progress.set_total(total_chars_overall)
+                self.progress.advance(total_chars_overall, self._elapsed_active(overall_start_time))
+                outcome = EV_DONE
+                self.update_status.emit(self._with_transliteration("Typing completed successfully!"))
             else:
-                self.update_status.emit("Typing stopped by user.")
+                self.update_status.emit(self._with_transliteration("Typing stopped by user."))
         except Exception as e:
+            outcome = EV_ERROR
             error_message = f"Typing Error: {e}"
             if self._platform.name == "macos" and (
                 "Accessibility" in str(e)
@@ -1080,12 +1409,33 @@ class TypingWorker(QObject):
                 _log_caught('run@L1041')
                 pass
         finally:
+            # Never leave shift latched, the clipboard borrowed or spare
+            # keycodes bound, whatever ended the run.
+            self._yield_input()
+            kbd.release_unicode_bindings()
+            self.progress.set_state(STATE_FINISHED)
+            self._journal.end(outcome)
+            if self._focus is not None:
+                try:
+                    self._focus.unsubscribe(self._wake)
+                    _focus_watcher.release(self._focus)
+                except Exception:
+                    _log_caught('run@focus_release')
+                self._focus = None
             self.finished.emit()
 
+    def _with_transliteration(self, message: str) -> str:
+        """Append the run's transliteration report to a final status."""
+        if not self._transliterated:
+            return message
+        summary = self._transliterated.summary()
+        logger.info(summary)
+        return f"{message} {summary}"
+
     def _auto_optimize_for_window(self, title):
         overrides = _auto_optimize_for_window_helper(
             title,
-            text_to_type=self.text_to_type or "",
+            text_to_type=self._sample_text(),
             current_newline_mode=self.newline_mode or "Standard",
         )
         chosen = overrides.get("chosen")
@@ -1104,6 +1454,8 @@ class TypingWorker(QObject):
             self.pause_on_punct = bool(overrides["pause_on_punct"])
         if "newline_mode" in overrides:
             self.newline_mode = overrides["newline_mode"]
+        if "code_target" in overrides:
+            self.code_target = bool(overrides["code_target"])
         try:
             self.update_status.emit(
                 f"Auto-optimized for {chosen}: mode={self.newline_mode}"
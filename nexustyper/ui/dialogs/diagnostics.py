@@ -111,6 +111,11 @@ class DiagnosticsDialog(QDialog):
                 f"Log file: {self._log_file}",
                 f"Log dir: {self._log_dir}",
             ]
+            if platform.system() == "Linux":
+                lines.append(
+                    "Native keyboard input (X11): "
+                    + ("Available" if kbd.native_available() else "Unavailable — using fallback")
+                )
             if (
                 platform.system() == "Darwin"
                 and self._accessibility_trusted_fn is not None
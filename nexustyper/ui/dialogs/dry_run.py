@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QTextEdit,
     QPushButton, QMessageBox
 )
-from PyQt5.QtCore import Qt, QThread
+from PyQt5.QtCore import Qt, QThread, QTimer
 
 from nexustyper.typing.dry_run import DryRunWorker
 from nexustyper.ui.widgets.text_edit import CodeEditor
@@ -41,6 +41,11 @@ class DryRunDialog(QDialog):
         v.addLayout(h)
         self.thread = None
         self.worker = None
+        # Drains the worker's preview buffer (~30 fps) instead of a queued
+        # signal per character.
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setInterval(33)
+        self._preview_timer.timeout.connect(self._drain_preview)
         self.start_btn.clicked.connect(self.start)
         self.stop_btn.clicked.connect(self.stop)
         self.reset_editor_btn.clicked.connect(self.reset_editor)
@@ -63,6 +68,8 @@ class DryRunDialog(QDialog):
             mode = 'List Mode'
         elif p.paste_mode_radio.isChecked():
             mode = 'Paste Mode'
+        elif p.block_mode_radio.isChecked():
+            mode = 'Block Mode'
         self.view.clear()
         self.code_editor.clear()
         # Parent the thread to the dialog so its lifetime is bound to ours
@@ -78,11 +85,12 @@ class DryRunDialog(QDialog):
             p.use_shift_enter_checkbox.isChecked(),
             p.type_tabs_checkbox.isChecked(),
             p.enable_macros_checkbox.isChecked() if hasattr(p, "enable_macros_checkbox") else True,
+            getattr(p, "_document_dir", None),
         )
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.on_finished)
-        self.worker.update_preview.connect(self.on_char)
+        self._preview_timer.start()
         self.thread.start()
 
     def stop(self):
@@ -90,6 +98,8 @@ class DryRunDialog(QDialog):
             self.worker.stop()
 
     def on_finished(self):
+        self._preview_timer.stop()
+        self._drain_preview()
         if self.thread:
             self.thread.quit()
             self.thread.wait()
@@ -107,6 +117,7 @@ class DryRunDialog(QDialog):
         already torn down.
         """
         try:
+            self._preview_timer.stop()
             if self.worker:
                 self.worker.stop()
             if self.thread and self.thread.isRunning():
@@ -117,22 +128,29 @@ class DryRunDialog(QDialog):
             pass
         super().closeEvent(event)
 
-    def on_char(self, ch: str):
+    def _drain_preview(self):
+        if self.worker:
+            text = self.worker.take_preview()
+            if text:
+                self.on_text(text)
+
+    def on_text(self, text: str):
         # Send to text preview
-        self.view.insertPlainText(ch)
+        self.view.insertPlainText(text)
         # Simulate code editor typing with basic autocomplete behaviour
         p = self.parent()
-        if ch == '\n':
-            # Simulate 'Esc before Enter' if enabled to dismiss autocomplete
-            try:
-                if p and hasattr(p, 'press_esc_checkbox') and p.press_esc_checkbox.isChecked():
-                    self.code_editor.hide_completer()
-            except Exception:
-                _log_caught('on_char@L128')
-                pass
-            self.code_editor.insertPlainText('\n')
-        else:
-            self.code_editor.insertPlainText(ch)
-            self.code_editor.maybe_show_completions()
+        for i, piece in enumerate(text.split('\n')):
+            if i:
+                # Simulate 'Esc before Enter' if enabled to dismiss autocomplete
+                try:
+                    if p and hasattr(p, 'press_esc_checkbox') and p.press_esc_checkbox.isChecked():
+                        self.code_editor.hide_completer()
+                except Exception:
+                    _log_caught('on_char@L128')
+                    pass
+                self.code_editor.insertPlainText('\n')
+            if piece:
+                self.code_editor.insertPlainText(piece)
+                self.code_editor.maybe_show_completions()
 
 
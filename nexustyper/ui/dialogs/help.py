@@ -33,10 +33,11 @@ _DEFAULT_HELP_HTML = """
     <h2>Advanced Handling</h2>
     <h4>Newline Modes</h4>
     <ul>
-        <li><b>Line Paste:</b> Pastes each line (fastest). Some apps may block paste.</li>
+        <li><b>Line Paste:</b> Pastes lines in chunks (fastest; chunk size in Settings). Some apps may block paste.</li>
         <li><b>Standard Typing:</b> Types every character, including tabs/spaces.</li>
         <li><b>Smart Newlines:</b> Joins single line breaks into spaces; preserves double breaks.</li>
         <li><b>List Mode:</b> Best for code editors: types the line without leading indentation; editor handles indent. Tabs are intentionally not preserved here.</li>
+        <li><b>Per Block:</b> For mixed answers: types prose paragraphs, pastes fenced code blocks and tables. With auto-optimize on in a code editor, code blocks use List Mode instead.</li>
     </ul>
     <h4>Other Options</h4>
     <ul>
@@ -44,7 +45,7 @@ _DEFAULT_HELP_HTML = """
         <li><b>Preserve Tab Characters:</b> Applies to Standard/Smart; ignored in List Mode.</li>
         <li><b>Press 'Esc' to bypass autocomplete:</b> Dismiss IDE popups before Enter.</li>
         <li><b>Enable Background Mouse Jitter:</b> Tiny background movement to prevent idle.</li>
-        <li><b>IME‑friendly:</b> Use paste instead of per‑key typing for IMEs and complex scripts.</li>
+        <li><b>IME‑friendly:</b> Paste the non‑ASCII runs (IMEs, complex scripts) and type the ASCII text around them per key.</li>
         <li><b>Compliance Mode:</b> Automatically pause in blocked apps (e.g., browsers).</li>
     </ul>
 
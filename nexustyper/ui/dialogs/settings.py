@@ -1,7 +1,8 @@
 """Hotkey & global-hotkey-toggle preferences dialog.
 
 This is the only "Settings" surface NexusTyper Pro currently exposes — it
-edits the start/stop/resume hotkeys and the "enable global hotkeys" switch.
+edits the start/stop/resume hotkeys, the "enable global hotkeys" switch,
+the keyboard backend options and the Paste Mode chunk size.
 The original implementation reached into ``parent.settings`` to load and save;
 this version takes the QSettings instance and the platform-specific default
 hotkey strings as keyword-only ``__init__`` parameters so the dialog has no
@@ -21,9 +22,11 @@ from PyQt5.QtCore import QSettings
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import (
     QCheckBox, QComboBox, QDialog, QDialogButtonBox, QFormLayout,
-    QKeySequenceEdit, QVBoxLayout,
+    QHBoxLayout, QKeySequenceEdit, QSpinBox, QVBoxLayout,
 )
 
+from nexustyper.typing.plan import PASTE_CHUNK_BYTES, PASTE_CHUNK_LINES
+
 
 def _macos_major_version() -> int:
     """Return the macOS major version number, or 0 if not on macOS."""
@@ -107,6 +110,43 @@ class SettingsDialog(QDialog):
             )
         form_layout.addRow("Remote Desktop typing:", self.rdp_mode_combo)
 
+        # Native X11 keyboard input (Linux-only). Sends keys straight to the
+        # X server instead of through pyautogui — much higher keystroke rates.
+        self.native_kbd_checkbox = QCheckBox("Native keyboard input (X11)")
+        self.native_kbd_checkbox.setToolTip(
+            "Sends keystrokes directly to the X server (XTest) instead of\n"
+            "through pyautogui. Faster and more reliable at high WPM.\n"
+            "\n"
+            "Linux / X11 only. Falls back automatically on Wayland."
+        )
+        if platform.system() != "Linux":
+            self.native_kbd_checkbox.setEnabled(False)
+            self.native_kbd_checkbox.setToolTip(
+                "Linux-only setting. Not needed on this platform."
+            )
+        form_layout.addRow(self.native_kbd_checkbox)
+
+        # Paste Mode chunk budget: whole lines are grouped into one paste of
+        # up to this many lines / KB.
+        self.paste_chunk_lines_spin = QSpinBox(self)
+        self.paste_chunk_lines_spin.setRange(1, 10000)
+        self.paste_chunk_lines_spin.setSuffix(" lines")
+        self.paste_chunk_kb_spin = QSpinBox(self)
+        self.paste_chunk_kb_spin.setRange(1, 1024)
+        self.paste_chunk_kb_spin.setSuffix(" KB")
+        chunk_tip = (
+            "Paste Mode pastes whole lines in chunks of at most this many\n"
+            "lines and kilobytes. Larger chunks finish sooner; lower them if\n"
+            "the target app drops or mangles big pastes. 1 line pastes line\n"
+            "by line."
+        )
+        self.paste_chunk_lines_spin.setToolTip(chunk_tip)
+        self.paste_chunk_kb_spin.setToolTip(chunk_tip)
+        chunk_row = QHBoxLayout()
+        chunk_row.addWidget(self.paste_chunk_lines_spin)
+        chunk_row.addWidget(self.paste_chunk_kb_spin)
+        form_layout.addRow("Paste Mode chunk:", chunk_row)
+
         layout.addLayout(form_layout)
         buttons = QDialogButtonBox(
             QDialogButtonBox.Save | QDialogButtonBox.Cancel
@@ -139,6 +179,16 @@ class SettingsDialog(QDialog):
         idx = self.rdp_mode_combo.findData(rdp_mode)
         self.rdp_mode_combo.setCurrentIndex(idx if idx >= 0 else 1)
 
+        self.native_kbd_checkbox.setChecked(
+            self.settings.value("nativeKeyboard", True, type=bool)
+        )
+        self.paste_chunk_lines_spin.setValue(
+            self.settings.value("pasteChunkLines", PASTE_CHUNK_LINES, type=int)
+        )
+        self.paste_chunk_kb_spin.setValue(
+            self.settings.value("pasteChunkKB", PASTE_CHUNK_BYTES // 1024, type=int)
+        )
+
     def save_settings(self) -> None:
         # Store hotkeys in PortableText so they round-trip across platforms
         # and are easier to translate for pynput.
@@ -160,6 +210,13 @@ class SettingsDialog(QDialog):
         self.settings.setValue(
             "rdpKeyboardMode", self.rdp_mode_combo.currentData()
         )
+        self.settings.setValue(
+            "nativeKeyboard", self.native_kbd_checkbox.isChecked()
+        )
+        self.settings.setValue(
+            "pasteChunkLines", self.paste_chunk_lines_spin.value()
+        )
+        self.settings.setValue("pasteChunkKB", self.paste_chunk_kb_spin.value())
         self.accept()
 
 
@@ -0,0 +1,69 @@
+import pytest
+
+from nexustyper.typing.autocomplete import (
+    GUARD_PROFILES,
+    POPUP_HIGH,
+    POPUP_LOW,
+    POPUP_MID,
+    POPUP_NONE,
+    POPUP_SETTLE,
+    PopupModel,
+    guard_profile,
+    newline_dismissals,
+    settle_gap,
+)
+from nexustyper.typing.timing import delay_bounds
+
+
+def _level(typed, ch):
+    model = PopupModel()
+    for c in typed:
+        model.feed(c)
+    return model.level(ch)
+
+
+@pytest.mark.parametrize('typed, ch, level', [
+    ('obj.', '\n', POPUP_HIGH),
+    ('obj.m', ' ', POPUP_HIGH),
+    ('@al', ' ', POPUP_HIGH),
+    ('ab', '(', POPUP_HIGH),
+    ('word', '\t', POPUP_HIGH),
+    ('value', ' ', POPUP_MID),
+    ('return', '\n', POPUP_MID),
+    ('return', ' ', POPUP_LOW),
+    ('x = "abc', ' ', POPUP_LOW),
+    ('# hello', ' ', POPUP_LOW),
+    ('x = 42', ' ', POPUP_LOW),
+    ('foo()', '\n', POPUP_NONE),
+    ('\t', '\t', POPUP_NONE),
+])
+def test_popup_levels(typed, ch, level):
+    assert _level(typed, ch) == level
+
+
+def test_reset_forgets_context():
+    model = PopupModel()
+    for c in 'obj.':
+        model.feed(c)
+    model.reset()
+    assert model.level('\n') == POPUP_NONE
+
+
+def test_guard_profiles():
+    assert guard_profile('code').guard == POPUP_MID
+    assert guard_profile('chat').guard == POPUP_HIGH
+    assert guard_profile('no such category') == GUARD_PROFILES['unknown']
+
+
+def test_newline_dismissals():
+    assert newline_dismissals('obj.\nfoo()\nvalue\n', guard_profile('code')) == 2
+    assert newline_dismissals('obj.\nfoo()\nvalue\n', guard_profile('chat')) == 1
+
+
+def test_settle_gap_follows_pace():
+    slow = settle_gap(*delay_bounds(40, 60))
+    fast = settle_gap(*delay_bounds(80, 120))
+    assert slow > fast > POPUP_SETTLE
+    # An ordinary gap at 40-60 WPM is no pause.
+    assert slow > delay_bounds(40, 60)[1]
+    assert settle_gap(*delay_bounds(400, 600)) == POPUP_SETTLE
@@ -0,0 +1,79 @@
+import pytest
+
+from nexustyper.typing.blocks import (
+    BLOCK_CODE,
+    BLOCK_PROSE,
+    BLOCK_TABLE,
+    STRATEGY_LIST,
+    STRATEGY_PASTE,
+    STRATEGY_TYPE,
+    BlockSegmenter,
+    block_strategy,
+    segment_blocks,
+)
+
+TEXT = (
+    'Here is the fix:\n'
+    '\n'
+    '```python\n'
+    'def f(x):\n'
+    '    return x\n'
+    '```\n'
+    'And the timings:\n'
+    '\n'
+    '| n | ms |\n'
+    '|---|----|\n'
+    '| 1 | 20 |\n'
+    '\n'
+    'Indented:\n'
+    '\n'
+    '    for i in range(3):\n'
+    '        print(i)\n'
+    '\n'
+    'Done.'
+)
+
+
+def _kinds(blocks):
+    return [b.kind for b in blocks]
+
+
+def _fed(text, size):
+    segmenter = BlockSegmenter()
+    blocks = []
+    for i in range(0, len(text), size):
+        blocks += segmenter.feed(text[i:i + size])
+    blocks += segmenter.finish()
+    # Neighbours of one kind may come out of separate calls.
+    merged = []
+    for block in blocks:
+        if merged and merged[-1].kind == block.kind:
+            merged[-1] = block._replace(text=merged[-1].text + block.text)
+        else:
+            merged.append(block)
+    return merged
+
+
+def test_segment_blocks():
+    blocks = segment_blocks(TEXT)
+    assert _kinds(blocks) == [BLOCK_PROSE, BLOCK_CODE, BLOCK_PROSE, BLOCK_TABLE, BLOCK_PROSE, BLOCK_CODE, BLOCK_PROSE]
+    assert blocks[1].text == '```python\ndef f(x):\n    return x\n```\n'
+    assert blocks[3].text.startswith('| n | ms |\n')
+    assert ''.join(b.text for b in blocks) == TEXT
+
+
+def test_unclosed_fence_runs_to_the_end():
+    blocks = segment_blocks('intro\n\n~~~\ncode\n')
+    assert _kinds(blocks) == [BLOCK_PROSE, BLOCK_CODE]
+
+
+@pytest.mark.parametrize('size', [1, 5, 7, 64, len(TEXT)])
+def test_fed_in_pieces_matches_one_shot(size):
+    assert _fed(TEXT, size) == segment_blocks(TEXT)
+
+
+def test_block_strategy():
+    assert block_strategy(BLOCK_PROSE, code_target=True) == STRATEGY_TYPE
+    assert block_strategy(BLOCK_TABLE, code_target=True) == STRATEGY_PASTE
+    assert block_strategy(BLOCK_CODE) == STRATEGY_PASTE
+    assert block_strategy(BLOCK_CODE, code_target=True) == STRATEGY_LIST
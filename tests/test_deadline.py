@@ -0,0 +1,75 @@
+import pytest
+
+from nexustyper.constants import MAX_WPM_LIMIT, MIN_WPM_LIMIT
+from nexustyper.typing.deadline import (
+    EXTRA_SCALE_MAX,
+    LINE_END_COST,
+    PlanProfile,
+    profile_plan,
+    solve_deadline,
+)
+from nexustyper.typing.plan import compile_plan
+from nexustyper.typing.timing import SPREAD_ALPHA, SPREAD_BETA, THINKING_PAUSE
+
+PROFILE = PlanProfile(chars=1000, keys=1000, fixed=0.0, punct=0, brackets=0, boundaries=200, eligible=800)
+
+
+def _solve(seconds_left, wpm_range=(40, 80), remaining=1000, **kw):
+    options = dict(pause_on_punct=False, mistakes=False, thinking_chance=0.04, mistake_chance=0.02)
+    options.update(kw)
+    return solve_deadline(PROFILE, remaining, seconds_left, wpm_range, **options)
+
+
+def _seconds_per_key(lo, hi):
+    p = SPREAD_ALPHA / (SPREAD_ALPHA + SPREAD_BETA)
+    return 12.0 / hi + p * (12.0 / lo - 12.0 / hi)
+
+
+def test_profile_plan():
+    plan = compile_plan('Hi, you.\n{{PAUSE:2}}ok\n', newline_mode='List Mode')
+    profile = profile_plan(plan)
+    assert profile.chars == plan.output_chars
+    assert profile.keys == 10
+    assert profile.punct == 2
+    assert profile.fixed == pytest.approx(2.0 + 2 * LINE_END_COST)
+
+
+def test_meets_the_deadline_keeping_the_range_shape():
+    solution = _solve(300.0)
+    assert solution.feasible
+    assert solution.extras_scale == 1.0
+    assert solution.max_wpm / solution.min_wpm == pytest.approx(2.0, rel=0.02)
+    think = 200 * 0.04 * sum(THINKING_PAUSE) / 2
+    typed = 1000 * _seconds_per_key(solution.min_wpm, solution.max_wpm)
+    assert typed + think == pytest.approx(300.0, rel=0.02)
+
+
+def test_too_little_time_is_infeasible():
+    solution = _solve(5.0)
+    assert not solution.feasible
+    assert solution.max_wpm == MAX_WPM_LIMIT
+    assert solution.min_wpm == MAX_WPM_LIMIT // 2
+    assert solution.extras_scale == 0.0
+
+
+def test_tight_deadline_trims_pauses_first():
+    fastest = 1000 * _seconds_per_key(MAX_WPM_LIMIT // 2, MAX_WPM_LIMIT)
+    # Typing at the top of the range leaves 1 s of the 1.88 s thinking budget.
+    solution = _solve(fastest + 1.0)
+    assert solution.feasible
+    assert solution.max_wpm == MAX_WPM_LIMIT
+    assert 0.0 < solution.extras_scale < 1.0
+
+
+def test_plenty_of_time_clamps_to_the_slowest_range():
+    solution = _solve(100000.0)
+    assert solution.feasible
+    assert solution.min_wpm == MIN_WPM_LIMIT
+    assert solution.max_wpm == 2 * MIN_WPM_LIMIT
+    assert solution.extras_scale == EXTRA_SCALE_MAX
+
+
+def test_nothing_left_to_type():
+    assert _solve(60.0, remaining=0) is None
+    assert solve_deadline(PROFILE._replace(chars=0), 10, 60.0, (40, 80), pause_on_punct=False,
+                          mistakes=False, thinking_chance=0.0, mistake_chance=0.0) is None
@@ -0,0 +1,37 @@
+from nexustyper.typing.indent import IndentPlanner, plan_indents
+
+
+def test_python_blocks():
+    text = 'def f(x):\n    if x:\n        return 1\n    return 0\n'
+    assert plan_indents(text) == [0, 0, 0, -1]
+
+
+def test_closing_brace_needs_no_dedent():
+    assert plan_indents('int f() {\n    return 1;\n}\n') == [0, 0, 0]
+
+
+def test_indent_unit_is_learned():
+    text = 'if x:\n  y = 1\n  if y:\n    z()\nw()\n'
+    assert plan_indents(text) == [0, 0, 0, 0, -2]
+
+
+def test_blank_lines_keep_the_level():
+    assert plan_indents('def f():\n    pass\n\n    # c\n    return\n') == [0, 0, 0, 0, 0]
+
+
+def test_multiline_string_keeps_its_indentation():
+    assert plan_indents("s = '''\n    keep\n'''\nx = 1\n") == [0, 1, -1, 0]
+
+
+def test_brackets_in_strings_and_comments_are_ignored():
+    text = 'x = "{"  # (\ny = 1\n'
+    assert plan_indents(text) == [0, 0]
+
+
+def test_reset_returns_to_column_zero():
+    planner = IndentPlanner()
+    planner.line('def f():')
+    assert planner.level == 1
+    planner.reset()
+    assert planner.level == 0
+    assert planner.line('x = 1') == 0
@@ -0,0 +1,130 @@
+import pytest
+
+from nexustyper.typing.keymap import (
+    MOD_ALTGR,
+    MOD_SHIFT,
+    Keymap,
+    KeymapService,
+    XkbKeymapProvider,
+    keysym_to_char,
+)
+
+SHIFT_L = 50
+LEVEL3 = 108
+EURO = 0x20AC
+
+# X keycode -> keysyms at levels 0-3 (plain, Shift, AltGr, AltGr+Shift).
+GERMAN = {
+    11: '2"²', 16: '7/{', 17: '8([', 20: 'ß?\\', 24: 'qQ@', 26: ['e', 'E', EURO], 35: '+*~',
+    38: 'aA', 51: "#'", 59: ',;', 60: '.:', 61: '-_',
+}
+FRENCH = {
+    10: '&1', 11: 'é2~', 12: '"3#', 19: 'à0@', 24: 'aA', 38: 'qQ', 58: ',?', 59: ';.',
+}
+
+
+class FakeXkb:
+    """The slice of an X connection :class:`XkbKeymapProvider` reads."""
+
+    def __init__(self, name, keys, altgr=True):
+        self.name = name
+        self.keys = keys
+        self.mods = {0xFFE1: SHIFT_L}
+        if altgr:
+            self.mods[0xFE03] = LEVEL3
+
+    def layout_names(self):
+        return self.name
+
+    def keyboard_group(self):
+        return 0
+
+    def keycode_range(self):
+        return 8, 255
+
+    def keysym_at(self, keycode, group, level):
+        syms = self.keys.get(keycode, ())
+        if level >= len(syms):
+            return 0
+        sym = syms[level]
+        return sym if isinstance(sym, int) else ord(sym)
+
+    def keycode_of(self, keysym):
+        return self.mods.get(keysym, 0)
+
+
+def _keymap(keys, altgr=True, name='de'):
+    provider = XkbKeymapProvider(FakeXkb(name, keys, altgr))
+    return provider.build(provider.layout_id())
+
+
+def test_german_strokes():
+    keymap = _keymap(GERMAN)
+    assert keymap.stroke('"') == (11, MOD_SHIFT)
+    assert keymap.stroke('@') == (24, MOD_ALTGR)
+    assert keymap.stroke('€') == (26, MOD_ALTGR)
+    assert keymap.stroke('{') == (16, MOD_ALTGR)
+    assert keymap.stroke('ß') == (20, 0)
+    assert keymap.stroke('☃') is None
+    assert keymap.modifiers == {MOD_SHIFT: SHIFT_L, MOD_ALTGR: LEVEL3}
+
+
+@pytest.mark.parametrize('keys, ch, base, ok', [
+    # German: @ is AltGr+Q, " is Shift+2 and ' is itself shifted.
+    (GERMAN, '@', '2', False),
+    (GERMAN, '"', "'", False),
+    (GERMAN, '*', '8', False),
+    (GERMAN, '_', '-', True),
+    (GERMAN, 'A', 'a', True),
+    # French: digits are shifted, @ is AltGr+0, " is unshifted.
+    (FRENCH, '@', '2', False),
+    (FRENCH, '"', "'", False),
+    (FRENCH, '2', 'é', True),
+    (FRENCH, 'A', 'a', True),
+])
+def test_us_shift_ok(keys, ch, base, ok):
+    assert _keymap(keys).us_shift_ok(ch, base) is ok
+
+
+def test_altgr_strokes_dropped_without_altgr_key():
+    keymap = _keymap(GERMAN, altgr=False)
+    assert MOD_ALTGR not in keymap.modifiers
+    assert keymap.stroke('@') is None
+    assert keymap.stroke('€') is None
+    assert keymap.stroke('"') == (11, MOD_SHIFT)
+
+
+def test_lowest_modifier_stroke_wins():
+    keymap = _keymap({10: 'x@', 11: '@y'})
+    assert keymap.stroke('@') == (11, 0)
+
+
+def test_resolve_caches_misses():
+    calls = []
+
+    def resolve(ch):
+        calls.append(ch)
+        return None
+
+    keymap = Keymap('test', {}, {}, resolve)
+    assert keymap.stroke('x') is None
+    assert keymap.stroke('x') is None
+    assert calls == ['x']
+
+
+def test_service_caches_per_layout():
+    conn = FakeXkb('de', GERMAN)
+    service = KeymapService(XkbKeymapProvider(conn))
+    german = service.current()
+    assert service.current() is german
+    conn.name, conn.keys = 'fr', FRENCH
+    assert service.current().stroke('é') == (11, 0)
+    assert KeymapService().current() is None
+
+
+@pytest.mark.parametrize('keysym, ch', [
+    (0x41, 'A'), (0xE9, 'é'), (0x20AC, '€'), (0x13BD, 'œ'), (0x1000416, 'Ж'),
+    (0xFF0D, None), (0xFE51, None), (0x1000007, None),
+])
+def test_keysym_to_char(keysym, ch):
+    assert keysym_to_char(keysym) == ch
@@ -0,0 +1,104 @@
+import os
+
+from nexustyper.typing.macros import ExpandedText, compile_macros, strip_macros
+
+
+def _expand(text, **kw):
+    return ''.join(compile_macros(text, **kw).iter_text())
+
+
+def test_repeat_drops_directive_lines():
+    assert _expand('a\n{{REPEAT:3}}\nab\n{{END}}\nz') == 'a\nab\nab\nab\nz'
+
+
+def test_nested_repeat():
+    assert _expand('{{REPEAT:2}}x{{REPEAT:2}}y{{END}}{{END}}') == 'xyyxyy'
+
+
+def test_repeat_keeps_inner_macros():
+    program = compile_macros('{{REPEAT:2}}x{{PAUSE:1}}{{END}}')
+    assert ''.join(program.iter_text()) == 'x{{PAUSE:1}}x{{PAUSE:1}}'
+    assert program.counts()['pause'] == 2
+    assert program.pause_seconds() == 2.0
+
+
+def test_repeat_zero_types_nothing():
+    assert _expand('{{REPEAT:0}}x{{END}}y') == 'y'
+
+
+def test_unclosed_repeat_runs_to_end():
+    program = compile_macros('{{REPEAT:2}}x')
+    assert ''.join(program.iter_text()) == 'xx'
+    assert 'REPEAT without a matching END' in program.diagnostics()[0]
+
+
+def test_invalid_repeat_consumes_its_end():
+    program = compile_macros('{{REPEAT:abc}}x{{END}}y')
+    assert ''.join(program.iter_text()) == 'xy'
+    assert len(program.diagnostics()) == 2
+
+
+def test_stray_end_is_text():
+    program = compile_macros('a\n{{END}}\nb')
+    assert not program.has_directives()
+    assert program.segments == ['a\n{{END}}\nb']
+
+
+def test_bare_markers_are_upper_case_only():
+    text = '{{range .Items}}\nx\n{{end}}\n{{paste}} {{speed}}'
+    program = compile_macros(text)
+    assert not program.has_directives()
+    assert program.segments == [text]
+    assert strip_macros(text) == text
+
+
+def test_commands_match_any_case():
+    assert compile_macros('{{repeat:2}}x{{END}}').has_directives()
+    assert strip_macros('a{{pause:1}}b') == 'ab'
+
+
+def test_strip_macros_keeps_stray_end():
+    assert strip_macros('{{REPEAT:2}}x{{END}}{{END}}') == 'x{{END}}'
+
+
+def test_open_repeats_carry_across_chunks():
+    first = compile_macros('{{REPEAT:2}}x')
+    assert first.open_repeats == 1
+    second = compile_macros('{{END}}', open_repeats=first.open_repeats)
+    assert second.open_repeats == 0
+    assert second.tokens[0].command == 'END'
+
+
+def test_include_relative_to_base_dir(tmp_path):
+    (tmp_path / 'part.txt').write_text('sub\n', encoding='utf-8')
+    program = compile_macros('a {{INCLUDE:part.txt}} b', base_dir=str(tmp_path))
+    assert program.diagnostics() == []
+    assert ''.join(program.iter_text()) == 'a sub\n b'
+
+
+def test_include_relative_without_base_dir(tmp_path):
+    (tmp_path / 'part.txt').write_text('sub', encoding='utf-8')
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        program = compile_macros('a {{INCLUDE:part.txt}} b')
+    finally:
+        os.chdir(cwd)
+    assert ''.join(program.iter_text()) == 'a  b'
+    assert 'relative paths' in program.diagnostics()[0]
+
+
+def test_include_cycle(tmp_path):
+    (tmp_path / 'a.txt').write_text('A{{INCLUDE:b.txt}}', encoding='utf-8')
+    (tmp_path / 'b.txt').write_text('B{{INCLUDE:a.txt}}', encoding='utf-8')
+    program = compile_macros('{{INCLUDE:a.txt}}', base_dir=str(tmp_path))
+    assert ''.join(program.iter_text()) == 'AB'
+    assert any('INCLUDE cycle' in d for d in program.diagnostics())
+
+
+def test_expanded_text_replays_program():
+    program = compile_macros('{{REPEAT:3}}ab{{END}}c')
+    expanded = ExpandedText(program)
+    assert ''.join(expanded) == 'abababc'
+    assert ''.join(expanded) == 'abababc'
+    assert expanded.size_hint() == 7
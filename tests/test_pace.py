@@ -0,0 +1,93 @@
+import pytest
+
+from nexustyper.typing import pace as pace_module
+from nexustyper.typing.pace import (
+    MAX_COMP,
+    MAX_SLIP,
+    PACE_PLAIN,
+    PACE_SHIFTED,
+    SpeedController,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(pace_module, 'time', clock)
+    return clock
+
+
+def _type_keys(pace, clock, n, delay, overhead, cls=PACE_PLAIN, first=0):
+    """Type ``n`` keys that each take ``overhead`` on top of the wait."""
+    waits = []
+    for i in range(first, first + n):
+        pace.mark(i)
+        waited = pace.plan(cls, delay)
+        waits.append(waited)
+        clock.now += waited + overhead
+    pace.mark(first + n)
+    return waits
+
+
+def test_late_class_gets_shorter_delays(clock):
+    pace = SpeedController()
+    waits = _type_keys(pace, clock, 300, 0.1, 0.03)
+    assert waits[0] == 0.1
+    assert waits[-1] == pytest.approx(0.07, abs=1e-3)
+    assert pace.compensation(PACE_PLAIN) == pytest.approx(0.03, abs=1e-3)
+    # Per class: shifted keys weren't late.
+    assert pace.compensation(PACE_SHIFTED) == 0.0
+    # Once settled, the delivered rate is the planned one.
+    assert pace.achieved_wpm == pytest.approx(pace.target_wpm, rel=0.05)
+
+
+def test_delay_never_goes_below_zero(clock):
+    pace = SpeedController()
+    waits = _type_keys(pace, clock, 200, 0.01, 0.2)
+    assert min(waits) == 0.0
+    assert pace.compensation(PACE_PLAIN) <= MAX_COMP
+
+
+def test_early_keys_give_compensation_back(clock):
+    pace = SpeedController()
+    _type_keys(pace, clock, 60, 0.1, 0.03)
+    _type_keys(pace, clock, 60, 0.1, 0.0, first=61)
+    assert pace.compensation(PACE_PLAIN) < 0.005
+
+
+def test_pause_is_not_overhead(clock):
+    pace = SpeedController()
+    pace.mark(0)
+    pace.plan(PACE_PLAIN, 0.1)
+    clock.now += 0.1 + MAX_SLIP + 1.0
+    pace.mark(1)
+    assert pace.compensation(PACE_PLAIN) == 0.0
+
+
+def test_correction_is_not_overhead(clock):
+    pace = SpeedController()
+    pace.mark(0)
+    pace.plan(PACE_PLAIN, 0.1)
+    pace.reset()
+    clock.now += 0.2
+    pace.mark(1)
+    assert pace.compensation(PACE_PLAIN) == 0.0
+
+
+def test_skipped_events_break_the_chain(clock):
+    pace = SpeedController()
+    pace.mark(0)
+    pace.plan(PACE_PLAIN, 0.1)
+    clock.now += 0.2
+    # Event 1 was a macro or a pause; 0 -> 2 isn't one key's interval.
+    pace.mark(2)
+    assert pace.compensation(PACE_PLAIN) == 0.0
+    assert pace.target_wpm == 0.0
@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from nexustyper.typing.macros import MacroEnvironment
+from nexustyper.typing.plan import (
+    F_CLIP_HOLD,
+    F_SHIFT_RUN,
+    OP_CHAR,
+    OP_LINE_END,
+    OP_MACRO,
+    OP_MACRO_ERROR,
+    OP_NEWLINE,
+    OP_PASTE,
+    OP_SHIFTED,
+    OP_TAB,
+    OP_UNICODE,
+    PlanCompiler,
+    compile_plan,
+)
+from nexustyper.typing.sanitize import sanitize_ai_text
+from nexustyper.typing.stream import TextSource, prepare_chunks
+
+MODES = ['Standard', 'Smart Newlines', 'List Mode', 'Paste Mode', 'Block Mode']
+
+# Pieces the equivalence corpus is built from: text, whitespace, entities,
+# macros (valid, unknown, directives, span markers) and their fragments.
+PIECES = [
+    'a', 'B', '(', ' ', '\n', '\r\n', '&amp;', '{{PAUSE:1}}', '{{PRESS:enter}}',
+    '{{BAD:1}}', '- ', '    ', '\t', 'x.', '{', '}}', 'é', 'ü ö', 'Foo:',
+    '{{COMMENT:hi there}}', '{{', '{{END}}', '{{end}}', '{{REPEAT:2}}', '{{END',
+    '{{PASTE}}', '{{/PASTE}}', '{{SPEED:90,120}}', '{{SPEED}}', '```\n',
+    '| a | b |\n', '\n\n',
+]
+
+
+def _ops(plan):
+    return [e.op for e in plan.events]
+
+
+def _streamed(chunks, **kw):
+    compiler = PlanCompiler(**kw)
+    events = []
+    for chunk in prepare_chunks(TextSource(iter(chunks)).open(),
+                                newline_mode=kw['newline_mode'], enable_macros=kw['enable_macros']):
+        events += compiler.feed(chunk)
+    return events + compiler.finish()
+
+
+def _norm(events):
+    # Shift runs and clipboard holds are marked per fed chunk.
+    return [(e.op, e.arg, e.char, e.weight, e.flags & ~(F_SHIFT_RUN | F_CLIP_HOLD)) for e in events]
+
+
+def test_typed_ops():
+    plan = compile_plan('aB\t\n')
+    assert _ops(plan) == [OP_CHAR, OP_SHIFTED, OP_TAB, OP_NEWLINE]
+    assert plan.events[1].arg == 'b'
+    assert plan.output_chars == 4
+
+
+def test_type_tabs_off_drops_tabs():
+    assert _ops(compile_plan('a\tb', type_tabs=False)) == [OP_CHAR, OP_CHAR]
+
+
+def test_macros_compile_once():
+    plan = compile_plan('a{{PAUSE:0.5}}b{{PRESS:enter}}{{NOPE:1}}')
+    assert _ops(plan) == [OP_CHAR, OP_MACRO, OP_CHAR, OP_MACRO, OP_MACRO_ERROR]
+    assert plan.events[1].arg == ('PAUSE', '0.5')
+
+
+def test_macros_disabled_type_literally():
+    plan = compile_plan('{{PAUSE:1}}', enable_macros=False)
+    assert ''.join(e.char for e in plan.events) == '{{PAUSE:1}}'
+
+
+def test_unicode_carries_ascii_spelling():
+    (event,) = compile_plan('é', unicode_hex_typing=True).events
+    assert event.op == OP_UNICODE
+    assert (event.arg, event.char) == ('e', 'é')
+
+
+def test_list_mode_ends_every_line():
+    plan = compile_plan('a\n    b\n', newline_mode='List Mode')
+    assert _ops(plan).count(OP_LINE_END) == 2
+    assert OP_NEWLINE not in _ops(plan)
+
+
+def test_paste_region_is_one_paste():
+    plan = compile_plan('x{{PASTE}}one\ntwo{{/PASTE}}y')
+    pastes = [e.arg[0] for e in plan.events if e.op == OP_PASTE]
+    assert pastes == ['one\ntwo']
+
+
+def test_paste_region_spanning_chunks_is_one_paste():
+    kw = dict(newline_mode='Standard', enable_macros=True)
+    events = _streamed(['x {{PASTE}}line one\n', 'line two\n', 'line three{{/PASTE}} y\n'], **kw)
+    assert [e.arg[0] for e in events if e.op == OP_PASTE] == ['line one\nline two\nline three']
+
+
+def test_ime_run_spanning_chunks_is_one_paste():
+    kw = dict(newline_mode='Standard', enable_macros=True, ime_friendly=True)
+    events = _streamed(['ab é', ' ü cd'], **kw)
+    assert [e.arg[0] for e in events if e.op == OP_PASTE] == ['é ü']
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('ime', [False, True])
+def test_streamed_plan_matches_one_shot(mode, ime):
+    rng = random.Random(f'{mode}|{ime}')
+    env = MacroEnvironment()
+    for _ in range(300):
+        text = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 30)))
+        kw = dict(
+            newline_mode=mode, type_tabs=rng.random() < .5, enable_macros=rng.random() < .8,
+            ime_friendly=ime, unicode_hex_typing=rng.random() < .3, code_target=rng.random() < .5,
+            paste_chunk_lines=rng.randint(1, 4), paste_chunk_bytes=rng.randint(1, 30), macro_env=env,
+        )
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 8))))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        one_shot = compile_plan(sanitize_ai_text(text), **kw).events
+        assert _norm(_streamed(chunks, **kw)) == _norm(one_shot), (text, chunks)
@@ -0,0 +1,85 @@
+from nexustyper.services.run_journal import (
+    EV_DONE,
+    EV_STOPPED,
+    FLUSH_CHARS,
+    RunJournal,
+    last_run,
+)
+
+
+def _journal(path, resume=None):
+    journal = RunJournal(str(path))
+    journal.set_settings('settings')
+    assert journal.begin('text', 2, 100, lambda: 1.5, resume=resume)
+    return journal
+
+
+def test_no_journal(tmp_path):
+    assert last_run(str(tmp_path / 'missing.jsonl')) is None
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = _journal(path)
+    journal.note(1, 40, 38)
+    journal.end(EV_STOPPED)
+    cp = last_run(str(path))
+    assert (cp.run_id, cp.text_hash, cp.settings_hash) == (journal.run_id, 'text', 'settings')
+    assert (cp.lap, cp.laps, cp.offset, cp.chars_done, cp.total) == (1, 2, 40, 38, 100)
+    assert cp.elapsed == 1.5
+    assert cp.resumable
+
+
+def test_finished_run_is_not_resumable(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = _journal(path)
+    journal.note(2, 90, 100)
+    journal.end(EV_DONE)
+    assert not last_run(str(path)).resumable
+
+
+def test_run_stopped_before_first_key_is_not_resumable(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    _journal(path).end(EV_STOPPED)
+    assert not last_run(str(path)).resumable
+
+
+def test_resumed_run_keeps_checkpoint_until_next_flush(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    first = _journal(path)
+    first.note(1, 40, 38)
+    first.end(EV_STOPPED)
+    cp = last_run(str(path))
+    # Resume, then crash before any note() is written.
+    _journal(path, resume=cp)
+    again = last_run(str(path))
+    assert again.run_id == cp.run_id
+    assert (again.lap, again.offset, again.chars_done) == (1, 40, 38)
+    assert again.resumable
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = _journal(path)
+    journal.note(1, 12, 12)
+    journal.end(EV_STOPPED)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"run": "x", "te')
+    cp = last_run(str(path))
+    assert (cp.run_id, cp.offset) == (journal.run_id, 12)
+    # The next run starts on a fresh line.
+    second = _journal(path)
+    second.end(EV_STOPPED)
+    assert last_run(str(path)).run_id == second.run_id
+
+
+def test_checkpoints_flush_on_time_or_size_budget(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = _journal(path)
+    journal.note(1, 5, 5)
+    assert last_run(str(path)).offset == 0
+    journal.note(1, FLUSH_CHARS + 3, FLUSH_CHARS)
+    assert last_run(str(path)).offset == FLUSH_CHARS + 3
+    journal._due = 0.0
+    journal.note(1, FLUSH_CHARS + 4, FLUSH_CHARS + 1)
+    assert last_run(str(path)).offset == FLUSH_CHARS + 4
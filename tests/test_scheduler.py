@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from nexustyper.typing import scheduler as scheduler_module
+from nexustyper.typing.scheduler import KeystrokeScheduler
+
+
+class FakeClock:
+    """Stands in for the ``time`` module: sleeping advances the clock."""
+
+    def __init__(self):
+        self.ns = 0
+
+    def monotonic_ns(self):
+        return self.ns
+
+    def sleep(self, seconds):
+        self.ns += max(1000, int(seconds * 1e9))
+
+    def advance(self, seconds):
+        self.ns += int(seconds * 1e9)
+
+    @property
+    def seconds(self):
+        return self.ns / 1e9
+
+
+class FakePause:
+    """A "not paused" event that resumes after ``paused`` seconds."""
+
+    def __init__(self, clock, paused=0.0):
+        self.clock = clock
+        self.left = paused
+
+    def is_set(self):
+        return self.left <= 0
+
+    def wait(self, timeout=None):
+        step = min(timeout, self.left)
+        self.clock.advance(step)
+        self.left -= step
+        return self.is_set()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler_module, 'time', clock)
+    return clock
+
+
+def _scheduler(pause_event, on_pause=None, running=lambda: True):
+    return KeystrokeScheduler(running, pause_event, on_pause)
+
+
+def test_overrun_is_absorbed_into_next_deadline(clock):
+    ev = threading.Event()
+    ev.set()
+    sched = _scheduler(ev)
+    assert sched.wait_next(0.1)
+    assert clock.seconds == pytest.approx(0.1, abs=1e-3)
+    # The backend call ran 50 ms long; the next key is still due at 0.2 s.
+    clock.advance(0.05)
+    assert sched.wait_next(0.1)
+    assert clock.seconds == pytest.approx(0.2, abs=1e-3)
+
+
+def test_catch_up_is_capped(clock):
+    ev = threading.Event()
+    ev.set()
+    sched = _scheduler(ev)
+    sched.wait_next(0.1)
+    clock.advance(1.0)
+    now = clock.ns
+    assert sched.wait_next(0.1)
+    # Far behind: the schedule is rebased to MAX_LAG_NS before now, so the
+    # key goes out immediately and only that much time is won back.
+    assert clock.ns == now
+    assert sched.lag_seconds() == pytest.approx(KeystrokeScheduler.MAX_LAG_NS / 1e9)
+    sched.wait_next(0.1)
+    assert clock.ns == now
+
+
+def test_pause_pushes_the_deadline_out(clock):
+    pauses = []
+    sched = _scheduler(FakePause(clock, paused=0.5), on_pause=lambda: pauses.append(clock.ns))
+    assert sched.wait_next(0.1)
+    assert pauses
+    # 0.5 s paused plus the 0.1 s delay, not 0.1 s billed against the pause.
+    assert clock.seconds == pytest.approx(0.6, abs=1e-3)
+    assert sched.lag_seconds() == 0.0
+
+
+def test_sleep_rebases_the_schedule(clock):
+    ev = threading.Event()
+    ev.set()
+    sched = _scheduler(ev)
+    sched.wait_next(0.1)
+    assert sched.sleep(1.0)
+    start = clock.ns
+    sched.wait_next(0.1)
+    assert (clock.ns - start) / 1e9 == pytest.approx(0.1, abs=1e-3)
+
+
+def test_stop_ends_the_wait(clock):
+    ev = threading.Event()
+    ev.set()
+    sched = _scheduler(ev, running=lambda: clock.seconds < 0.05)
+    assert not sched.wait_next(1.0)
+    assert clock.seconds < 0.1
@@ -0,0 +1,96 @@
+import io
+
+import pytest
+
+from nexustyper.typing.stream import (
+    TextSource,
+    iter_line_aligned,
+    iter_macro_safe,
+    prepare_chunks,
+)
+
+MACRO_TEXT = 'type {{PAUSE:1}} then {{PRESS:enter}}.'
+
+
+def _cuts(text, *cuts):
+    bounds = [0, *cuts, len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize('cut', range(1, len(MACRO_TEXT)))
+def test_macro_split_across_chunks_comes_out_whole(cut):
+    out = list(iter_macro_safe(_cuts(MACRO_TEXT, cut)))
+    assert ''.join(out) == MACRO_TEXT
+    assert any('{{PAUSE:1}}' in chunk for chunk in out)
+    assert any('{{PRESS:enter}}' in chunk for chunk in out)
+
+
+def test_macro_split_into_single_characters():
+    out = list(iter_macro_safe(MACRO_TEXT))
+    assert ''.join(out) == MACRO_TEXT
+    assert '{{PAUSE:1}}' in ''.join(c for c in out if '{{' in c)
+    assert all(c.count('{{') == c.count('}}') for c in out)
+
+
+def test_prepare_chunks_keeps_macros_whole():
+    chunks = _cuts(MACRO_TEXT, 8, 12, 14)
+    out = list(prepare_chunks(chunks, newline_mode='Standard', enable_macros=True))
+    assert ''.join(out) == MACRO_TEXT
+    assert any('{{PAUSE:1}}' in chunk for chunk in out)
+
+
+def test_line_aligned():
+    out = list(iter_line_aligned(['ab', 'c\nd', 'e\nf\n', 'g', 'h']))
+    assert out == ['abc\n', 'de\nf\n', 'gh']
+
+
+def test_list_mode_chunks_end_on_lines():
+    text = '- one\n- two {{PAUSE:1}}\n- three'
+    out = list(prepare_chunks(_cuts(text, 3, 9, 15, 20), newline_mode='List Mode', enable_macros=True))
+    assert ''.join(out) == text
+    assert all(chunk.endswith('\n') for chunk in out[:-1])
+
+
+def test_list_is_rewindable():
+    source = TextSource(['ab', 'cd'])
+    assert source.rewindable()
+    assert ''.join(source.open()) == 'abcd'
+    assert ''.join(source.open()) == 'abcd'
+
+
+def test_one_shot_iterator_types_once():
+    source = TextSource(iter(['ab', 'cd']))
+    assert not source.rewindable()
+    assert ''.join(source.open()) == 'abcd'
+    assert source.open() is None
+
+
+def test_peek_keeps_the_head_for_typing():
+    source = TextSource(iter(['abc', 'def', 'ghi']))
+    assert source.peek(4) == 'abcd'
+    assert ''.join(source.open()) == 'abcdefghi'
+    assert source.open() is None
+
+
+def test_seekable_file_rewinds_and_decodes_utf8(tmp_path):
+    data = 'naïve café\n'.encode('utf-8') * 3
+    path = tmp_path / 'source.txt'
+    path.write_bytes(data)
+    with open(path, 'rb') as f:
+        source = TextSource(f, chunk_size=3)
+        assert source.rewindable()
+        assert source.size_hint() == len(data)
+        assert ''.join(source.open()) == data.decode('utf-8')
+        assert ''.join(source.open()) == data.decode('utf-8')
+
+
+class _Pipe(io.StringIO):
+    def seekable(self):
+        return False
+
+
+def test_pipe_types_once():
+    source = TextSource(_Pipe('abc'))
+    assert not source.rewindable()
+    assert ''.join(source.open()) == 'abc'
+    assert source.open() is None
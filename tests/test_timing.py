@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from nexustyper.typing.plan import F_BOUNDARY, F_BRACKET, F_MISTAKE, F_PUNCT
+from nexustyper.typing.timing import (
+    BRACKET_PAUSE,
+    MIN_DELAY,
+    PUNCT_PAUSE,
+    THINKING_PAUSE,
+    TimingModel,
+    _numpy,
+    delay_bounds,
+)
+
+TRIALS = 20000
+
+
+def _python_model(**kw):
+    model = TimingModel(seed=7, **kw)
+    model._np_rng = None
+    return model
+
+
+def _numpy_model(**kw):
+    if _numpy() is None:
+        pytest.skip('numpy is not installed')
+    return TimingModel(seed=7, **kw)
+
+
+@pytest.mark.parametrize('make, method', [
+    (_python_model, '_skip_hits_python'),
+    (_numpy_model, '_skip_hits_numpy'),
+])
+@pytest.mark.parametrize('p', [0.01, 0.04, 0.3, 0.9])
+def test_skip_hits_match_the_rate(make, method, p):
+    hits = getattr(make(), method)(TRIALS, p)
+    assert hits == sorted(set(hits))
+    assert all(0 <= k < TRIALS for k in hits)
+    sd = (TRIALS * p * (1 - p)) ** 0.5
+    assert abs(len(hits) - TRIALS * p) < 5 * sd
+
+
+@pytest.mark.parametrize('make, method', [
+    (_python_model, '_skip_hits_python'),
+    (_numpy_model, '_skip_hits_numpy'),
+])
+def test_skip_hits_edge_rates(make, method):
+    skip_hits = getattr(make(), method)
+    assert skip_hits(0, 0.5) == []
+    assert skip_hits(10, 0.0) == []
+    assert skip_hits(5, 1.0) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('make', [_python_model, _numpy_model])
+def test_draw_follows_the_flags(make):
+    rng = random.Random(3)
+    choices = [0, F_PUNCT, F_BRACKET, F_BOUNDARY, F_MISTAKE, F_BOUNDARY | F_MISTAKE]
+    flags = [rng.choice(choices) for _ in range(5000)]
+    draw = make(mistake_chance=0.3, thinking_pause_chance=0.3).draw(flags)
+    assert len(draw) == len(flags)
+    assert all(0.0 <= s <= 1.0 for s in draw.spread)
+    for f, punct, think in zip(flags, draw.punct, draw.think):
+        if f & F_PUNCT:
+            assert PUNCT_PAUSE[0] <= punct <= PUNCT_PAUSE[1]
+        elif f & F_BRACKET:
+            assert BRACKET_PAUSE[0] <= punct <= BRACKET_PAUSE[1]
+        else:
+            assert punct == 0.0
+        if not f & F_BOUNDARY:
+            assert think == 0.0
+        elif think:
+            assert THINKING_PAUSE[0] <= think <= THINKING_PAUSE[1]
+    assert draw.mistakes
+    assert all(flags[i] & F_MISTAKE for i in draw.mistakes)
+    assert any(draw.think)
+
+
+def test_seeded_draws_repeat():
+    flags = [F_PUNCT, F_BOUNDARY, F_MISTAKE, 0] * 50
+    a = _python_model(mistake_chance=0.5).draw(flags)
+    b = _python_model(mistake_chance=0.5).draw(flags)
+    assert (a.spread, a.punct, a.think, a.mistakes) == (b.spread, b.punct, b.think, b.mistakes)
+
+
+def test_delay_bounds_and_floor():
+    assert delay_bounds(60, 120) == pytest.approx((0.1, 0.2))
+    assert delay_bounds(120, 60) == pytest.approx((0.1, 0.1))
+    draw = _python_model().draw([0])
+    assert draw.delay(0, 0.0, 0.0, True) == MIN_DELAY
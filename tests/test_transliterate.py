@@ -0,0 +1,53 @@
+import pytest
+
+from nexustyper.typing.sanitize import sanitize_ai_text
+from nexustyper.typing.transliterate import (
+    TRANSLIT,
+    UNMAPPED,
+    TransliterationReport,
+    transliterate,
+)
+
+
+@pytest.mark.parametrize('ch, spelling', [
+    ('é', 'e'), ('ř', 'r'), ('ệ', 'e'), ('Ç', 'C'),
+    ('ß', 'ss'), ('æ', 'ae'), ('ł', 'l'), ('þ', 'th'),
+    ('α', 'alpha'), ('Ω', 'Omega'), ('ά', 'alpha'),
+    ('≤', '<='), ('→', '->'), ('—', '--'), ('½', '1/2'), ('“', '"'),
+    ('\u00a0', ' '), ('\u200b', ''), ('Ａ', 'A'), ('ﬁ', 'fi'),
+])
+def test_spellings(ch, spelling):
+    assert TRANSLIT[ord(ch)] == spelling
+
+
+@pytest.mark.parametrize('ch', '“”‘’‚„′″–—…−×÷')
+def test_agrees_with_sanitize(ch):
+    # Sanitizing runs first; a character must come out the same either way.
+    assert TRANSLIT[ord(ch)] == sanitize_ai_text(ch)
+
+
+def test_unknown_character_is_unmapped():
+    assert TRANSLIT[ord('☃')] == UNMAPPED
+    assert ord('☃') not in TRANSLIT
+
+
+def test_table_is_read_only():
+    with pytest.raises(TypeError):
+        TRANSLIT[ord('é')] = 'x'
+
+
+def test_transliterate():
+    assert transliterate('plain ascii') == 'plain ascii'
+    assert transliterate('café → naïve ☃') == 'cafe -> naive ?'
+
+
+def test_report_summary():
+    report = TransliterationReport()
+    assert not report
+    assert report.summary() == ''
+    report.add('é é α ☃ ok')
+    assert report.total == 4
+    assert report.unmapped == {'☃': 1}
+    assert report.summary() == (
+        "Typed 4 characters as ASCII (é as 'e' ×2, α as 'alpha' ×1); "
+        "1 had no equivalent (☃) and became '?'.")